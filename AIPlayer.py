@@ -1,6 +1,9 @@
+import numpy as np
 from Player import Player
 from Constants import SUSPECTS, WEAPONS, ROOMS, ALL_CARDS
-import random
+from DealSampler import sample_marginals, MIN_VALID
+from EnvelopeInference import knowledge_key
+from SuggestionSelector import information_gain, most_informative
 
 class AIPlayer(Player):
     """
@@ -13,6 +16,14 @@ class AIPlayer(Player):
         self.last_suggestion_room = None  # The room where the last suggestion was made
         self.game_state_log = []  # Log of game states for analysis
         self.past_suggestion_rooms = set()  # Set of rooms where suggestions have been made
+        self.sample_budget = 2000  # Most deals sampled per decision
+        self.min_kept_deals = 32  # Fewest still-consistent deals reused before sampling afresh
+        self.decision_time_limit = None  # Seconds of sampling per decision (a limit makes games depend on machine speed)
+        self.accuse_on_odds = False  # Opt in to accusing on sampled odds before the solution is certain
+        self.accusation_threshold = 0.95  # Lower confidence bound needed to accuse on odds
+        self._estimate_cache = (None, None)  # (knowledge key, sampled estimate)
+        self._gain_cache = {}  # (room, eliminated mask) → suggestion gains for the cached estimate
+        self._sampler_rng = None  # numpy generator for the sampler, seeded from the game's rng
 
     def choose_move(self, valid_moves, game):
         """
@@ -33,36 +44,43 @@ class AIPlayer(Player):
             door_moves = [m for m in valid_moves
                           if game.mansion_board.get_cell_type(m[0], m[1]) and hasattr(game.mansion_board.get_cell_type(m[0], m[1]), 'room_name')]
             if door_moves:
-                return random.choice(door_moves)
+                return game.rng.choice(door_moves)
 
         if self.target_room is None:
-            self.target_room = self._choose_target_room(
-                game.logic_engines[self.player_id], game
-            )
+            self.target_room = self.choose_target_room(game)
 
-        entrances = game.mansion_board.room_dict[self.target_room].room_entrance_list
+        board = game.mansion_board
+        entrances = board.room_dict[self.target_room].room_entrance_list
         goals = {(e.row, e.column) for e in entrances}
 
-        # Greedy − pick the legal step with lowest Manhattan distance to ANY goal
+        # Greedy − pick the legal step with the shortest walk to ANY goal
+        # (Manhattan distance only breaks ties)
         best = min(valid_moves,
-                   key=lambda m: min(abs(m[0]-r)+abs(m[1]-c) for r, c in goals))
+                   key=lambda m: (board.distance_to_room(m[0], m[1], self.target_room),
+                                  min(abs(m[0]-r)+abs(m[1]-c) for r, c in goals)))
         return best
 
-    def _choose_target_room(self, matrix, game):
+    def choose_target_room(self, game):
         """
         Choose a target room based on deduction.
 
         Args:
-            matrix: The deduction matrix for this player
             game: The game instance
 
         Returns:
             The name of the target room
         """
+        matrix = game.logic_engines[self.player_id]
         if matrix and matrix.envelope_complete():
             return "Clue"
         unseen = [r for r in ROOMS if r not in self.past_suggestion_rooms]
-        return random.choice(unseen) if unseen else random.choice(ROOMS)
+        candidates = unseen or [r for r in ROOMS if r != self.last_suggestion_room]
+
+        # Rooms that are easier to reach this turn are likelier picks, but any
+        # candidate can be chosen so that players do not all head the same way
+        reach = game.room_reach_probabilities(self)
+        weights = [1 + len(candidates) * reach.get(r, 0.0) for r in candidates]
+        return game.rng.choices(candidates, weights)[0]
 
     def choose_suggestion(self, room, game):
         """
@@ -76,15 +94,22 @@ class AIPlayer(Player):
             A tuple of (suspect, weapon, room)
         """
         matrix = game.logic_engines[self.player_id]
+        estimate = self._estimate(matrix, game)
 
-        unknown_suspects = [s for s in SUSPECTS if matrix.poss[s]["ENVELOPE"]]
-        unknown_weapons  = [w for w in WEAPONS  if matrix.poss[w]["ENVELOPE"]]
+        if estimate is not None:
+            # Name the pair whose refutation should tell us most about the envelope
+            gains = self._suggestion_gains(estimate, room, game)
+            suspect, weapon = most_informative(gains, estimate.envelope, game.rng)
+        else:
+            unknown_suspects = [s for s in SUSPECTS if matrix.poss[s]["ENVELOPE"]]
+            unknown_weapons  = [w for w in WEAPONS  if matrix.poss[w]["ENVELOPE"]]
 
-        suspect = random.choice(unknown_suspects) if unknown_suspects else random.choice(SUSPECTS)
-        weapon  = random.choice(unknown_weapons)  if unknown_weapons  else random.choice(WEAPONS)
+            suspect = game.rng.choice(unknown_suspects) if unknown_suspects else game.rng.choice(SUSPECTS)
+            weapon  = game.rng.choice(unknown_weapons)  if unknown_weapons  else game.rng.choice(WEAPONS)
 
         self.past_suggestion_rooms.add(room)
         self.last_suggestion_room = room
+        self.target_room = None  # re-chosen from wherever the next turn starts
         return suspect, weapon, room
 
     def should_make_accusation(self, game):
@@ -106,8 +131,13 @@ class AIPlayer(Player):
             # If we know the solution, make an accusation
             return True
 
-        # Otherwise, don't make an accusation
-        return False
+        if not self.accuse_on_odds:
+            return False
+
+        # Otherwise only accuse when the sampled odds are overwhelming
+        estimate = self._estimate(matrix, game)
+        best = estimate.best_solution() if estimate is not None else None
+        return best is not None and best[2] >= self.accusation_threshold
 
     def choose_accusation(self, game):
         """
@@ -128,18 +158,63 @@ class AIPlayer(Player):
             # If we know the solution, make an accusation
             return envelope_solution
 
-        # If we can't deduce the solution, we shouldn't be making an accusation
-        # But if we must, make an educated guess
+        # Otherwise go with the likeliest sampled solution
+        estimate = self._estimate(matrix, game)
+        best = estimate.best_solution() if estimate is not None else None
+        if best is not None:
+            return best[0]
+
+        # Without a usable estimate, make an educated guess
         possible_envelope_suspects = [s for s in SUSPECTS if matrix.poss[s]["ENVELOPE"]]
         possible_envelope_weapons = [w for w in WEAPONS if matrix.poss[w]["ENVELOPE"]]
         possible_envelope_rooms = [r for r in ROOMS if matrix.poss[r]["ENVELOPE"]]
 
-        suspect = random.choice(possible_envelope_suspects) if possible_envelope_suspects else random.choice(SUSPECTS)
-        weapon = random.choice(possible_envelope_weapons) if possible_envelope_weapons else random.choice(WEAPONS)
-        room = random.choice(possible_envelope_rooms) if possible_envelope_rooms else random.choice(ROOMS)
+        suspect = game.rng.choice(possible_envelope_suspects) if possible_envelope_suspects else game.rng.choice(SUSPECTS)
+        weapon = game.rng.choice(possible_envelope_weapons) if possible_envelope_weapons else game.rng.choice(WEAPONS)
+        room = game.rng.choice(possible_envelope_rooms) if possible_envelope_rooms else game.rng.choice(ROOMS)
 
         return suspect, weapon, room
 
+    def _estimate(self, matrix, game):
+        """
+        Sampled card locations for <matrix> within this player's sample budget
+        and time limit, or None if no consistent deal was found. When the
+        player's knowledge changes, the previous deals still consistent with
+        it are kept (see SampledMarginals.restrict); fresh deals are drawn
+        only once fewer than min_kept_deals survive. The game's rng seeds the
+        sampler; contradictory knowledge is logged and gives no estimate.
+        """
+        key = knowledge_key(matrix)
+        if self._estimate_cache[0] != key:
+            previous = self._estimate_cache[1]
+            estimate = previous.restrict(matrix) if previous is not None else None
+            if estimate is None or estimate.n_valid < self.min_kept_deals:
+                try:
+                    estimate = sample_marginals(matrix, n_samples=self.sample_budget,
+                                                time_limit=self.decision_time_limit,
+                                                rng=self._sampler(game), min_valid=MIN_VALID)
+                except ValueError as error:
+                    game.log.warning("%s ignores sampled odds: %s", self.character.name, error)
+                    estimate = None
+            self._estimate_cache = (key, estimate if estimate is not None and estimate.n_valid else None)
+            self._gain_cache = {}
+        return self._estimate_cache[1]
+
+    def _sampler(self, game):
+        """This player's numpy generator, seeded from the game's rng on first use."""
+        if self._sampler_rng is None:
+            self._sampler_rng = np.random.default_rng(game.rng.getrandbits(32))
+        return self._sampler_rng
+
+    def _suggestion_gains(self, estimate, room, game):
+        """Information gain of each suspect x weapon pair in <room>, cached with the estimate."""
+        eliminated = sum(1 << p.player_id for p in game.players if p.eliminated)
+        gains = self._gain_cache.get((room, eliminated))
+        if gains is None:
+            gains = self._gain_cache[room, eliminated] = information_gain(estimate, self.player_id,
+                                                                           room, eliminated)
+        return gains
+
     def log_game_state(self, game):
         """
         Log the current game state for analysis.
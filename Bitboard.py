@@ -0,0 +1,118 @@
+from BoardCompiler import CELL_CORRIDOR, CELL_ENTRANCE
+
+
+def cell_bit(r, c, cols):
+    """
+    Bit index of (r, c). Rows are cols + 1 bits wide: the extra column is
+    always zero, so shifting by one never wraps from one row into the next.
+    """
+    return r * (cols + 1) + c
+
+
+class Bitboard:
+    """
+    The mansion packed into Python big-int bitboards.
+
+    walkable / entrances have one bit per cell (see cell_bit), and a
+    set of cells is a single int. Neighbours of a whole set are found with
+    four shifts, so a k-step search is k rounds of shift-and-mask.
+
+    Offers the same walk / flood / occupied_cells interface as MovementEngine,
+    with occupancy taken from CharacterBoard.occupied_bits. Destinations come
+    back in row-major order.
+    """
+    def __init__(self, board):
+        self.rows, self.cols = board.rows, board.cols
+        self.stride = board.cols + 1
+        self.walkable = self.entrances = 0
+        for r in range(board.rows):
+            for c in range(board.cols):
+                code = board.cell_code(r, c)
+                bit = 1 << cell_bit(r, c, board.cols)
+                if code in (CELL_CORRIDOR, CELL_ENTRANCE):
+                    self.walkable |= bit
+                if code == CELL_ENTRANCE:
+                    self.entrances |= bit
+
+    # ---------- conversions ----------
+    def bit(self, cell):
+        return 1 << cell_bit(cell[0], cell[1], self.cols)
+
+    def from_cells(self, cells):
+        bits = 0
+        for cell in cells:
+            bits |= self.bit(cell)
+        return bits
+
+    def to_cells(self, bits):
+        """Cells of a bitboard in row-major order."""
+        cells = []
+        while bits:
+            low = bits & -bits
+            cells.append(divmod(low.bit_length() - 1, self.stride))
+            bits ^= low
+        return cells
+
+    def occupied_cells(self, char_board):
+        """Occupancy bitboard maintained by the CharacterBoard."""
+        return char_board.occupied_bits
+
+    # ---------- search ----------
+    def expand(self, bits):
+        """Walkable cells orthogonally adjacent to any cell of <bits>."""
+        s = self.stride
+        return ((bits << 1) | (bits >> 1) | (bits << s) | (bits >> s)) & self.walkable
+
+    def walk(self, start, steps, occupied):
+        """
+        Corridor movement: cells exactly <steps> layers from <start>, plus any
+        free entrance next to a cell reached with steps to spare.
+        """
+        return self.to_cells(self._walk(start, steps, occupied)[-1])
+
+    def walk_layers(self, start, max_steps, occupied):
+        """walk() for every step count from one traversal: result[s] == walk(start, s, occupied)."""
+        return [self.to_cells(bits) for bits in self._walk(start, max_steps, occupied)]
+
+    def _walk(self, start, max_steps, occupied):
+        visited = frontier = self.bit(start)
+        free = self.walkable & ~occupied
+        found = 0
+        layers = [frontier]
+        for _ in range(max_steps):
+            around = self.expand(frontier)
+            found |= around & self.entrances & ~occupied
+            frontier = around & free & ~visited
+            visited |= frontier
+            layers.append(found | frontier)
+        return layers
+
+    def flood(self, sources, steps, occupied):
+        """Cells exactly <steps> layers from any free source, each source searched on its own."""
+        return self.to_cells(self._flood(sources, steps, occupied)[-1])
+
+    def flood_layers(self, sources, max_steps, occupied):
+        """flood() for every step count from one traversal: result[s] == flood(sources, s, occupied)."""
+        return [self.to_cells(bits) for bits in self._flood(sources, max_steps, occupied)]
+
+    def _flood(self, sources, max_steps, occupied):
+        free = self.walkable & ~occupied
+        layers = [0] * (max_steps + 1)
+        for source in dict.fromkeys(sources):
+            visited = frontier = self.bit(source)
+            if frontier & occupied:
+                continue
+            layers[0] |= frontier
+            for step in range(1, max_steps + 1):
+                frontier = self.expand(frontier) & free & ~visited
+                visited |= frontier
+                layers[step] |= frontier
+        return layers
+
+    def within(self, sources, steps):
+        """The sources plus every cell within <steps> moves of one, ignoring tokens."""
+        visited = frontier = self.from_cells(sources)
+        for _ in range(steps):
+            frontier = self.expand(frontier) & ~visited
+            visited |= frontier
+        return visited
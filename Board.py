@@ -1,10 +1,44 @@
+import threading
+from types import MappingProxyType
 from Constants import room_name_list
 from Room import Room
+import numpy as np
+from BoardCompiler import (compile_grid, CELL_CORRIDOR, CELL_ROOM, CELL_ENTRANCE, CELL_BONUS,
+                           CELL_OUT_OF_BOUNDS, NO_ROOM)
+from Bitboard import cell_bit
+from Zobrist import token_keys
+
+# Guards the lazily built caches of shared boards, so concurrent games build each once
+_derived_lock = threading.RLock()   # re-entrant: one helper's build may need another
 
 class CharacterBoard:
-    def __init__(self, rows, cols):
+    def __init__(self, rows, cols, mansion_board=None):
         self.grid = [[None for _ in range(cols)] for _ in range(rows)]
         self.positions = {}   # name → (row, col)
+        self.cols = cols
+        self.occupied_bits = 0   # occupancy bitboard, same bit layout as Bitboard
+        self.zobrist = 0         # XOR of the Zobrist keys of every token on its cell
+        self._token_keys = token_keys(rows * (cols + 1))
+
+        # Per-room indexes, only available when the layout is known.
+        # Free slots are a bitmask over the room's cells in row-major order,
+        # so the first free slot is the lowest set bit.
+        self._room_slot = {}       # (row, col) → (room name, bit) for room cells
+        self._room_cells = {}      # room name → tuple of room cells, row-major
+        self._free_mask = {}       # room name → bitmask of unoccupied room cells
+        self._room_of_cell = {}    # (row, col) → room name for room and entrance cells
+        self.occupants = {}        # room name → set of token names in the room
+        if mansion_board is not None:
+            for name in mansion_board.room_names:
+                cells = mansion_board.room_cells(name)
+                self._room_cells[name] = cells
+                self._free_mask[name] = (1 << len(cells)) - 1
+                self.occupants[name] = set()
+                for bit, cell in enumerate(cells):
+                    self._room_slot[cell] = (name, bit)
+                    self._room_of_cell[cell] = name
+                for entrance in mansion_board.room_dict[name].room_entrance_list:
+                    self._room_of_cell[(entrance.row, entrance.column)] = name
 
     # -------- basic API --------
     def place(self, name, row, col):
@@ -12,63 +46,248 @@ class CharacterBoard:
             raise ValueError(f"Cell ({row},{col}) already occupied")
         self.grid[row][col] = name
         self.positions[name] = (row, col)
+        self._index_add(name, (row, col))
 
     def move(self, name, new_row, new_col):
         old_row, old_col = self.positions[name]
+        if (new_row, new_col) != (old_row, old_col) and self.grid[new_row][new_col] is not None:
+            raise ValueError(f"Cell ({new_row},{new_col}) already occupied")
         self.grid[old_row][old_col] = None
+        self._index_remove(name, (old_row, old_col))
         self.place(name, new_row, new_col)
 
     def get_cell_content(self, row, col):
         return self.grid[row][col]      # character name or None
 
+    # -------- room queries --------
+    def free_room_cell(self, room_name):
+        """First unoccupied cell of the room (row-major order), or None if it is full."""
+        mask = self._free_mask.get(room_name, 0)
+        if not mask:
+            return None
+        return self._room_cells[room_name][(mask & -mask).bit_length() - 1]
+
+    def room_occupants(self, room_name):
+        """Names of the tokens standing in the room (room cells or its entrances)."""
+        return frozenset(self.occupants.get(room_name, ()))
+
+    def _index_add(self, name, cell):
+        bit = cell_bit(cell[0], cell[1], self.cols)
+        self.occupied_bits |= 1 << bit
+        self.zobrist ^= self._token_keys[name][bit]
+        slot = self._room_slot.get(cell)
+        if slot is not None:
+            self._free_mask[slot[0]] &= ~(1 << slot[1])
+        room_name = self._room_of_cell.get(cell)
+        if room_name is not None:
+            self.occupants[room_name].add(name)
+
+    def _index_remove(self, name, cell):
+        bit = cell_bit(cell[0], cell[1], self.cols)
+        self.occupied_bits &= ~(1 << bit)
+        self.zobrist ^= self._token_keys[name][bit]
+        slot = self._room_slot.get(cell)
+        if slot is not None:
+            self._free_mask[slot[0]] |= 1 << slot[1]
+        room_name = self._room_of_cell.get(cell)
+        if room_name is not None:
+            self.occupants[room_name].discard(name)
+
 
 
 class MansionBoard:
     def __init__(self, board_layout):
-        self.grid = board_layout.fillna("").to_numpy()
-        self.rows, self.cols = self.grid.shape
+        self._load(compile_grid(board_layout.fillna("").to_numpy()))
+
+    @classmethod
+    def from_compiled(cls, compiled, cache_prefix=None):
+        """Build a board straight from a CompiledBoard artifact (no Excel parsing)."""
+        board = cls.__new__(cls)
+        board._load(compiled, cache_prefix)
+        return board
+
+    def _load(self, compiled, cache_prefix=None):
+        self.layout_hash = compiled.source_hash
+        self.cache_prefix = cache_prefix   # where derived tables (distances) are persisted
+        self.rows, self.cols = compiled.rows, compiled.cols
         self.room_dict = {name: Room(name) for name in room_name_list}
-        self.bonus_card_spaces = []  # List of (row, col) tuples for bonus card spaces
-        self._scan_for_entrances()
-        self._setup_secret_passages()
-
-    def _setup_secret_passages(self):
-        """Set up secret passages between rooms"""
-        from Constants import SECRET_PASSAGES
-        for source_room, dest_room in SECRET_PASSAGES.items():
-            if source_room in self.room_dict and dest_room in self.room_dict:
-                self.room_dict[source_room].add_secret_passage(dest_room)
-
-    def _scan_for_entrances(self):
-        for r in range(self.rows):
-            for c in range(self.cols):
-                val = str(self.grid[r][c])
-                if val.endswith("_e"):
-                    room_name = val.replace("_e", "")
-                    if room_name in self.room_dict:
-                        self.room_dict[room_name].add_room_entrance(r, c)
-                elif val == "?":
-                    # This is a bonus card space
-                    self.bonus_card_spaces.append((r, c))
+        self.bonus_card_spaces = list(compiled.bonus_spaces)  # List of (row, col) tuples for bonus card spaces
+
+        names = compiled.room_names
+        codes, rooms = compiled.cell_codes, compiled.cell_rooms
+
+        def cell_value(i):
+            if codes[i] == CELL_ROOM:
+                return names[rooms[i]]
+            if codes[i] == CELL_ENTRANCE:
+                return names[rooms[i]] + "_e"
+            if codes[i] == CELL_BONUS:
+                return "?"
+            return ""
+
+        self.grid = [[cell_value(r * self.cols + c) for c in range(self.cols)]
+                     for r in range(self.rows)]
+
+        for room_id, r, c in compiled.entrances:
+            self.room_dict[names[room_id]].add_room_entrance(r, c)
+
+        # ---------- integer-coded lookup tables ----------
+        # NumPy views for vectorised consumers (renderers, distance tables)
+        self.cell_codes = np.frombuffer(compiled.cell_codes, dtype=np.int8).reshape(self.rows, self.cols)
+        self.room_ids   = np.frombuffer(compiled.cell_rooms, dtype=np.int8).reshape(self.rows, self.cols)  # -1 = no room
+        self.room_names = names
+
+        # Flat tables for scalar queries (indexing bytes/tuples beats NumPy scalars)
+        self._codes = compiled.cell_codes
+        self._room_of = tuple(-1 if room_id == NO_ROOM else room_id for room_id in compiled.cell_rooms)
+        self._rooms_by_id = tuple(self.room_dict[name] for name in names)
+        entrance_at = [None] * (self.rows * self.cols)
+        for room in self.room_dict.values():
+            for entrance in room.room_entrance_list:
+                entrance_at[entrance.row * self.cols + entrance.column] = entrance
+        self._entrance_at = tuple(entrance_at)
+
+        room_cells = {name: [] for name in names}
+        for i, code in enumerate(self._codes):
+            if code == CELL_ROOM:
+                room_cells[names[self._room_of[i]]].append(divmod(i, self.cols))
+        self._room_cells = {name: tuple(cells) for name, cells in room_cells.items()}
+
+        # Secret passages between rooms
+        for source_id, dest_id in compiled.secret_passages:
+            self.room_dict[names[source_id]].add_secret_passage(names[dest_id])
+
+    # ---------- sharing ----------
+    def freeze(self):
+        """
+        Make the layout read-only so one board can back any number of games.
+        Per-game state (token positions, weapons) lives in CharacterBoard / ClueGame.
+        """
+        if self.frozen:
+            return self
+        self.grid = tuple(tuple(row) for row in self.grid)
+        self.bonus_card_spaces = tuple(self.bonus_card_spaces)
+        for room in self.room_dict.values():
+            room.freeze()
+        self.room_dict = MappingProxyType(self.room_dict)
+        object.__setattr__(self, "_frozen", True)
+        return self
+
+    @property
+    def frozen(self):
+        return getattr(self, "_frozen", False)
+
+    def __setattr__(self, name, value):
+        if self.frozen:
+            raise AttributeError("MansionBoard is shared and cannot be modified")
+        object.__setattr__(self, name, value)
 
     def get_cell_type(self, r, c):
         if not (0 <= r < self.rows and 0 <= c < self.cols):
             return "out_of_bounds"
 
-        val = str(self.grid[r][c])
+        i = r * self.cols + c
+        code = self._codes[i]
 
-        if val in room_name_list:
-            return self.room_dict[val]
-        elif val.endswith("_e"):
-            room_name = val.replace("_e", "")
-            if room_name in self.room_dict:
-                room = self.room_dict[room_name]
-                return room.get_room_entrance_from_cell(r, c)
-        elif val == "?":
+        if code == CELL_ROOM:
+            return self._rooms_by_id[self._room_of[i]]
+        elif code == CELL_ENTRANCE:
+            return self._entrance_at[i]
+        elif code == CELL_BONUS:
             return "bonus_card"
         else:
             return None
 
+    # ---------- fast query API (no object lookups) ----------
+    def cell_code(self, r, c):
+        """CELL_CORRIDOR / CELL_ROOM / CELL_ENTRANCE / CELL_BONUS, or CELL_OUT_OF_BOUNDS."""
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return CELL_OUT_OF_BOUNDS
+        return self._codes[r * self.cols + c]
+
+    def room_id(self, r, c):
+        """Index into room_names of the room a room or entrance cell belongs to, else -1."""
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return -1
+        return self._room_of[r * self.cols + c]
+
+    def room_name_at(self, r, c):
+        """Name of the room a room or entrance cell belongs to, else None."""
+        room_id = self.room_id(r, c)
+        return self.room_names[room_id] if room_id >= 0 else None
+
+    def entrance_at(self, r, c):
+        """RoomEntrance at (r, c) or None, in O(1)."""
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return None
+        return self._entrance_at[r * self.cols + c]
+
+    def room_cells(self, room_name):
+        """All cells inside the room, in row-major order."""
+        return self._room_cells.get(room_name, ())
+
+    # ---------- walking distances ----------
+    def _derived(self, attr, build):
+        """
+        Build a lazily created helper once, even when several games ask at the same time.
+        Derived caches are allowed on a frozen board.
+        """
+        with _derived_lock:
+            value = getattr(self, attr, None)
+            if value is None:
+                value = build()
+                object.__setattr__(self, attr, value)
+        return value
+
+    @property
+    def distances(self):
+        """Lazily loaded (memory-mapped when persisted) DistanceTable for this layout."""
+        table = getattr(self, "_distances", None)
+        if table is None:
+            from DistanceTable import DistanceTable
+            table = self._derived("_distances", lambda: DistanceTable.for_board(self))
+        return table
+
+    @property
+    def movement(self):
+        """Lazily built MovementEngine (precomputed adjacency) for this layout."""
+        engine = getattr(self, "_movement", None)
+        if engine is None:
+            from MovementEngine import MovementEngine
+            engine = self._derived("_movement", lambda: MovementEngine(self))
+        return engine
+
+    @property
+    def bitboard(self):
+        """Lazily built Bitboard (alternative movement backend) for this layout."""
+        bitboard = getattr(self, "_bitboard", None)
+        if bitboard is None:
+            from Bitboard import Bitboard
+            bitboard = self._derived("_bitboard", lambda: Bitboard(self))
+        return bitboard
+
+    @property
+    def move_cache(self):
+        """Lazily created MoveCache shared by every game played on this board."""
+        cache = getattr(self, "_move_cache", None)
+        if cache is None:
+            from MoveCache import MoveCache
+            cache = self._derived("_move_cache", MoveCache)
+        return cache
+
+    def distance_to_room(self, r, c, room_name):
+        """Walking steps from (r, c) to the nearest entrance of <room_name> (inf if unreachable)."""
+        return self.distances.to_room(r, c, room_name)
+
+    def distance_to_entrance(self, r, c, entrance):
+        """Walking steps from (r, c) to a RoomEntrance (inf if unreachable)."""
+        return self.distances.to_entrance(r, c, (entrance.row, entrance.column))
+
+    def is_passable(self, r, c):
+        """True for the cells movement may pass through: corridors and room entrances."""
+        code = self.cell_code(r, c)
+        return code == CELL_CORRIDOR or code == CELL_ENTRANCE
+
     def is_bonus_card_space(self, r, c):
         """Check if a cell is a bonus card space"""
         return (r, c) in self.bonus_card_spaces
@@ -0,0 +1,230 @@
+import hashlib
+import os
+import struct
+import threading
+from Constants import room_name_list, SECRET_PASSAGES
+
+# Cell-type codes stored in the compiled artifact
+CELL_CORRIDOR = 0
+CELL_ROOM     = 1
+CELL_ENTRANCE = 2
+CELL_BONUS    = 3
+CELL_OUT_OF_BOUNDS = -1   # never stored, returned by MansionBoard.cell_code
+
+NO_ROOM = 0xFF     # room id for cells that don't belong to a room
+
+MAGIC   = b"CLUEBRD"
+VERSION = 1
+
+DEFAULT_LAYOUT = "mansion_board_layout.xlsx"
+CACHE_DIR      = ".board_cache"
+
+# Process-wide flyweight boards: (layout path, source hash) → frozen MansionBoard
+_shared_boards = {}
+_shared_lock   = threading.Lock()
+
+
+class CompiledBoard:
+    """
+    Compact, parse-free description of the mansion layout.
+
+    cell_codes / cell_rooms are flat row-major byte strings (rows * cols);
+    entrances are (room_id, row, col) triples in scan order.
+    """
+    def __init__(self, source_hash, rows, cols, room_names, cell_codes, cell_rooms,
+                 entrances, bonus_spaces, secret_passages):
+        self.source_hash     = source_hash       # hex digest of the source layout
+        self.rows            = rows
+        self.cols            = cols
+        self.room_names      = room_names        # tuple, index == room id
+        self.cell_codes      = cell_codes        # bytes
+        self.cell_rooms      = cell_rooms        # bytes
+        self.entrances       = entrances         # tuple of (room_id, row, col)
+        self.bonus_spaces    = bonus_spaces      # tuple of (row, col)
+        self.secret_passages = secret_passages   # tuple of (src_id, dst_id)
+
+    # ---------- binary encoding ----------
+    def to_bytes(self):
+        out = [MAGIC, struct.pack("<B", VERSION)]
+        digest = bytes.fromhex(self.source_hash)
+        out.append(struct.pack("<B", len(digest)) + digest)
+        out.append(struct.pack("<HHB", self.rows, self.cols, len(self.room_names)))
+        for name in self.room_names:
+            encoded = name.encode("utf-8")
+            out.append(struct.pack("<B", len(encoded)) + encoded)
+        out.append(self.cell_codes)
+        out.append(self.cell_rooms)
+        out.append(struct.pack("<H", len(self.entrances)))
+        out.extend(struct.pack("<BBB", *e) for e in self.entrances)
+        out.append(struct.pack("<H", len(self.bonus_spaces)))
+        out.extend(struct.pack("<BB", *b) for b in self.bonus_spaces)
+        out.append(struct.pack("<B", len(self.secret_passages)))
+        out.extend(struct.pack("<BB", *p) for p in self.secret_passages)
+        return b"".join(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a compiled board artifact")
+        pos = len(MAGIC)
+        (version,) = struct.unpack_from("<B", data, pos); pos += 1
+        if version != VERSION:
+            raise ValueError(f"Unsupported board artifact version {version}")
+
+        (digest_len,) = struct.unpack_from("<B", data, pos); pos += 1
+        source_hash = data[pos:pos + digest_len].hex(); pos += digest_len
+
+        rows, cols, n_rooms = struct.unpack_from("<HHB", data, pos); pos += 5
+        room_names = []
+        for _ in range(n_rooms):
+            (length,) = struct.unpack_from("<B", data, pos); pos += 1
+            room_names.append(data[pos:pos + length].decode("utf-8")); pos += length
+
+        n_cells = rows * cols
+        cell_codes = bytes(data[pos:pos + n_cells]); pos += n_cells
+        cell_rooms = bytes(data[pos:pos + n_cells]); pos += n_cells
+
+        (n_entrances,) = struct.unpack_from("<H", data, pos); pos += 2
+        entrances = tuple(struct.iter_unpack("<BBB", data[pos:pos + 3 * n_entrances]))
+        pos += 3 * n_entrances
+
+        (n_bonus,) = struct.unpack_from("<H", data, pos); pos += 2
+        bonus_spaces = tuple(struct.iter_unpack("<BB", data[pos:pos + 2 * n_bonus]))
+        pos += 2 * n_bonus
+
+        (n_passages,) = struct.unpack_from("<B", data, pos); pos += 1
+        secret_passages = tuple(struct.iter_unpack("<BB", data[pos:pos + 2 * n_passages]))
+
+        return cls(source_hash, rows, cols, tuple(room_names), cell_codes, cell_rooms,
+                   entrances, bonus_spaces, secret_passages)
+
+
+# ---------- compiling ----------
+def hash_file(path):
+    """Return the hex digest used to key artifacts built from <path>."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def hash_grid(grid):
+    """Return the hex digest used to key artifacts built from an in-memory grid."""
+    text = "\n".join("\t".join(str(val) for val in row) for row in grid)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compile_grid(grid, source_hash=None):
+    """
+    Compile a 2-D grid of cell strings (room names, "<room>_e" entrances,
+    "?" bonus spaces, anything else is corridor) into a CompiledBoard.
+    """
+    if source_hash is None:
+        source_hash = hash_grid(grid)
+    room_ids = {name: i for i, name in enumerate(room_name_list)}
+    rows, cols = len(grid), len(grid[0]) if len(grid) else 0
+    cell_codes = bytearray(rows * cols)
+    cell_rooms = bytearray([NO_ROOM]) * (rows * cols)
+    entrances, bonus_spaces = [], []
+
+    for r in range(rows):
+        for c in range(cols):
+            val = str(grid[r][c])
+            i = r * cols + c
+            if val in room_ids:
+                cell_codes[i] = CELL_ROOM
+                cell_rooms[i] = room_ids[val]
+            elif val.endswith("_e") and val.replace("_e", "") in room_ids:
+                room_id = room_ids[val.replace("_e", "")]
+                cell_codes[i] = CELL_ENTRANCE
+                cell_rooms[i] = room_id
+                entrances.append((room_id, r, c))
+            elif val == "?":
+                cell_codes[i] = CELL_BONUS
+                bonus_spaces.append((r, c))
+
+    secret_passages = tuple((room_ids[src], room_ids[dst])
+                            for src, dst in SECRET_PASSAGES.items()
+                            if src in room_ids and dst in room_ids)
+
+    return CompiledBoard(source_hash, rows, cols, tuple(room_name_list), bytes(cell_codes),
+                         bytes(cell_rooms), tuple(entrances), tuple(bonus_spaces), secret_passages)
+
+
+def compile_layout(xlsx_path=DEFAULT_LAYOUT, source_hash=None):
+    """Parse the Excel layout and compile it (the slow path)."""
+    import pandas as pd
+    if source_hash is None:
+        source_hash = hash_file(xlsx_path)
+    layout = pd.read_excel(xlsx_path, header=None)
+    return compile_grid(layout.fillna("").to_numpy(), source_hash)
+
+
+def artifact_path(xlsx_path, source_hash, cache_dir=None):
+    """Location of the compiled artifact for a given source hash."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(xlsx_path)), CACHE_DIR)
+    stem = os.path.splitext(os.path.basename(xlsx_path))[0]
+    return os.path.join(cache_dir, f"{stem}-{source_hash[:16]}.board")
+
+
+def load_compiled(xlsx_path=DEFAULT_LAYOUT, cache_dir=None):
+    """
+    Return the CompiledBoard for <xlsx_path>, compiling and caching it
+    when no artifact exists for the file's current contents.
+    """
+    source_hash = hash_file(xlsx_path)
+    path = artifact_path(xlsx_path, source_hash, cache_dir)
+
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            try:
+                compiled = CompiledBoard.from_bytes(f.read())
+            except (ValueError, struct.error):
+                compiled = None
+        if (compiled is not None and compiled.source_hash == source_hash
+                and compiled.room_names == tuple(room_name_list)):
+            return compiled
+
+    compiled = compile_layout(xlsx_path, source_hash)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write-then-rename so concurrent workers never read a partial file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(compiled.to_bytes())
+    os.replace(tmp_path, path)
+    return compiled
+
+
+def load_board(xlsx_path=DEFAULT_LAYOUT, cache_dir=None):
+    """Build a MansionBoard from the cached artifact (rebuilt if stale)."""
+    from Board import MansionBoard
+    compiled = load_compiled(xlsx_path, cache_dir)
+    prefix = artifact_path(xlsx_path, compiled.source_hash, cache_dir)[:-len(".board")]
+    return MansionBoard.from_compiled(compiled, cache_prefix=prefix)
+
+
+def get_shared_board(xlsx_path=DEFAULT_LAYOUT, cache_dir=None):
+    """
+    Return the process-wide, read-only MansionBoard for <xlsx_path>.
+    The board is built once per process (and again only if the file changes).
+    Only the file's size and modification time are checked per call; its
+    contents are hashed when a board has to be built.
+    """
+    stat = os.stat(xlsx_path)
+    key = (os.path.abspath(xlsx_path), stat.st_mtime_ns, stat.st_size)
+    board = _shared_boards.get(key)
+    if board is None:
+        with _shared_lock:
+            board = _shared_boards.get(key)
+            if board is None:
+                board = load_board(xlsx_path, cache_dir).freeze()
+                _shared_boards[key] = board
+    return board
+
+
+if __name__ == "__main__":
+    import sys
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LAYOUT
+    compiled = load_compiled(source)
+    print(f"Compiled {source} ({compiled.rows}x{compiled.cols}, "
+          f"{len(compiled.entrances)} entrances, {len(compiled.bonus_spaces)} bonus spaces)")
+    print(f"Artifact: {artifact_path(source, compiled.source_hash)}")
@@ -2,14 +2,15 @@ import random
 from Constants import BONUS_CARD_TYPES
 
 class BonusCard:
-    def __init__(self, card_type=None):
+    def __init__(self, card_type=None, rng=random):
         """
         Initialize a bonus card with a specific type or random type
         
         Args:
             card_type (str, optional): The type of bonus card. If None, a random type is chosen.
+            rng (random.Random, optional): Source of the random type (the game's generator).
         """
-        self.card_type = card_type if card_type else random.choice(BONUS_CARD_TYPES)
+        self.card_type = card_type if card_type else rng.choice(BONUS_CARD_TYPES)
         self.description = self._get_description()
         self.immediate = self._is_immediate()
         
@@ -50,9 +51,9 @@ class BonusCard:
             if not other_players:
                 return "No other players to see cards from."
             
-            print("Choose a player to see a card from:")
+            game.log.info("Choose a player to see a card from:")
             for i, p in enumerate(other_players):
-                print(f"{i+1}. {p.character.name}")
+                game.log.info("%s. %s", i + 1, p.character.name)
             
             choice = int(input("Enter your choice: ")) - 1
             target_player = other_players[choice]
@@ -60,21 +61,21 @@ class BonusCard:
             if not target_player.hand:
                 return f"{target_player.character.name} has no cards."
             
-            card = random.choice(target_player.hand)
+            card = game.rng.choice(target_player.hand)
             return f"You saw {card} from {target_player.character.name}'s hand."
         
         elif self.card_type == "Move Any Character":
             # Choose a character and move them to a room
-            print("Choose a character to move:")
+            game.log.info("Choose a character to move:")
             for i, name in enumerate(game.char_board.positions.keys()):
-                print(f"{i+1}. {name}")
+                game.log.info("%s. %s", i + 1, name)
             
             choice = int(input("Enter your choice: ")) - 1
             character_name = list(game.char_board.positions.keys())[choice]
             
-            print("Choose a room to move to:")
+            game.log.info("Choose a room to move to:")
             for i, room_name in enumerate(game.mansion_board.room_dict.keys()):
-                print(f"{i+1}. {room_name}")
+                game.log.info("%s. %s", i + 1, room_name)
             
             choice = int(input("Enter your choice: ")) - 1
             room_name = list(game.mansion_board.room_dict.keys())[choice]
@@ -90,9 +91,9 @@ class BonusCard:
         
         elif self.card_type == "Teleport":
             # Move the player's character to any room
-            print("Choose a room to teleport to:")
+            game.log.info("Choose a room to teleport to:")
             for i, room_name in enumerate(game.mansion_board.room_dict.keys()):
-                print(f"{i+1}. {room_name}")
+                game.log.info("%s. %s", i + 1, room_name)
             
             choice = int(input("Enter your choice: ")) - 1
             room_name = list(game.mansion_board.room_dict.keys())[choice]
@@ -110,7 +111,7 @@ class BonusCard:
         elif self.card_type == "Peek At Envelope":
             # Look at one card in the envelope
             envelope_cards = list(game.solution.values())
-            card_type = random.choice(["suspect", "weapon", "room"])
+            card_type = game.rng.choice(["suspect", "weapon", "room"])
             card = game.solution[card_type]
             return f"You peeked at the envelope and saw: {card} ({card_type})."
         
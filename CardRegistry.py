@@ -0,0 +1,51 @@
+from Constants import SUSPECTS, WEAPONS, ROOMS, ALL_CARDS
+
+# Stable integer ids: suspects, then weapons, then rooms, in ALL_CARDS order.
+# Names are only needed at the edges (input, display, logs).
+CARD_NAMES = tuple(ALL_CARDS)
+CARD_ID = {card: i for i, card in enumerate(CARD_NAMES)}
+N_CARDS = len(CARD_NAMES)
+
+# Each category is a contiguous range of ids, so a category is a bit range of a card mask
+CATEGORY_RANGES = (range(0, len(SUSPECTS)),
+                   range(len(SUSPECTS), len(SUSPECTS) + len(WEAPONS)),
+                   range(len(SUSPECTS) + len(WEAPONS), N_CARDS))
+CATEGORY_MASKS = tuple(((1 << len(r)) - 1) << r.start for r in CATEGORY_RANGES)
+SUSPECT_MASK, WEAPON_MASK, ROOM_MASK = CATEGORY_MASKS
+ALL_MASK = (1 << N_CARDS) - 1
+
+assert [CARD_NAMES[i] for r in CATEGORY_RANGES for i in r] == SUSPECTS + WEAPONS + ROOMS
+
+
+def hand_sizes(n_players):
+    """Cards per player when the 18 non-envelope cards are dealt round-robin from player 0."""
+    dealt = N_CARDS - 3
+    return tuple(dealt // n_players + (1 if i < dealt % n_players else 0) for i in range(n_players))
+
+
+def card_mask(cards):
+    """Bitmask of the named cards."""
+    mask = 0
+    for card in cards:
+        mask |= 1 << CARD_ID[card]
+    return mask
+
+
+def lowest_card(mask):
+    """Id of the lowest card in a non-empty <mask>."""
+    return (mask & -mask).bit_length() - 1
+
+
+def mask_cards(mask):
+    """Names of the cards in <mask>, lowest id first."""
+    names = []
+    while mask:
+        low = mask & -mask
+        names.append(CARD_NAMES[low.bit_length() - 1])
+        mask ^= low
+    return names
+
+
+def holder_name(holder, n_players):
+    """Display name of holder id <holder>: players are "P<id>", then the envelope."""
+    return "ENVELOPE" if holder == n_players else f"P{holder}"
@@ -11,4 +11,6 @@ class Character:
     def __repr__(self):
         return f"{self.name} at {self.position}"
 
-character_dict = {name : Character(name) for name in character_name_list}
\ No newline at end of file
+def new_character_dict():
+    """Fresh tokens for one game, keyed by name (each game owns its own positions)."""
+    return {name : Character(name) for name in character_name_list}
@@ -0,0 +1,267 @@
+import time
+from functools import cached_property
+import numpy as np
+from Constants import ALL_CARDS
+from CardRegistry import N_CARDS, CATEGORY_RANGES
+from EnvelopeInference import hand_sizes, knowledge_key
+
+DEFAULT_SAMPLES = 4000
+BATCH_SIZE = 1000
+MIN_VALID = 256         # consistent deals below which a fresh sample draws more
+MAX_BUDGET_FACTOR = 4   # how far past n_samples sampling goes to reach min_valid
+Z_95 = 1.96
+
+# (first, last) card id of each category
+_CATEGORIES = tuple((r[0], r[-1]) for r in CATEGORY_RANGES)
+_CARD_IDS = np.arange(N_CARDS)
+_CARD_BITS = 1 << _CARD_IDS
+_CATEGORY_OF = np.array([k for k, (first, last) in enumerate(_CATEGORIES) for _ in range(first, last + 1)])
+# Card id scaled to its place in a triple id, (suspect * N + weapon) * N + room
+_TRIPLE_PLACES = _CARD_IDS * np.array([N_CARDS * N_CARDS, N_CARDS, 1])[_CATEGORY_OF]
+
+
+class SampledMarginals:
+    """
+    Importance-weighted Monte Carlo estimate of card locations.
+
+    envelope[card] and holder[card][holder] are posterior probabilities,
+    interval(card, holder) a 95% confidence interval based on the effective
+    sample size. n_drawn counts proposals and n_valid the consistent ones.
+
+    The consistent deals themselves are kept for further estimates:
+    deals[i, card] is a holder id, weights[i] the normalised weight and
+    solution_index[i] the deal's envelope among n_solutions distinct ones.
+    knowledge is the knowledge_key() the deals were drawn for. Everything
+    but the deals and weights is worked out on first use.
+    """
+    def __init__(self, holders, deals, weights, n_drawn, knowledge=None):
+        self.holders = holders
+        self.knowledge = knowledge
+        self.n_drawn = n_drawn
+        valid = weights > 0
+        self.n_valid = int(np.count_nonzero(valid))
+        if self.n_valid < len(weights):
+            deals, weights = deals[valid], weights[valid]
+        total = weights.sum()
+        self.effective_samples = float(total ** 2 / (weights @ weights)) if total else 0.0
+        self.deals = deals
+        self.weights = weights / total if total else weights
+
+    @cached_property
+    def probs(self):
+        """probs[c, h] = weighted share of deals giving card c to holder h."""
+        probs = np.zeros((N_CARDS, len(self.holders)))
+        for h in range(len(self.holders)):
+            probs[:, h] = self.weights @ (self.deals == h)
+        return probs
+
+    @cached_property
+    def holder(self):
+        return {card: dict(zip(self.holders, self.probs[c].tolist())) for c, card in enumerate(ALL_CARDS)}
+
+    @cached_property
+    def envelope(self):
+        return dict(zip(ALL_CARDS, (self.weights @ (self.deals == len(self.holders) - 1)).tolist()))
+
+    @cached_property
+    def _triples(self):
+        """(solution_index, ids): each deal's envelope as an index into the sorted triple ids."""
+        # One envelope card per category, so (suspect * N + weapon) * N + room identifies it
+        ids, inverse = np.unique((self.deals == len(self.holders) - 1) @ _TRIPLE_PLACES, return_inverse=True)
+        return inverse.ravel(), ids
+
+    @property
+    def solution_index(self):
+        return self._triples[0]
+
+    @property
+    def n_solutions(self):
+        return len(self._triples[1])
+
+    @cached_property
+    def _solutions(self):
+        """Probability of each envelope triple seen in a deal."""
+        solutions = {}
+        mass = np.bincount(self.solution_index, weights=self.weights, minlength=self.n_solutions)
+        for triple_id, p in zip(self._triples[1].tolist(), mass.tolist()):
+            if p > 0:
+                rest, r = divmod(triple_id, N_CARDS)
+                s, w = divmod(rest, N_CARDS)
+                solutions[(ALL_CARDS[s], ALL_CARDS[w], ALL_CARDS[r])] = p
+        return solutions
+
+    @cached_property
+    def _hand_masks(self):
+        """_hand_masks[h, i] = bit mask of the cards deal i gives to holder h."""
+        # Float products are exact below 2 ** 53 and much faster than integer ones
+        bits = _CARD_BITS.astype(float)
+        return np.stack([(self.deals == h) @ bits for h in range(len(self.holders))]).astype(np.int64)
+
+    def restrict(self, matrix):
+        """
+        Estimate for <matrix> from the deals here that are still consistent
+        with it, or None if <matrix> does not know at least what this
+        estimate's knowledge did. Narrower knowledge only rules deals out, so
+        dropping them leaves the rest weighted as a fresh sample would be:
+        no new sampling, just a filter.
+        """
+        knowledge = knowledge_key(matrix)
+        n_players, rows, clauses = knowledge
+        if self.knowledge is None or not _refines(knowledge, self.knowledge):
+            return None
+        masks = self._hand_masks
+        ruled_out = [sum(1 << c for c, row in enumerate(rows) if not row >> h & 1) for h in range(n_players + 1)]
+        keep = ((masks & np.array(ruled_out)[:, None]) == 0).all(axis=0)
+        for h, mask in clauses:
+            keep &= (masks[h] & mask) != 0
+        estimate = SampledMarginals(self.holders, self.deals[keep], self.weights[keep], self.n_drawn, knowledge)
+        estimate._hand_masks = masks[:, keep]
+        return estimate
+
+    def subsample(self, n_deals):
+        """
+        Estimate from <n_deals> equally weighted deals drawn in proportion to
+        the weights here (systematic resampling), for scoring that costs per deal.
+        """
+        picks = np.searchsorted(np.cumsum(self.weights), (np.arange(n_deals) + 0.5) / n_deals)
+        picks = np.minimum(picks, len(self.weights) - 1)
+        return SampledMarginals(self.holders, self.deals[picks], np.ones(n_deals), self.n_drawn, self.knowledge)
+
+    def interval(self, card, holder="ENVELOPE"):
+        """95% confidence interval for P(card is with holder)."""
+        p = self.holder[card][holder]
+        if not self.effective_samples:
+            return 0.0, 1.0
+        half = Z_95 * (max(0.0, p * (1 - p)) / self.effective_samples) ** 0.5
+        return max(0.0, p - half), min(1.0, p + half)
+
+    def best_solution(self):
+        """(triple, probability, lower 95% bound) of the likeliest envelope, or None."""
+        if not self._solutions:
+            return None
+        triple, p = max(self._solutions.items(), key=lambda item: item[1])
+        half = Z_95 * (max(0.0, p * (1 - p)) / self.effective_samples) ** 0.5
+        return triple, p, max(0.0, p - half)
+
+
+def sample_marginals(matrix, n_samples=DEFAULT_SAMPLES, time_limit=None, rng=None, min_valid=0):
+    """
+    Estimate card locations for <matrix> from up to <n_samples> sampled deals,
+    stopping early (after at least one batch) once <time_limit> seconds pass.
+    While fewer than <min_valid> deals are consistent (most proposals hit dead
+    ends with many players), sampling goes on up to MAX_BUDGET_FACTOR times
+    <n_samples>. Raises ValueError if the matrix contradicts itself (a clause
+    with no possible card), since no deal can be consistent with it.
+    """
+    if rng is None or isinstance(rng, int):
+        rng = np.random.default_rng(rng)
+    knowledge = knowledge_key(matrix)
+    n_players, rows, clauses = knowledge
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    all_deals, all_weights, drawn, valid = [], [], 0, 0
+    while drawn < n_samples or (valid < min_valid and drawn < MAX_BUDGET_FACTOR * n_samples):
+        size = min(BATCH_SIZE, (n_samples if drawn < n_samples else MAX_BUDGET_FACTOR * n_samples) - drawn)
+        deals, weights = _sample_batch(n_players, rows, clauses, size, rng)
+        all_deals.append(deals)
+        all_weights.append(weights)
+        drawn += size
+        valid += int(np.count_nonzero(weights))
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+    return SampledMarginals(matrix.holders, np.concatenate(all_deals), np.concatenate(all_weights), drawn,
+                            knowledge)
+
+
+def _refines(knowledge, previous):
+    """True if <knowledge> (a knowledge_key) implies everything <previous> did."""
+    n_players, rows, clauses = knowledge
+    if n_players != previous[0] or any(row & ~old for row, old in zip(rows, previous[1])):
+        return False
+    for h, mask in previous[2]:
+        # Still required, at least as narrowly, or already met by a card known to be with h
+        if not any(h2 == h and not m2 & ~mask for h2, m2 in clauses) and \
+                not any(rows[c] == 1 << h for c in _mask_ids(mask)):
+            return False
+    return True
+
+
+def _mask_ids(mask):
+    """Card ids in <mask>, lowest first."""
+    return [c for c in range(N_CARDS) if mask >> c & 1]
+
+
+def _sample_batch(n_players, rows, clauses, size, rng):
+    """
+    Deal <size> hands at once, card by card (most constrained cards first).
+    Each card goes to an allowed holder with probability proportional to its
+    free slots; the weight 1 / P(proposal) makes the weighted deals uniform
+    over consistent ones. The last card that can still fill the envelope's
+    category, or satisfy an open clause, is forced; dead ends get weight 0.
+    """
+    envelope = n_players
+    # Free slots: one column per player, then one envelope slot per category
+    caps = np.zeros((size, n_players + len(_CATEGORIES)), dtype=np.int64)
+    caps[:, :n_players] = hand_sizes(n_players)
+    caps[:, n_players:] = 1
+    deals = np.zeros((size, N_CARDS), dtype=np.int8)
+    weights = np.ones(size)
+    index = np.arange(size)
+
+    category = _CATEGORY_OF.tolist()
+    clause_cards = [_mask_ids(mask) for _, mask in clauses]
+    for (h, _), cards in zip(clauses, clause_cards):
+        if not cards:
+            raise ValueError(f"Inconsistent knowledge: holder {h} must hold a card from a clause "
+                             f"whose cards are all ruled out")
+    satisfied = np.zeros((size, len(clauses)), dtype=bool)
+
+    if not all(rows):
+        return deals, np.zeros(size)   # a card nobody can hold: no deal is consistent
+    # A card with one possible holder goes the same way in every deal: place it up front
+    placed = {c: rows[c].bit_length() - 1 for c in range(N_CARDS) if not rows[c] & (rows[c] - 1)}
+    for c, h in placed.items():
+        deals[:, c] = h
+        caps[:, n_players + category[c] if h == envelope else h] -= 1
+    for j, cards in enumerate(clause_cards):
+        satisfied[:, j] = any(placed.get(c) == clauses[j][0] for c in cards)
+
+    order = sorted((c for c in range(N_CARDS) if c not in placed), key=lambda c: bin(rows[c]).count("1"))
+    last_of_category = {category[c]: c for c in order}
+    closing = {}
+    for j, cards in enumerate(clause_cards):
+        free = [c for c in cards if c not in placed]
+        if free:
+            closing.setdefault(max(free, key=order.index), []).append(j)
+
+    for c in order:
+        # Only the card's possible holders compete; the envelope, if possible, comes last
+        holders = [h for h in range(n_players + 1) if rows[c] >> h & 1]
+        columns = [h if h != envelope else n_players + category[c] for h in holders]
+        slots = caps[:, columns]
+        if last_of_category[category[c]] == c and holders[-1] == envelope:
+            # The envelope still needs this category's card: nothing else will do
+            slots[slots[:, -1] == 1, :-1] = 0
+        for j in closing.get(c, ()):
+            # Likewise for a clause no earlier card has satisfied
+            h = clauses[j][0]
+            open_rows = ~satisfied[:, j]
+            keep = slots[open_rows, holders.index(h)] if h in holders else 0
+            slots[open_rows] = 0
+            if h in holders:
+                slots[open_rows, holders.index(h)] = keep
+        # A dead end has no free slot: total 0 zeroes its weight, and what it
+        # does to caps afterwards no longer matters
+        total = slots.sum(axis=1)
+        pick = np.argmax(slots.cumsum(axis=1) > (rng.random(size) * total)[:, None], axis=1)
+        weights *= total / np.maximum(slots[index, pick], 1)
+        caps[index, np.array(columns)[pick]] -= 1
+        deals[:, c] = choice = np.array(holders, dtype=np.int8)[pick]
+        for j, cards in enumerate(clause_cards):
+            if c in cards:
+                satisfied[:, j] |= choice == clauses[j][0]
+
+    # Every slot filled exactly (a placed card may have overfilled one)
+    weights[(caps != 0).any(axis=1)] = 0.0
+    weights[~satisfied.all(axis=1)] = 0.0
+    return deals, weights
@@ -1,14 +1,409 @@
+from collections.abc import Mapping
 from Constants import SUSPECTS, WEAPONS, ROOMS, ALL_CARDS
+from CardRegistry import CARD_ID, CARD_NAMES, N_CARDS, CATEGORY_MASKS, card_mask, hand_sizes, holder_name
+from Zobrist import MATRIX_KEYS, MAX_HOLDERS, MASK64, clause_key, matrix_owner
+
+CARD_INDEX = CARD_ID   # card name → id, kept under its old name
+
+
+def _bits(mask):
+    """Indices of the set bits of <mask>, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
 
 
 class PossibilityMatrix:
     """
+    poss[card][holder] == True   ⇒  card *could* be with holder
+    holders = ["P0", "P1", ... , "ENVELOPE"]
+
+    Stored as bitsets: rows[c] is a mask over holder indices for card c,
+    cols[h] the mask of cards holder h could have and definite[h] the cards
+    known to be with h. Every change queues the holders it touches, and
+    propagate() only re-examines queued holders.
+
+    Refutations we did not see are kept as clauses ("holder has at least one
+    of these cards"). Each clause watches two of its cards that are still
+    possible, so an elimination only revisits the clauses watching it.
+
+    Every row change is logged on a trail, so checkpoint() / rollback(token)
+    undo hypothetical observations without copying the matrix.
+
+    Given a PublicKnowledge layer, the matrix becomes an overlay: it only
+    records its own hand and the cards it is shown, and everything public
+    arrives from the shared layer.
+
+    zobrist is a 64-bit hash of the rows and clauses, kept up to date on
+    every row write and clause change (so rollback restores it too).
+    """
+    def __init__(self, n_players, my_id, my_hand, public=None):
+        self.holders = [holder_name(i, n_players) for i in range(n_players + 1)]
+        self.me      = holder_name(my_id, n_players) if my_id is not None else None
+        self.holder_index = {h: i for i, h in enumerate(self.holders)}
+        self.envelope_index = n_players
+        self.my_index = my_id
+        # Cards are dealt round-robin (3 in the envelope), so with 4 or 5
+        # players the first hands hold one card more than the rest
+        self.hand_sizes = hand_sizes(n_players)
+
+        # Start with everything possible
+        self.rows     = [(1 << len(self.holders)) - 1] * N_CARDS
+        self.cols     = [(1 << N_CARDS) - 1] * len(self.holders)
+        self.definite = [0] * len(self.holders)
+        self._pending = 0     # worklist: bitmask of holders to re-examine
+        self._trail   = []    # (card, previous row) for every row change, oldest first
+        self._poss    = PossView(self)
+        self._set_owner(my_id)
+
+        # Clauses are [holder, card mask, watch1, watch2]; a literal is
+        # card * len(holders) + holder and _watches maps it to clause ids
+        self.clauses    = []
+        self._watches   = {}
+        self._falsified = []  # worklist: watched literals that became impossible
+
+        # Apply certainty about my own hand
+        if my_id is not None:
+            hand = card_mask(my_hand)
+            me_bit = 1 << my_id
+            for c in range(N_CARDS):
+                self._set_row(c, me_bit if hand >> c & 1 else self.rows[c] & ~me_bit)
+
+        self.propagate()
+        self.public = public
+        if public is not None:
+            public.attach(self)
+
+    @classmethod
+    def restore(cls, n_players, my_id, rows, clauses):
+        """
+        Standalone matrix holding already-propagated knowledge, e.g. the rows and
+        (holder, card mask) clauses of knowledge_key() or a GameState.
+        """
+        matrix = cls(n_players, None, ())
+        matrix.me, matrix.my_index = holder_name(my_id, n_players), my_id
+        matrix._set_owner(my_id, rows)
+        matrix.rows = list(rows)
+        cols, definite = [0] * (n_players + 1), matrix.definite
+        for c, row in enumerate(rows):
+            card_bit, rest = 1 << c, row
+            while rest:
+                low = rest & -rest
+                cols[low.bit_length() - 1] |= card_bit
+                rest ^= low
+            if row and not row & (row - 1):
+                definite[row.bit_length() - 1] |= card_bit
+        matrix.cols = cols
+        for h, mask in clauses:
+            matrix._add_clause(h, mask)
+        matrix._pending, matrix._falsified, matrix._trail = 0, [], []
+        return matrix
+
+    def _set_owner(self, my_id, rows=None):
+        """Pick the Zobrist keys of <my_id>'s matrices and hash <rows> (default: the current rows)."""
+        self._zkeys = MATRIX_KEYS[matrix_owner(my_id)]
+        self._zowner = matrix_owner(my_id)
+        row_hash = 0
+        for c, row in enumerate(self.rows if rows is None else rows):
+            base = c * MAX_HOLDERS
+            while row:
+                low = row & -row
+                row_hash ^= self._zkeys[base + low.bit_length() - 1]
+                row ^= low
+        self._row_hash, self._clause_hash = row_hash, 0
+
+    # ---------- public API ----------
+    @property
+    def poss(self):
+        """Read-only poss[card][holder] view of the bitsets."""
+        return self._poss
+
+    def set_holder(self, card, holder):
+        """Card is definitively with <holder>."""
+        self.set_holder_id(CARD_ID[card], self.holder_index[holder])
+
+    def eliminate(self, card, holder):
+        """Card cannot be with <holder>."""
+        self.eliminate_ids(1 << CARD_ID[card], self.holder_index[holder])
+
+    def add_clause(self, holder, cards):
+        """<holder> has at least one of <cards> (e.g. refuted without us seeing the card)."""
+        self.add_clause_mask(self.holder_index[holder], card_mask(cards))
+
+    # Id-level versions: cards are ids or card masks, holders are ids
+    # (player id, or n_players for the envelope)
+    def set_holder_id(self, c, h):
+        """Card id c is definitively with holder id h."""
+        self._set_row(c, 1 << h)
+        self.propagate()
+
+    def eliminate_ids(self, mask, h):
+        """None of the cards in <mask> is with holder id h."""
+        mask &= self.cols[h]
+        if mask:
+            self._eliminate(mask, h)
+            self.propagate()
+
+    def add_clause_mask(self, h, mask):
+        """Holder id h has at least one of the cards in <mask>."""
+        self._add_clause(h, mask)
+        self.propagate()
+
+    def absorb_public(self, changed, clauses, public):
+        """Take on the rows of <public> for the <changed> card mask, plus its new <clauses>."""
+        for c in _bits(changed):
+            self._set_row(c, self.rows[c] & public.rows[c])
+        for h, mask in clauses:
+            self._add_clause(h, mask)
+        self.propagate()
+
+    def absorb_history(self, history):
+        """Apply everything this player learned from the suggestions in a SuggestionHistory."""
+        my_id = self.my_index
+        for suggestion in history.get_all_suggestions():
+            mask = suggestion.cards_mask
+            for player_id in suggestion.passed_by:
+                self.eliminate_ids(mask, player_id)
+            refuter = suggestion.refuted_by
+            if refuter is None:
+                continue
+            if suggestion.player_id == my_id and suggestion.shown_id is not None:
+                self.set_holder_id(suggestion.shown_id, refuter)
+            elif refuter != my_id:
+                self.add_clause_mask(refuter, mask)
+
+    @property
+    def zobrist(self):
+        """64-bit hash of what this matrix knows (rows, then clauses added so far)."""
+        return self._row_hash ^ self._clause_hash
+
+    def checkpoint(self):
+        """Token for the current state, to hand to rollback()."""
+        return len(self._trail), len(self.clauses)
+
+    def rollback(self, token):
+        """
+        Undo every change made since checkpoint() returned <token>. Tokens
+        nest: rolling back to an older one also discards the newer ones.
+        """
+        trail_size, n_clauses = token
+        while len(self._trail) > trail_size:
+            c, old = self._trail.pop()
+            self._write_row(c, old)
+        # Watches moved since the checkpoint still point at cards that were
+        # possible then, so only the clauses added since need removing
+        n_holders = len(self.holders)
+        while len(self.clauses) > n_clauses:
+            h, mask, w1, w2 = self.clauses.pop()
+            self._clause_hash = (self._clause_hash - clause_key(self._zowner, h, mask)) & MASK64
+            for literal in (w1 * n_holders + h, w2 * n_holders + h):
+                watching = self._watches[literal]
+                watching.remove(len(self.clauses))
+                if not watching:
+                    del self._watches[literal]
+
+    def card_owner(self, card):
+        """Return holder if known, else None."""
+        row = self.rows[CARD_ID[card]]
+        if row and not row & (row - 1):
+            return self.holders[row.bit_length() - 1]
+        return None
+
+    # ---------- core propagation ----------
+    def _eliminate(self, mask, h):
+        bit = 1 << h
+        for c in _bits(mask):
+            self._set_row(c, self.rows[c] & ~bit)
+
+    def _add_clause(self, h, mask):
+        """Record "holder h has one of the cards in <mask>" without propagating."""
+        live = mask & self.cols[h]
+        if self.definite[h] & mask or not live:
+            return   # already satisfied, or contradicts what we know
+        if not live & (live - 1):
+            self._set_row(live.bit_length() - 1, 1 << h)
+        else:
+            w1 = (live & -live).bit_length() - 1
+            rest = live & (live - 1)
+            w2 = (rest & -rest).bit_length() - 1
+            n_holders = len(self.holders)
+            self.clauses.append([h, mask, w1, w2])
+            # Summed rather than XOR-ed, so a repeated clause does not cancel out
+            self._clause_hash = (self._clause_hash + clause_key(self._zowner, h, mask)) & MASK64
+            self._watches.setdefault(w1 * n_holders + h, []).append(len(self.clauses) - 1)
+            self._watches.setdefault(w2 * n_holders + h, []).append(len(self.clauses) - 1)
+
+    def _set_row(self, c, new):
+        """Replace card c's holder mask, keeping cols/definite and the worklist in step."""
+        old = self.rows[c]
+        if new == old:
+            return
+        self._trail.append((c, old))
+        self._write_row(c, new)
+        self._pending |= old | new
+        if self._watches:
+            n_holders = len(self.holders)
+            for h in _bits(old & ~new):
+                if c * n_holders + h in self._watches:
+                    self._falsified.append(c * n_holders + h)
+
+    def _write_row(self, c, new):
+        """Store card c's holder mask and update cols/definite to match."""
+        old = self.rows[c]
+        self.rows[c] = new
+        card_bit = 1 << c
+        keys, base, row_hash = self._zkeys, c * MAX_HOLDERS, self._row_hash
+        for h in _bits(old ^ new):
+            self.cols[h] ^= card_bit
+            row_hash ^= keys[base + h]
+        self._row_hash = row_hash
+        if old and not old & (old - 1):
+            self.definite[old.bit_length() - 1] &= ~card_bit
+        if new and not new & (new - 1):
+            self.definite[new.bit_length() - 1] |= card_bit
+
+    def _update_clauses(self, literal):
+        """A watched literal became impossible: move each watch, or force the last card."""
+        c, h = divmod(literal, len(self.holders))
+        watching = self._watches.pop(literal, None)
+        if not watching:
+            return
+        keep = []
+        for cid in watching:
+            clause = self.clauses[cid]
+            mask, w1, w2 = clause[1], clause[2], clause[3]
+            other = w2 if w1 == c else w1
+            if self.definite[h] & mask:
+                keep.append(cid)   # satisfied, nothing to learn
+                continue
+            candidates = mask & self.cols[h] & ~(1 << other)
+            if candidates:
+                new_watch = (candidates & -candidates).bit_length() - 1
+                clause[2], clause[3] = other, new_watch
+                self._watches.setdefault(new_watch * len(self.holders) + h, []).append(cid)
+            else:
+                keep.append(cid)
+                if self.rows[other] >> h & 1:
+                    self._set_row(other, 1 << h)   # only one card left that holder can have
+        if keep:
+            self._watches.setdefault(literal, []).extend(keep)
+
+    def propagate(self):
+        sizes = self.hand_sizes
+        while self._pending or self._falsified:
+            if self._falsified:
+                self._update_clauses(self._falsified.pop())
+                continue
+            low = self._pending & -self._pending
+            self._pending ^= low
+            h = low.bit_length() - 1
+            if h == self.envelope_index:
+                continue
+
+            # If a player has exactly the right number of possible cards,
+            # and some are definite, then the rest must also be definite
+            possible, known = self.cols[h], self.definite[h]
+            if (h != self.my_index and possible != known
+                    and possible.bit_count() == sizes[h] and known):
+                for c in _bits(possible & ~known):
+                    self._set_row(c, low)
+
+            # If a player has exactly the right number of definite cards,
+            # eliminate all other possibilities
+            possible, known = self.cols[h], self.definite[h]
+            if possible != known and known.bit_count() == sizes[h]:
+                for c in _bits(possible & ~known):
+                    self._set_row(c, self.rows[c] & ~low)
+
+    # ---------- envelope deduction ----------
+    def envelope_complete(self):
+        """Return (suspect, weapon, room) if all three forced, else None."""
+        known = self.definite[self.envelope_index]
+        found = [known & mask for mask in CATEGORY_MASKS]
+        if all(found):
+            return tuple(CARD_NAMES[(f & -f).bit_length() - 1] for f in found)
+        return None
+
+
+class PublicKnowledge(PossibilityMatrix):
+    """
+    Deductions every player can make: passes and unseen refutations.
+
+    Each public event is applied and propagated here once, then the narrowed
+    rows and new clauses are pushed to every attached overlay. Hand sizes
+    are public too, so the counting rules run here as well.
+    """
+    def __init__(self, n_players):
+        self.overlays = []
+        self._changed = 0   # cards narrowed since the last broadcast
+        self._sent    = 0   # clauses already broadcast
+        super().__init__(n_players, None, [])
+
+    def attach(self, matrix):
+        """Start pushing public knowledge to <matrix>, beginning with everything known so far."""
+        self.overlays.append(matrix)
+        matrix.absorb_public((1 << N_CARDS) - 1, [(h, mask) for h, mask, _, _ in self.clauses[:self._sent]], self)
+
+    def _set_row(self, c, new):
+        if new != self.rows[c]:
+            self._changed |= 1 << c
+        super()._set_row(c, new)
+
+    def propagate(self):
+        super().propagate()
+        if self._changed or len(self.clauses) > self._sent:
+            changed, clauses = self._changed, [(h, mask) for h, mask, _, _ in self.clauses[self._sent:]]
+            self._changed, self._sent = 0, len(self.clauses)
+            for matrix in self.overlays:
+                matrix.absorb_public(changed, clauses, self)
+
+
+class PossView(Mapping):
+    """poss[card] → RowView, mirroring the old dict-of-dicts layout."""
+    def __init__(self, matrix):
+        self._matrix = matrix
+
+    def __getitem__(self, card):
+        return RowView(self._matrix, CARD_ID[card])
+
+    def __iter__(self):
+        return iter(ALL_CARDS)
+
+    def __len__(self):
+        return N_CARDS
+
+
+class RowView(Mapping):
+    """poss[card][holder] → bool for one card."""
+    def __init__(self, matrix, card_index):
+        self._matrix = matrix
+        self._card_index = card_index
+
+    def __getitem__(self, holder):
+        return bool(self._matrix.rows[self._card_index] >> self._matrix.holder_index[holder] & 1)
+
+    def __iter__(self):
+        return iter(self._matrix.holders)
+
+    def __len__(self):
+        return len(self._matrix.holders)
+
+
+class DictPossibilityMatrix:
+    """
+    The dict-of-dicts engine the bitset one replaced, kept as a readable
+    reference for parity tests and benchmarks. It has since gained clauses
+    and per-player hand sizes, so it is no longer the original engine; the
+    original's rules are kept in test_deduction_matrix.BaselineMatrix.
+
     poss[card][holder] == True   ⇒  card *could* be with holder
     holders = ["P0", "P1", ... , "ENVELOPE"]
     """
     def __init__(self, n_players, my_id, my_hand):
         self.holders = [f"P{i}" for i in range(n_players)] + ["ENVELOPE"]
         self.me      = f"P{my_id}"
+        self.clauses = []   # (holder, cards): holder has at least one of the cards
 
         # Start with everything possible
         self.poss = {card: {h: True for h in self.holders} for card in ALL_CARDS}
@@ -35,6 +430,27 @@ class PossibilityMatrix:
             self.poss[card][holder] = False
             self.propagate()
 
+    def add_clause(self, holder, cards):
+        """<holder> has at least one of <cards> (e.g. refuted without us seeing the card)."""
+        self.clauses.append((holder, list(cards)))
+        self.propagate()
+
+    def absorb_history(self, history):
+        """Apply everything this player learned from the suggestions in a SuggestionHistory."""
+        my_id = int(self.me[1:])
+        for suggestion in history.get_all_suggestions():
+            cards = [suggestion.suspect, suggestion.weapon, suggestion.room]
+            for player_id in suggestion.passed_by:
+                for card in cards:
+                    self.eliminate(card, f"P{player_id}")
+            if suggestion.refuted_by is None:
+                continue
+            refuter = f"P{suggestion.refuted_by}"
+            if suggestion.player_id == my_id and suggestion.card_shown is not None:
+                self.set_holder(suggestion.card_shown, refuter)
+            elif suggestion.refuted_by != my_id:
+                self.add_clause(refuter, cards)
+
     def card_owner(self, card):
         """Return holder if known, else None."""
         row = self.poss[card]
@@ -70,15 +486,15 @@ class PossibilityMatrix:
             possible_cards = {h: [c for c in ALL_CARDS if self.poss[c][h]] for h in self.holders}
 
             # For each player, determine how many cards they should have
-            # This is based on the game rules - cards are dealt evenly
+            # Cards are dealt round-robin, 3 of them to the envelope
             player_holders = [h for h in self.holders if h != "ENVELOPE"]
-            cards_per_player = (len(ALL_CARDS) - 3) // len(player_holders)  # 3 cards in envelope
+            sizes = dict(zip(player_holders, hand_sizes(len(player_holders))))
 
             # If a player has exactly the right number of possible cards,
             # and some are definite, then the rest must also be definite
             for holder in player_holders:
                 if holder != self.me:  # Skip self (we already know our cards)
-                    if len(possible_cards[holder]) == cards_per_player and len(definite_cards[holder]) > 0:
+                    if len(possible_cards[holder]) == sizes[holder] and len(definite_cards[holder]) > 0:
                         # All possible cards for this holder must be definite
                         for card in possible_cards[holder]:
                             if card not in definite_cards[holder]:
@@ -88,12 +504,22 @@ class PossibilityMatrix:
             # If a player has exactly the right number of definite cards,
             # eliminate all other possibilities
             for holder in player_holders:
-                if len(definite_cards[holder]) == cards_per_player:
+                if len(definite_cards[holder]) == sizes[holder]:
                     for card in ALL_CARDS:
                         if card not in definite_cards[holder] and self.poss[card][holder]:
                             self.poss[card][holder] = False
                             changed = True
 
+            # (3) If only one card of a clause can still be with its holder
+            #     (and none is known to be), the holder has that card
+            for holder, cards in self.clauses:
+                if any(self.card_owner(c) == holder for c in cards):
+                    continue
+                live = [c for c in cards if self.poss[c][holder]]
+                if len(live) == 1:
+                    self.set_holder(live[0], holder)
+                    changed = True
+
     # ---------- envelope deduction ----------
     def envelope_complete(self):
         """Return (suspect, weapon, room) if all three forced, else None."""
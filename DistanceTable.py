@@ -0,0 +1,148 @@
+import os
+from collections import deque
+import numpy as np
+from BoardCompiler import CELL_ROOM, CELL_ENTRANCE
+
+UNREACHABLE = 255          # stored value for "no path"
+ROOM_EXIT_COST = 0         # a room may be left through any of its entrances
+SECRET_PASSAGE_COST = 1    # using a passage takes the move
+DIST_VERSION = 1           # bump when the graph rules above change
+
+
+class DistanceTable:
+    """
+    True walking distances from every cell of the mansion to every room entrance.
+
+    Nodes are the board cells (row-major) followed by one node per room, so a
+    token standing inside a room is measured from the room itself. Movement
+    follows get_valid_moves: corridors and entrances are passable, rooms are
+    entered/left through their entrances, and secret passages link rooms.
+
+    dist[k, node] is the number of steps from <node> to entrance k
+    (UNREACHABLE if there is no path); room_dist[room_id, node] is the
+    distance to the nearest entrance of that room.
+    """
+    def __init__(self, board, dist):
+        self.rows, self.cols = board.rows, board.cols
+        self.n_cells = board.rows * board.cols
+        self.room_names = board.room_names
+        self._room_ids = {name: i for i, name in enumerate(board.room_names)}
+        self._board = board
+
+        self.entrances = entrance_cells(board)
+        self.entrance_index = {cell: k for k, cell in enumerate(self.entrances)}
+        self.dist = dist
+
+        room_dist = np.full((len(self.room_names), dist.shape[1]), UNREACHABLE, dtype=np.uint8)
+        for k, (r, c) in enumerate(self.entrances):
+            room_id = board.room_id(r, c)
+            np.minimum(room_dist[room_id], dist[k], out=room_dist[room_id])
+        self.room_dist = room_dist
+
+    # ---------- loading ----------
+    @classmethod
+    def for_board(cls, board):
+        """
+        Memory-map the persisted table for this layout, building it first if needed.
+        Boards without a cache location get an in-memory table.
+        """
+        prefix = getattr(board, "cache_prefix", None)
+        if prefix is None:
+            return cls(board, build_distances(board))
+
+        path = f"{prefix}.dist-v{DIST_VERSION}.npy"
+        expected_shape = (len(entrance_cells(board)), board.rows * board.cols + len(board.room_names))
+        if os.path.exists(path):
+            try:
+                dist = np.load(path, mmap_mode="r")
+                if dist.shape == expected_shape and dist.dtype == np.uint8:
+                    return cls(board, dist)
+            except (ValueError, OSError):
+                pass
+
+        dist = build_distances(board)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename so concurrent workers never map a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, dist)
+        os.replace(tmp_path, path)
+        return cls(board, np.load(path, mmap_mode="r"))
+
+    # ---------- queries ----------
+    def node(self, r, c):
+        """Graph node for a board cell (room cells map to their room's node)."""
+        if self._board.cell_code(r, c) == CELL_ROOM:
+            return self.n_cells + self._board.room_id(r, c)
+        return r * self.cols + c
+
+    def to_entrance(self, r, c, entrance_cell):
+        """Steps from (r, c) to the entrance at <entrance_cell>, inf if unreachable."""
+        d = int(self.dist[self.entrance_index[entrance_cell], self.node(r, c)])
+        return float('inf') if d == UNREACHABLE else d
+
+    def to_room(self, r, c, room_name):
+        """Steps from (r, c) to the nearest entrance of <room_name>, inf if unreachable."""
+        d = int(self.room_dist[self._room_ids[room_name], self.node(r, c)])
+        return float('inf') if d == UNREACHABLE else d
+
+    def rooms_from(self, r, c):
+        """Distances from (r, c) to every room as a uint8 array indexed by room id."""
+        return self.room_dist[:, self.node(r, c)]
+
+
+def entrance_cells(board):
+    """All entrance cells in a fixed order (room order, then scan order)."""
+    return [(e.row, e.column) for room in board.room_dict.values() for e in room.room_entrance_list]
+
+
+def build_distances(board):
+    """Run one 0-1 BFS per entrance over the reversed movement graph."""
+    rows, cols = board.rows, board.cols
+    n_cells = rows * cols
+    room_ids = {name: i for i, name in enumerate(board.room_names)}
+    n_nodes = n_cells + len(room_ids)
+
+    # Reverse adjacency: radj[v] holds (u, cost) for every edge u → v
+    radj = [[] for _ in range(n_nodes)]
+
+    def add_edge(u, v, cost):
+        radj[v].append((u, cost))
+
+    for r in range(rows):
+        for c in range(cols):
+            if not board.is_passable(r, c):
+                continue
+            i = r * cols + c
+            for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                if board.is_passable(r + dr, c + dc):
+                    add_edge(i, (r + dr) * cols + c + dc, 1)
+            if board.cell_code(r, c) == CELL_ENTRANCE:
+                room_node = n_cells + board.room_id(r, c)
+                add_edge(i, room_node, 0)
+                add_edge(room_node, i, ROOM_EXIT_COST)
+
+    for name, room in board.room_dict.items():
+        if room.secret_passage_to in room_ids:
+            add_edge(n_cells + room_ids[name], n_cells + room_ids[room.secret_passage_to],
+                     SECRET_PASSAGE_COST)
+
+    entrances = entrance_cells(board)
+    dist = np.full((len(entrances), n_nodes), UNREACHABLE, dtype=np.uint8)
+    for k, (r, c) in enumerate(entrances):
+        best = [n_nodes * 2] * n_nodes   # larger than any real path
+        source = r * cols + c
+        best[source] = 0
+        queue = deque([source])
+        while queue:
+            v = queue.popleft()
+            d = best[v]
+            for u, cost in radj[v]:
+                if d + cost < best[u]:
+                    best[u] = d + cost
+                    if cost == 0:
+                        queue.appendleft(u)
+                    else:
+                        queue.append(u)
+        dist[k] = np.minimum(best, UNREACHABLE)
+    return dist
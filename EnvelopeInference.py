@@ -0,0 +1,146 @@
+import threading
+from collections import OrderedDict
+from Constants import SUSPECTS, WEAPONS, ROOMS, ALL_CARDS
+from CardRegistry import N_CARDS, CATEGORY_RANGES, hand_sizes
+
+CACHE_SIZE = 256
+
+# Knowledge key → Marginals, shared by every matrix in the process
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Cards are processed in ALL_CARDS order, so each category ends at a fixed index
+_CATEGORY_LAST = {r[-1] for r in CATEGORY_RANGES}
+
+
+class Marginals:
+    """
+    Exact probabilities over all deals consistent with a PossibilityMatrix.
+
+    total is the number of consistent deals (0 if the knowledge is
+    contradictory); envelope[card] is P(card in ENVELOPE) and
+    holder[card][holder] is P(card held by holder), every consistent deal
+    counting equally.
+    """
+    def __init__(self, holders, total, counts):
+        self.holders = holders
+        self.total = total
+        self.holder = {card: {h: (counts[c][i] / total if total else 0.0) for i, h in enumerate(holders)}
+                       for c, card in enumerate(ALL_CARDS)}
+        self.envelope = {card: row["ENVELOPE"] for card, row in self.holder.items()}
+
+    def most_likely_solution(self):
+        """The likeliest (suspect, weapon, room), taking each category's most probable card."""
+        return tuple(max(cards, key=self.envelope.get) for cards in (SUSPECTS, WEAPONS, ROOMS))
+
+
+def knowledge_key(matrix):
+    """Hashable summary of everything the counter depends on."""
+    clauses = set()
+    for h, mask, _, _ in matrix.clauses:
+        if not matrix.definite[h] & mask:   # satisfied clauses add nothing
+            clauses.add((h, mask & matrix.cols[h]))
+    return (len(matrix.holders) - 1, tuple(matrix.rows), tuple(sorted(clauses)))
+
+
+def marginals(matrix):
+    """Marginals for <matrix>, computed once per distinct knowledge state."""
+    key = knowledge_key(matrix)
+    with _cache_lock:
+        result = _cache.get(key)
+        if result is not None:
+            _cache.move_to_end(key)
+            return result
+
+    result = count_deals(key, matrix.holders)
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def envelope_probabilities(matrix):
+    """P(card in ENVELOPE) for every card."""
+    return marginals(matrix).envelope
+
+
+def count_deals(key, holders):
+    """
+    Count consistent deals with a dynamic programme over the cards.
+
+    The state after assigning a prefix of the cards is (cards each player
+    still has to receive, whether the envelope already has a card of the
+    current category, which open clauses are already satisfied). A clause is
+    closed, and must be satisfied, once its last card is assigned.
+    Forward counts times memoised backward counts give every marginal.
+    """
+    n_players, rows, clauses = key
+    envelope = n_players
+
+    # Per card: clause bits satisfied by giving it to each holder, and clauses ending here
+    satisfies = [[0] * (n_players + 1) for _ in range(N_CARDS)]
+    closing = [0] * N_CARDS
+    for j, (h, mask) in enumerate(clauses):
+        for c in range(N_CARDS):
+            if mask >> c & 1:
+                satisfies[c][h] |= 1 << j
+        closing[mask.bit_length() - 1] |= 1 << j
+
+    def step(state, c, h):
+        """State after giving card c to holder h, or None if that breaks a rule."""
+        caps, env, sat = state
+        if h == envelope:
+            if env:
+                return None
+            env = 1
+        else:
+            if not caps[h]:
+                return None
+            caps = caps[:h] + (caps[h] - 1,) + caps[h + 1:]
+        sat |= satisfies[c][h]
+        if closing[c] & ~sat:
+            return None
+        sat &= ~closing[c]
+        if c in _CATEGORY_LAST:
+            if not env:
+                return None
+            env = 0
+        return caps, env, sat
+
+    choices = [[h for h in range(n_players + 1) if rows[c] >> h & 1] for c in range(N_CARDS)]
+    memo = {}
+
+    def backward(c, state):
+        """Number of ways to finish the deal from card c in <state>."""
+        if c == N_CARDS:
+            return 1 if not any(state[0]) else 0
+        key = (c, state)
+        if key not in memo:
+            total = 0
+            for h in choices[c]:
+                nxt = step(state, c, h)
+                if nxt is not None:
+                    total += backward(c + 1, nxt)
+            memo[key] = total
+        return memo[key]
+
+    start = (hand_sizes(n_players), 0, 0)
+    total = backward(0, start)
+
+    counts = [[0] * (n_players + 1) for _ in range(N_CARDS)]
+    if total:
+        forward = {start: 1}
+        for c in range(N_CARDS):
+            next_forward = {}
+            for state, ways in forward.items():
+                for h in choices[c]:
+                    nxt = step(state, c, h)
+                    if nxt is None:
+                        continue
+                    rest = backward(c + 1, nxt)
+                    if rest:
+                        counts[c][h] += ways * rest
+                        next_forward[nxt] = next_forward.get(nxt, 0) + ways
+            forward = next_forward
+    return Marginals(holders, total, counts)
@@ -0,0 +1,43 @@
+import sys
+
+DEBUG   = 10
+INFO    = 20
+WARNING = 30
+ERROR   = 40
+SILENT  = 100   # headless: nothing is written
+
+
+class GameLogger:
+    """
+    Leveled console output for a game.
+
+    Messages take printf-style arguments, so one below the logger's level
+    costs a comparison and is never formatted. Output goes to <stream>, or
+    to whatever sys.stdout is at the time (so redirect_stdout still works).
+    """
+    def __init__(self, level=INFO, stream=None):
+        self.level = level
+        self.stream = stream
+
+    def enabled(self, level):
+        return level >= self.level
+
+    def log(self, level, msg, *args):
+        if level >= self.level:
+            print(msg % args if args else msg, file=self.stream or sys.stdout)
+
+    def debug(self, msg, *args):
+        if DEBUG >= self.level:
+            self.log(DEBUG, msg, *args)
+
+    def info(self, msg, *args):
+        if INFO >= self.level:
+            self.log(INFO, msg, *args)
+
+    def warning(self, msg, *args):
+        if WARNING >= self.level:
+            self.log(WARNING, msg, *args)
+
+    def error(self, msg, *args):
+        if ERROR >= self.level:
+            self.log(ERROR, msg, *args)
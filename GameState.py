@@ -0,0 +1,214 @@
+import struct
+from collections import namedtuple
+from Constants import SUSPECTS, WEAPONS, room_name_list
+from CardRegistry import CARD_ID, N_CARDS, card_mask, lowest_card
+from BoardCompiler import CELL_ROOM
+from DeductionMatrix import PossibilityMatrix
+from EnvelopeInference import knowledge_key
+
+NO_PLAYER = -1   # winner before anyone has won
+NO_CELL   = -1   # token not on the board
+ROOM_ID = {name: i for i, name in enumerate(room_name_list)}
+
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<BBHBBbH")   # version, players, turn, current, eliminated, winner, board cols
+
+# Actions for GameState.apply; cards are named, like ClueGame's own methods
+Move    = namedtuple("Move", "row col")                   # current player's token steps to (row, col)
+Suggest = namedtuple("Suggest", "suspect weapon")         # in the room the current player is in
+Accuse  = namedtuple("Accuse", "suspect weapon room")
+EndTurn = namedtuple("EndTurn", "")
+
+
+class GameState(namedtuple("GameState", "n_players turn current positions weapons hands envelope "
+                                        "eliminated winner knowledge board")):
+    """
+    Compact, immutable snapshot of a ClueGame for search (MCTS, expectimax).
+
+    positions: board cell (row * cols + col) of each suspect's token, SUSPECTS order
+    weapons:   room id (room_name_list index) of each weapon, WEAPONS order
+    hands:     card mask per player; envelope: card mask of the solution
+    eliminated: player mask; winner: player id or NO_PLAYER
+    knowledge: per player, (rows, clauses) of its deduction matrix - one byte
+               of holder bits per card, and each clause packed as holder << N_CARDS | cards
+    board:     the shared, frozen MansionBoard (not part of to_bytes)
+
+    Every field is an int, bytes or tuple, so clone() and apply() share what
+    they do not change instead of copying it.
+    """
+    __slots__ = ()
+
+    # ---------- construction ----------
+    @classmethod
+    def from_game(cls, game):
+        """Snapshot of <game> as it stands."""
+        board = game.mansion_board
+        positions = tuple(NO_CELL if pos is None else pos[0] * board.cols + pos[1]
+                          for pos in (game.character_dict[name].position for name in SUSPECTS))
+        knowledge = tuple(_pack_knowledge(game.logic_engines[p.player_id]) for p in game.players)
+        return cls(n_players=len(game.players),
+                   turn=game.turn_counter,
+                   current=game.current_player_idx,
+                   positions=positions,
+                   weapons=tuple(ROOM_ID[game.weapon_dict[name].location] for name in WEAPONS),
+                   hands=tuple(p.hand_mask for p in game.players),
+                   envelope=card_mask(game.solution.values()),
+                   eliminated=sum(1 << p.player_id for p in game.players if p.eliminated),
+                   winner=game.winner.player_id if game.winner else NO_PLAYER,
+                   knowledge=knowledge,
+                   board=board)
+
+    def clone(self):
+        """An equal, separate state (the fields themselves are immutable and shared)."""
+        return tuple.__new__(GameState, self)
+
+    # ---------- queries ----------
+    @property
+    def game_over(self):
+        return self.winner != NO_PLAYER or self.eliminated == (1 << self.n_players) - 1
+
+    def position(self, suspect):
+        """(row, col) of a suspect's token, or None."""
+        cell = self.positions[SUSPECTS.index(suspect)]
+        return None if cell == NO_CELL else divmod(cell, self.board.cols)
+
+    def weapon_room(self, weapon):
+        return room_name_list[self.weapons[WEAPONS.index(weapon)]]
+
+    def matrix(self, player_id):
+        """A standalone PossibilityMatrix holding <player_id>'s knowledge."""
+        rows, clauses = self.knowledge[player_id]
+        return PossibilityMatrix.restore(self.n_players, player_id, rows, _unpack_clauses(clauses))
+
+    # ---------- transitions ----------
+    def apply(self, action):
+        """The state after the current player takes <action>, following ClueGame's rules."""
+        if self.game_over:
+            raise ValueError("The game is over")
+        kind = type(action)
+        if kind is Move:
+            return self._move(action.row * self.board.cols + action.col)
+        if kind is Suggest:
+            return self._suggest(CARD_ID[action.suspect], CARD_ID[action.weapon])
+        if kind is Accuse:
+            if card_mask(action) == self.envelope:
+                return self._replace(winner=self.current)
+            return self._replace(eliminated=self.eliminated | 1 << self.current)
+        if kind is EndTurn:
+            nxt = (self.current + 1) % self.n_players
+            while self.eliminated >> nxt & 1:
+                nxt = (nxt + 1) % self.n_players
+            return self._replace(turn=self.turn + 1, current=nxt)
+        raise TypeError(f"Unknown action {action!r}")
+
+    def _free_room_cell(self, room_name):
+        """First unoccupied cell of a room (row-major), as ClueGame's CharacterBoard picks it."""
+        occupied = set(self.positions)
+        for r, c in self.board.room_cells(room_name):
+            cell = r * self.board.cols + c
+            if cell not in occupied:
+                return cell
+        return None
+
+    def _move(self, cell):
+        # Stepping onto an entrance puts the token on a free cell inside the room
+        entrance = self.board.entrance_at(*divmod(cell, self.board.cols))
+        if entrance is not None:
+            free = self._free_room_cell(entrance.room_name)
+            if free is not None:
+                cell = free
+        token = SUSPECTS.index(_suspect_of(self.current))
+        positions = self.positions[:token] + (cell,) + self.positions[token + 1:]
+        return self._replace(positions=positions)
+
+    def _suggest(self, suspect, weapon):
+        me = self.current
+        my_cell = self.positions[SUSPECTS.index(_suspect_of(me))]
+        r, c = divmod(my_cell, self.board.cols)
+        room = self.board.room_name_at(r, c) if self.board.cell_code(r, c) == CELL_ROOM else None
+        if room is None or room == "Clue":
+            raise ValueError("Suggestions are made from inside a room other than the Clue room")
+
+        # The suspect's token and the weapon are brought into the room
+        token = suspect - CARD_ID[SUSPECTS[0]]
+        free = self._free_room_cell(room)
+        positions = list(self.positions)
+        positions[token] = my_cell if free is None else free
+        weapons = list(self.weapons)
+        weapons[weapon - CARD_ID[WEAPONS[0]]] = ROOM_ID[room]
+
+        # Players to the left answer in turn: passes and the refutation are public,
+        # the card shown is seen only by the suggester
+        cards = 1 << suspect | 1 << weapon | 1 << CARD_ID[room]
+        matrices = [self.matrix(p) for p in range(self.n_players)]
+        for i in range(1, self.n_players):
+            other = (me + i) % self.n_players
+            if self.eliminated >> other & 1:
+                continue
+            shown = self.hands[other] & cards
+            if shown:
+                matrices[me].set_holder_id(lowest_card(shown), other)
+                for matrix in matrices:
+                    matrix.add_clause_mask(other, cards)
+                break
+            for matrix in matrices:
+                matrix.eliminate_ids(cards, other)
+
+        return self._replace(positions=tuple(positions), weapons=tuple(weapons),
+                             knowledge=tuple(_pack_knowledge(m) for m in matrices))
+
+    # ---------- encoding ----------
+    def to_bytes(self):
+        """Compact binary encoding (everything but the board)."""
+        n = self.n_players
+        parts = [_HEADER.pack(FORMAT_VERSION, n, self.turn, self.current, self.eliminated,
+                              self.winner, self.board.cols),
+                 struct.pack(f"<{len(SUSPECTS)}h{len(WEAPONS)}B{n + 1}I",
+                             *self.positions, *self.weapons, *self.hands, self.envelope)]
+        for rows, clauses in self.knowledge:
+            parts.append(rows)
+            parts.append(struct.pack(f"<H{len(clauses)}I", len(clauses), *clauses))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data, board):
+        """Decode to_bytes() output for a game played on <board>."""
+        version, n, turn, current, eliminated, winner, cols = _HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported GameState encoding version {version}")
+        if cols != board.cols:
+            raise ValueError("GameState was encoded for a different board")
+        offset = _HEADER.size
+        body = struct.Struct(f"<{len(SUSPECTS)}h{len(WEAPONS)}B{n + 1}I")
+        values = body.unpack_from(data, offset)
+        offset += body.size
+        positions = values[:len(SUSPECTS)]
+        weapons = values[len(SUSPECTS):len(SUSPECTS) + len(WEAPONS)]
+        hands, envelope = values[len(SUSPECTS) + len(WEAPONS):-1], values[-1]
+
+        knowledge = []
+        for _ in range(n):
+            rows = bytes(data[offset:offset + N_CARDS])
+            (count,) = struct.unpack_from("<H", data, offset + N_CARDS)
+            offset += N_CARDS + 2
+            clauses = struct.unpack_from(f"<{count}I", data, offset)
+            offset += 4 * count
+            knowledge.append((rows, clauses))
+        return cls(n, turn, current, positions, weapons, hands, envelope,
+                   eliminated, winner, tuple(knowledge), board)
+
+
+def _suspect_of(player_id):
+    """Players sit in SUSPECTS order, as ClueGame deals them their characters."""
+    return SUSPECTS[player_id]
+
+
+def _pack_knowledge(matrix):
+    """(rows, clauses) of a PossibilityMatrix, normalised as knowledge_key() does."""
+    _, rows, clauses = knowledge_key(matrix)
+    return bytes(rows), tuple(h << N_CARDS | mask for h, mask in clauses)
+
+
+def _unpack_clauses(clauses):
+    mask = (1 << N_CARDS) - 1
+    return [(packed >> N_CARDS, packed & mask) for packed in clauses]
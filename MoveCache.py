@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 4096
+
+
+class MoveCache:
+    """
+    Bounded LRU cache of get_valid_moves results.
+
+    Keys are (backend, mode, steps, occupancy signature); the signature is
+    the occupancy bitboard masked to the cells that can influence the answer,
+    so moving a token there changes the key and stale results are never hit.
+    Shared by every game on a board, hence the lock.
+    """
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()
+        self._regions = {}     # (mode, steps) → bitboard of relevant cells
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            moves = self._entries.get(key)
+            if moves is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return moves
+
+    def put(self, key, moves):
+        with self._lock:
+            self._entries[key] = tuple(moves)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def region(self, mode, steps, build):
+        """Relevant-cell mask for (mode, steps), computed once with build()."""
+        mask = self._regions.get((mode, steps))
+        if mask is None:
+            with self._lock:
+                mask = self._regions.get((mode, steps))
+                if mask is None:
+                    mask = self._regions[(mode, steps)] = build()
+        return mask
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def __len__(self):
+        return len(self._entries)
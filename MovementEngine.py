@@ -0,0 +1,118 @@
+from BoardCompiler import CELL_ENTRANCE
+
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]   # same order the game has always used
+
+
+class MovementEngine:
+    """
+    Exact-step reachability over a precomputed adjacency structure.
+
+    Cells are flat indices (row * cols + col). neighbours[i] lists the
+    passable (corridor or entrance) cells next to i, in DIRECTIONS order,
+    so no cell-type queries happen while searching.
+    """
+    def __init__(self, board):
+        self.rows, self.cols = board.rows, board.cols
+        neighbours = []
+        for r in range(self.rows):
+            for c in range(self.cols):
+                neighbours.append(tuple((r + dr) * self.cols + c + dc
+                                        for dr, dc in DIRECTIONS
+                                        if board.is_passable(r + dr, c + dc)))
+        self.neighbours = tuple(neighbours)
+        self.is_entrance = tuple(board.cell_code(r, c) == CELL_ENTRANCE
+                                 for r in range(self.rows) for c in range(self.cols))
+
+    # ---------- helpers ----------
+    def occupied_cells(self, char_board):
+        """Flat indices of every cell holding a token."""
+        return {r * self.cols + c for r, c in char_board.positions.values()}
+
+    def _cell(self, i):
+        return divmod(i, self.cols)
+
+    # ---------- corridor movement ----------
+    def walk(self, start, steps, occupied):
+        """
+        Destinations for a token in a corridor: every cell exactly <steps>
+        BFS layers away, plus any free entrance seen on the way (rooms can
+        be entered without using the exact count).
+        """
+        return [self._cell(i) for i in self._walk(start, steps, occupied, layered=False)[-1]]
+
+    def walk_layers(self, start, max_steps, occupied):
+        """walk() for every step count from one traversal: result[s] == walk(start, s, occupied)."""
+        return [[self._cell(i) for i in layer] for layer in self._walk(start, max_steps, occupied, layered=True)]
+
+    def _walk(self, start, max_steps, occupied, layered):
+        start = start[0] * self.cols + start[1]
+        neighbours, is_entrance = self.neighbours, self.is_entrance
+        found, seen = [], set()   # entrances, in the order they were passed
+        visited = {start}
+        frontier = [start]
+        layers = []
+
+        for step in range(max_steps + 1):
+            if layered or step == max_steps:
+                layers.append(found + [v for v in frontier
+                                       if v not in seen and (v not in occupied or v == start)])
+            if step == max_steps:
+                break
+            next_frontier = []
+            for v in frontier:
+                for u in neighbours[v]:
+                    if is_entrance[u] and u not in seen and u not in occupied:
+                        seen.add(u)
+                        found.append(u)
+                    if u not in visited and (u not in occupied or u == start):
+                        visited.add(u)
+                        next_frontier.append(u)
+            frontier = next_frontier
+        return layers
+
+    # ---------- leaving a room / first move ----------
+    def flood(self, sources, steps, occupied):
+        """
+        Destinations exactly <steps> BFS layers from any free source entrance,
+        where each source keeps its own visited set (as if searched separately).
+
+        All sources are searched in one pass: every cell carries a bitmask of
+        the sources that have reached it. Results are grouped by the first
+        source (in <sources> order) that reaches them, row-major within a
+        group. (The old per-source BFS listed each group in BFS discovery
+        order, which one combined pass cannot reproduce.)
+        """
+        return [self._cell(i) for i in self._flood(sources, steps, occupied, layered=False)[-1]]
+
+    def flood_layers(self, sources, max_steps, occupied):
+        """flood() for every step count from one traversal: result[s] == flood(sources, s, occupied)."""
+        return [[self._cell(i) for i in layer] for layer in self._flood(sources, max_steps, occupied, layered=True)]
+
+    def _flood(self, sources, max_steps, occupied, layered):
+        sources = [s[0] * self.cols + s[1] for s in sources]
+        sources = [s for s in dict.fromkeys(sources) if s not in occupied]
+        neighbours = self.neighbours
+
+        visited = {}
+        frontier = {}
+        for bit, s in enumerate(sources):
+            visited[s] = visited.get(s, 0) | (1 << bit)
+            frontier[s] = visited[s]
+        layers = []
+
+        for step in range(max_steps + 1):
+            if layered or step == max_steps:
+                layers.append(sorted(frontier, key=lambda i: ((frontier[i] & -frontier[i]).bit_length(), i)))
+            if step == max_steps:
+                break
+            next_frontier = {}
+            for v, mask in frontier.items():
+                for u in neighbours[v]:
+                    if u in occupied:
+                        continue
+                    new = mask & ~visited.get(u, 0)
+                    if new:
+                        visited[u] = visited.get(u, 0) | new
+                        next_frontier[u] = next_frontier.get(u, 0) | new
+            frontier = next_frontier
+        return layers
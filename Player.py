@@ -1,18 +1,36 @@
 from Character import Character
+from CardRegistry import CARD_NAMES, card_mask, lowest_card
 
 class Player:
     def __init__(self, player_id, character: Character):
         self.player_id   = player_id       # e.g. seat number or user name
         self.character   = character       # reference to the board character
-        self.hand        = []              # dealt cards
+        self.hand        = []              # dealt cards (hand_mask mirrors them as card-id bits)
         self.eliminated  = False           # set True after wrong accusation
         self.notes_sheet = {}              # optional: deduction data
         self.bonus_cards = []              # bonus cards the player has drawn
         self.extra_turn  = False           # whether the player gets an extra turn
         self.must_exit_next_turn = False   # whether the player must exit a room next turn
 
+    @property
+    def hand(self):
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards):
+        self._hand = list(cards)
+        self._mask_of = (tuple(self._hand), card_mask(self._hand))
+
+    @property
+    def hand_mask(self):
+        """The hand as card-id bits, recomputed if the list was changed in place."""
+        cards = tuple(self._hand)
+        if cards != self._mask_of[0]:
+            self._mask_of = (cards, card_mask(cards))
+        return self._mask_of[1]
+
     def add_card(self, card):
-        self.hand.append(card)
+        self._hand.append(card)
 
     def add_bonus_card(self, bonus_card):
         """Add a bonus card to the player's hand"""
@@ -26,10 +44,16 @@ class Player:
         return "Invalid bonus card index"
 
     def reveal_if_matches(self, cards_in_suggestion):
-        for c in cards_in_suggestion:
-            if c in self.hand:
-                return c
-        return None
+        card = self.reveal_mask(card_mask(cards_in_suggestion))
+        return None if card is None else CARD_NAMES[card]
+
+    def reveal_mask(self, mask):
+        """
+        Id of a card in both <mask> and this hand, or None. Ids run suspect,
+        weapon, room, so the lowest is the first card of a suggestion.
+        """
+        match = self.hand_mask & mask
+        return lowest_card(match) if match else None
 
 # Player can move their character manhattan distance to objective
 # Need to determine sub objectives along the way (like which room to go in)
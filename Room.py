@@ -19,6 +19,16 @@ class Room:
         """Add a secret passage to another room"""
         self.secret_passage_to = destination_room
 
+    def freeze(self):
+        """Make the room read-only so it can be shared between games."""
+        self.room_entrance_list = tuple(self.room_entrance_list)
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"Room {self.name} is shared and cannot be modified")
+        object.__setattr__(self, name, value)
+
     def get_room_entrance_from_cell(self, row, column):
         for entrance in self.room_entrance_list:
             if entrance.row == row and entrance.column == column:
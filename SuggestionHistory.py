@@ -1,20 +1,84 @@
-from Constants import SUSPECTS, WEAPONS, ROOMS
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from CardRegistry import CARD_ID, CARD_NAMES
+
+NONE = -1   # column value for "no refuter" / "no card shown"
+
 
 class Suggestion:
-    """A class to represent a suggestion made during the game."""
-    def __init__(self, player_id, suspect, weapon, room):
-        self.player_id = player_id
-        self.suspect = suspect
-        self.weapon = weapon
-        self.room = room
-        self.refuted_by = None
-        self.card_shown = None
-    
+    """
+    A suggestion made during the game: a view of one row of a SuggestionHistory.
+    Reading or updating it goes straight to the history's columns.
+    """
+    __slots__ = ("_history", "index")
+
+    def __init__(self, history, index):
+        self._history = history
+        self.index = index
+
+    @property
+    def player_id(self):
+        return self._history._suggester[self.index]
+
+    @property
+    def suspect(self):
+        return CARD_NAMES[self._history._suspect[self.index]]
+
+    @property
+    def weapon(self):
+        return CARD_NAMES[self._history._weapon[self.index]]
+
+    @property
+    def room(self):
+        return CARD_NAMES[self._history._room[self.index]]
+
+    @property
+    def turn(self):
+        return self._history._turn[self.index]
+
+    @property
+    def refuted_by(self):
+        refuter = self._history._refuter[self.index]
+        return None if refuter == NONE else refuter
+
+    @property
+    def card_shown(self):
+        shown = self._history._shown[self.index]
+        return None if shown == NONE else CARD_NAMES[shown]
+
+    @property
+    def cards_mask(self):
+        """Bitmask of the suggested card ids."""
+        h, i = self._history, self.index
+        return 1 << h._suspect[i] | 1 << h._weapon[i] | 1 << h._room[i]
+
+    @property
+    def shown_id(self):
+        shown = self._history._shown[self.index]
+        return None if shown == NONE else shown
+
+    @property
+    def passed_by(self):
+        """Players who could not refute, in the order they were asked."""
+        mask, suggester = self._history._passes[self.index], self.player_id
+        players = [p for p in range(mask.bit_length()) if mask >> p & 1]
+        return sorted(players, key=lambda p: p < suggester)
+
+    def record_pass(self, player_id):
+        """Record that a player could not refute the suggestion."""
+        self._history._passes[self.index] |= 1 << player_id
+
     def refute(self, refuter_id, card):
         """Record that the suggestion was refuted."""
-        self.refuted_by = refuter_id
-        self.card_shown = card
-    
+        self._history._set_refuter(self.index, refuter_id, card)
+
+    def __eq__(self, other):
+        return isinstance(other, Suggestion) and (self._history, self.index) == (other._history, other.index)
+
+    def __hash__(self):
+        return hash((id(self._history), self.index))
+
     def __str__(self):
         result = f"Player {self.player_id} suggested {self.suspect} with {self.weapon} in {self.room}"
         if self.refuted_by is not None:
@@ -25,34 +89,106 @@ class Suggestion:
             result += " - Not refuted"
         return result
 
+
+class SuggestionWindow(Sequence):
+    """Read-only list of suggestions [start, stop) of a history, without copying them."""
+    def __init__(self, history, start=0, stop=None):
+        self._history = history
+        self._start = start
+        self._stop = stop
+
+    def _range(self):
+        stop = len(self._history) if self._stop is None else self._stop
+        return range(self._start, stop)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [Suggestion(self._history, j) for j in self._range()[i]]
+        return Suggestion(self._history, self._range()[i])
+
+    def __len__(self):
+        return len(self._range())
+
+
 class SuggestionHistory:
-    """A class to track the history of suggestions made during the game."""
+    """
+    A class to track the history of suggestions made during the game.
+
+    Stored column-wise in parallel int arrays (card ids, suggester, refuter,
+    shown card, passes as a player bitmask, turn), with inverted indexes from
+    card, suggester and refuter to row numbers that are kept up to date as
+    suggestions are added and refuted.
+    """
     def __init__(self):
-        self.suggestions = []
-    
-    def add_suggestion(self, player_id, suspect, weapon, room):
+        self._suspect   = array("b")
+        self._weapon    = array("b")
+        self._room      = array("b")
+        self._suggester = array("b")
+        self._refuter   = array("b")
+        self._shown     = array("b")
+        self._passes    = array("B")
+        self._turn      = array("l")
+        self._by_card      = {}   # card id → rows that name it
+        self._by_suggester = {}   # player id → rows they suggested
+        self._by_refuter   = {}   # player id → rows they refuted
+        self.suggestions = SuggestionWindow(self)
+
+    def add_suggestion(self, player_id, suspect, weapon, room, turn=None):
         """Add a new suggestion to the history."""
-        suggestion = Suggestion(player_id, suspect, weapon, room)
-        self.suggestions.append(suggestion)
-        return suggestion
-    
+        index = len(self._suggester)
+        if turn is None:
+            turn = self._turn[-1] + 1 if index else 0
+        cards = (CARD_ID[suspect], CARD_ID[weapon], CARD_ID[room])
+        self._suspect.append(cards[0])
+        self._weapon.append(cards[1])
+        self._room.append(cards[2])
+        self._suggester.append(player_id)
+        self._refuter.append(NONE)
+        self._shown.append(NONE)
+        self._passes.append(0)
+        self._turn.append(turn)
+        for card in set(cards):
+            self._by_card.setdefault(card, []).append(index)
+        self._by_suggester.setdefault(player_id, []).append(index)
+        return Suggestion(self, index)
+
+    def _set_refuter(self, index, refuter_id, card):
+        previous = self._refuter[index]
+        if previous != NONE:
+            self._by_refuter[previous].remove(index)
+        self._refuter[index] = refuter_id
+        self._shown[index] = NONE if card is None else CARD_ID[card]
+        rows = self._by_refuter.setdefault(refuter_id, [])
+        rows.insert(bisect_left(rows, index), index)
+
     def get_player_suggestions(self, player_id):
         """Get all suggestions made by a specific player."""
-        return [s for s in self.suggestions if s.player_id == player_id]
-    
+        return [Suggestion(self, i) for i in self._by_suggester.get(player_id, ())]
+
     def get_suggestions_involving(self, card):
         """Get all suggestions involving a specific card."""
-        return [s for s in self.suggestions if s.suspect == card or s.weapon == card or s.room == card]
-    
+        return [Suggestion(self, i) for i in self._by_card.get(CARD_ID[card], ())]
+
+    def get_refuted_by(self, player_id):
+        """Get all suggestions refuted by a specific player."""
+        return [Suggestion(self, i) for i in self._by_refuter.get(player_id, ())]
+
     def get_all_suggestions(self):
         """Get all suggestions made during the game."""
         return self.suggestions
-    
+
+    def since(self, turn):
+        """Suggestions made on or after <turn>, as a window over the history."""
+        return SuggestionWindow(self, bisect_left(self._turn, turn))
+
+    def __len__(self):
+        return len(self._suggester)
+
     def __str__(self):
-        if not self.suggestions:
+        if not len(self):
             return "No suggestions have been made yet."
-        
+
         result = "Suggestion History:\n"
         for i, suggestion in enumerate(self.suggestions):
             result += f"{i+1}. {suggestion}\n"
-        return result
\ No newline at end of file
+        return result
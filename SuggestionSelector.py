@@ -0,0 +1,105 @@
+"""
+Score suggestions by how much they are expected to reveal about the envelope.
+
+What the suggester learns from a suggestion is its outcome: the first player
+to the left who can refute it and the card they show (a player shows their
+lowest card id, see Player.reveal_mask), or that nobody could. In each deal
+sampled by DealSampler the outcome is fixed, so over the weighted deals the
+expected information gain is the mutual information
+
+    I(envelope; outcome) = H(envelope) + H(outcome) - H(envelope, outcome)
+
+in bits. All suspect x weapon pairs for a room are scored in one pass.
+"""
+from functools import lru_cache
+import numpy as np
+from Constants import SUSPECTS, WEAPONS
+from CardRegistry import CARD_ID
+
+_SUSPECT_IDS = np.array([CARD_ID[s] for s in SUSPECTS])
+_WEAPON_IDS = np.array([CARD_ID[w] for w in WEAPONS])
+_PAIRS = np.arange(len(SUSPECTS) * len(WEAPONS), dtype=np.int32).reshape(len(SUSPECTS), len(WEAPONS), 1)
+GAIN_TOLERANCE = 1e-9   # gains this close count as a tie
+MAX_DEALS = 512         # deals scored; larger estimates are resampled down to this
+
+
+def information_gain(estimate, me, room, eliminated=0):
+    """
+    Expected bits learned about the envelope by player <me> suggesting each
+    suspect and weapon in <room>, as a (len(SUSPECTS), len(WEAPONS)) array.
+    <estimate> is a SampledMarginals; <eliminated> is a mask of player ids
+    that no longer answer suggestions.
+    """
+    n_players = len(estimate.holders) - 1
+    gains = np.zeros((len(SUSPECTS), len(WEAPONS)))
+    if not estimate.n_valid:
+        return gains
+    if estimate.n_valid > MAX_DEALS:
+        estimate = estimate.subsample(MAX_DEALS)
+    deals, weights, solutions = estimate.deals, estimate.weights, estimate.solution_index
+
+    # Answering order: the player to my left is 1, the next 2, ...; holders
+    # who never show a card (me, eliminated players, the envelope) are n_players
+    order = np.full(n_players + 1, n_players, dtype=np.int32)
+    for p in range(n_players):
+        if p != me and not eliminated >> p & 1:
+            order[p] = (p - me) % n_players
+    size = n_players + 1
+    deals = deals.T   # card-major, so each card's holders are contiguous
+    suspects = order[deals[_SUSPECT_IDS]] * (size * size) + order[deals[CARD_ID[room]]]
+    codes = suspects[:, None, :] + (order[deals[_WEAPON_IDS]] * size)[None, :, :]
+
+    # Each (suspect, weapon, room) rank triple has one outcome; the joint
+    # distribution has a cell per (pair, outcome, envelope). Updated in place
+    # (int32) to keep the pairs x deals arrays few and small
+    n_outcomes, n_solutions = 3 * n_players - 2, estimate.n_solutions
+    cells = _outcome_table(n_players)[codes]
+    cells += _PAIRS * n_outcomes
+    cells *= n_solutions
+    cells += solutions
+    joint = np.bincount(cells.ravel(), np.tile(weights, gains.size),
+                        minlength=gains.size * n_outcomes * n_solutions)
+    joint = joint.reshape(gains.size, n_outcomes * n_solutions)
+
+    envelope = np.bincount(solutions, weights, minlength=n_solutions)
+    outcomes = joint.reshape(gains.size, n_outcomes, n_solutions).sum(axis=2)
+    gains.flat[:] = _entropy(envelope) + _entropy(outcomes) - _entropy(joint)
+    return np.maximum(gains, 0.0)
+
+
+@lru_cache(maxsize=None)
+def _outcome_table(n_players):
+    """
+    Outcome for each (suspect, weapon, room) triple of answering ranks, indexed
+    by (s * (n_players + 1) + w) * (n_players + 1) + r: 0 if nobody answers,
+    else 3 * rank + k - 2 for the first answerer showing their lowest card k
+    (0 suspect, 1 weapon, 2 room).
+    """
+    size = n_players + 1
+    table = np.zeros(size ** 3, dtype=np.int32)
+    for s in range(size):
+        for w in range(size):
+            for r in range(size):
+                first = min(s, w, r)
+                if first < n_players:
+                    table[(s * size + w) * size + r] = 3 * first + (s, w, r).index(first) - 2
+    return table
+
+
+def _entropy(p):
+    """Entropy in bits of each row of <p> (the last axis sums to 1)."""
+    logs = np.zeros_like(p)
+    np.log2(p, out=logs, where=p > 0)
+    return -(p * logs).sum(axis=-1)
+
+
+def most_informative(gains, envelope, rng):
+    """
+    (suspect, weapon) with the highest gain. Ties go to the pair likeliest
+    to be in the envelope (by <envelope> probabilities), then to <rng>.
+    """
+    best = gains.max()
+    pairs = [(s, w) for i, s in enumerate(SUSPECTS) for j, w in enumerate(WEAPONS)
+             if gains[i, j] >= best - GAIN_TOLERANCE]
+    likeliest = max(envelope[s] * envelope[w] for s, w in pairs)
+    return rng.choice([(s, w) for s, w in pairs if envelope[s] * envelope[w] == likeliest])
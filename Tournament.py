@@ -0,0 +1,198 @@
+"""
+Play many seeded AI-only games across a process pool and aggregate the results.
+
+Each seat is given an AI class by name (see AI_CLASSES). By default the lineup
+is rotated from game to game, so every class sits in every seat equally often.
+Games are headless and share one board per worker process; results stream
+back as they finish, in whatever order the workers complete them. Games keep
+no module-level state, so they can also run on a thread pool (useful on
+free-threaded Python builds).
+
+Usage: python Tournament.py -n 10000 --seats ai simple simple [--workers 8] [--out results.jsonl]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from AIPlayer import AIPlayer
+from BoardCompiler import DEFAULT_LAYOUT, get_shared_board
+from game import ClueGame
+from simple_ai import SimpleAIPlayer
+
+AI_CLASSES = {
+    "ai": AIPlayer,
+    "simple": SimpleAIPlayer,
+}
+
+DEFAULT_MAX_TURNS = 300
+
+# One finished game (replayable with ClueGame(seed=seed)). seats: AI name per seat; winner: winning seat or None;
+# turns: player turns taken; accusations: (seat, turn, correct) in order made
+GameResult = namedtuple("GameResult", "seed seats winner turns accusations")
+
+_board = None   # this worker's shared board
+
+
+# ---------- playing one game ----------
+def lineup(seats, game_index, rotate=True):
+    """AI names by seat for the <game_index>-th game: the seat list, rotated once per game."""
+    if not rotate:
+        return tuple(seats)
+    k = game_index % len(seats)
+    return tuple(seats[k:]) + tuple(seats[:k])
+
+
+def play_game(seed, seats, max_turns=DEFAULT_MAX_TURNS, board=None):
+    """Play one headless game with the named AI in each seat and return its GameResult."""
+    game = ClueGame(num_players=len(seats), ai_class=[AI_CLASSES[name] for name in seats],
+                    mansion_board=board or _board, headless=True, seed=seed)
+    game.run(max_turns=max_turns)
+    winner = game.winner.player_id if game.winner else None
+    return GameResult(seed, tuple(seats), winner, game.turn_counter, tuple(game.accusations))
+
+
+def _init_worker(layout):
+    global _board
+    _board = get_shared_board(layout)
+
+
+def _play_task(task):
+    return play_game(*task)
+
+
+# ---------- running many games ----------
+def run_tournament(games, seats, workers=None, max_turns=DEFAULT_MAX_TURNS, first_seed=0,
+                   rotate=True, layout=DEFAULT_LAYOUT, chunksize=None, threads=False):
+    """
+    Yield a GameResult for each of <games> games, seeded first_seed, first_seed+1, ...
+    Results arrive in completion order. workers=None uses every core; workers=1
+    plays in this process without a pool; threads=True plays on a thread pool
+    in this process instead of worker processes.
+    """
+    unknown = [name for name in seats if name not in AI_CLASSES]
+    if unknown:
+        raise ValueError(f"Unknown AI {unknown[0]!r}; choose from {sorted(AI_CLASSES)}")
+    if len(seats) < 3:
+        raise ValueError("A game needs at least 3 seats")
+    layout = os.path.abspath(layout)
+    tasks = ((first_seed + i, lineup(seats, i, rotate), max_turns) for i in range(games))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(layout)
+        for task in tasks:
+            yield _play_task(task)
+        return
+
+    if threads:
+        board = get_shared_board(layout)
+        with ThreadPoolExecutor(workers) as pool:
+            futures = [pool.submit(play_game, *task, board) for task in tasks]
+            for future in as_completed(futures):
+                yield future.result()
+        return
+
+    # Small chunks keep results streaming; enough of them to amortise the IPC
+    chunksize = chunksize or max(1, min(32, games // (workers * 8)))
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(layout,)) as pool:
+        yield from pool.imap_unordered(_play_task, tasks, chunksize)
+
+
+class TournamentStats:
+    """Running totals per AI name: seats played, wins, turns to solve and accusation accuracy."""
+    def __init__(self):
+        self.games = 0
+        self.unfinished = 0        # max_turns reached with no winner
+        self.all_eliminated = 0
+        self.seats = {}            # name → seats played
+        self.wins = {}             # name → games won
+        self.win_turns = {}        # name → total turns of the games it won
+        self.accusations = {}      # name → accusations made
+        self.correct = {}          # name → correct accusations
+
+    def add(self, result):
+        self.games += 1
+        for name in result.seats:
+            self.seats[name] = self.seats.get(name, 0) + 1
+        for seat, _, correct in result.accusations:
+            name = result.seats[seat]
+            self.accusations[name] = self.accusations.get(name, 0) + 1
+            self.correct[name] = self.correct.get(name, 0) + correct
+        if result.winner is not None:
+            name = result.seats[result.winner]
+            self.wins[name] = self.wins.get(name, 0) + 1
+            self.win_turns[name] = self.win_turns.get(name, 0) + result.turns
+        elif len(result.accusations) == len(result.seats):   # each wrong accuser is out
+            self.all_eliminated += 1
+        else:
+            self.unfinished += 1
+
+    def win_rate(self, name):
+        """Fraction of the seats <name> played that it won."""
+        return self.wins.get(name, 0) / self.seats[name] if self.seats.get(name) else 0.0
+
+    def mean_turns_to_solve(self, name):
+        wins = self.wins.get(name, 0)
+        return self.win_turns[name] / wins if wins else None
+
+    def accuracy(self, name):
+        """Fraction of <name>'s accusations that were correct, or None if it never accused."""
+        made = self.accusations.get(name, 0)
+        return self.correct[name] / made if made else None
+
+    def __str__(self):
+        lines = [f"{self.games} games: {self.games - self.unfinished - self.all_eliminated} won, "
+                 f"{self.all_eliminated} all eliminated, {self.unfinished} hit the turn limit",
+                 f"{'AI':<10}{'seats':>8}{'wins':>8}{'win rate':>10}{'turns':>8}{'accused':>9}{'accuracy':>10}"]
+        for name in sorted(self.seats):
+            turns, accuracy = self.mean_turns_to_solve(name), self.accuracy(name)
+            lines.append(f"{name:<10}{self.seats[name]:>8}{self.wins.get(name, 0):>8}"
+                         f"{self.win_rate(name):>10.1%}"
+                         f"{'-' if turns is None else f'{turns:.1f}':>8}"
+                         f"{self.accusations.get(name, 0):>9}"
+                         f"{'-' if accuracy is None else f'{accuracy:.1%}':>10}")
+        return "\n".join(lines)
+
+
+# ---------- command line ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play seeded AI-only Clue games across all cores.")
+    parser.add_argument("-n", "--games", type=int, default=1000)
+    parser.add_argument("--seats", nargs="+", default=["ai", "simple", "simple"], choices=sorted(AI_CLASSES),
+                        help="AI per seat (3-6 seats)")
+    parser.add_argument("--workers", type=int, default=None, help="processes or threads (default: every core)")
+    parser.add_argument("--threads", action="store_true", help="run games on threads instead of processes")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--no-rotate", action="store_true", help="keep every AI in its listed seat")
+    parser.add_argument("--layout", default=DEFAULT_LAYOUT)
+    parser.add_argument("--out", help="write each game's result to this file as a JSON line")
+    args = parser.parse_args(argv)
+
+    stats = TournamentStats()
+    out = open(args.out, "w") if args.out else None
+    start = time.perf_counter()
+    try:
+        for result in run_tournament(args.games, args.seats, args.workers, args.max_turns,
+                                     args.seed, not args.no_rotate, args.layout, threads=args.threads):
+            stats.add(result)
+            if out:
+                out.write(json.dumps(result._asdict()) + "\n")
+            if stats.games % 100 == 0:
+                print(f"\r{stats.games}/{args.games} games", end="", file=sys.stderr, flush=True)
+    finally:
+        if out:
+            out.close()
+    elapsed = time.perf_counter() - start
+    if stats.games >= 100:
+        print(file=sys.stderr)
+    print(stats)
+    print(f"{elapsed:.1f}s, {stats.games / elapsed:.1f} games/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
+from Zobrist import WEAPON_KEYS
+
 class Weapon:
     def __init__(self, name):
         self.name = name
         self.location = None  # Room name
+        self.zobrist = 0      # Zobrist key of the weapon in its room
 
     def move_to(self, room_name):
+        keys = WEAPON_KEYS[self.name]
+        if room_name not in keys:
+            raise ValueError(f"{self.name} can only be moved to a room, not {room_name!r}")
+        self.zobrist ^= keys.get(self.location, 0) ^ keys[room_name]
         self.location = room_name
 
     def __repr__(self):
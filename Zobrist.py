@@ -0,0 +1,78 @@
+"""
+64-bit Zobrist keys for incremental hashing of game state.
+
+Every component of a position (a token on a cell, a weapon in a room, a
+holder still possible for a card in some player's matrix, a clause, the
+player to move, an eliminated player) has a random key; a state's hash is
+the XOR of the keys of its components, so each change updates it in O(1)
+by XOR-ing out the old component and XOR-ing in the new one.
+
+Keys come from fixed seeds, so hashes are the same in every process.
+"""
+import random
+from Constants import WEAPONS, room_name_list
+from CardRegistry import N_CARDS
+
+MAX_PLAYERS = 6
+MAX_HOLDERS = MAX_PLAYERS + 1    # players plus the envelope
+PUBLIC = MAX_PLAYERS             # matrix key set for knowledge that belongs to no player
+MASK64 = (1 << 64) - 1
+
+_rng = random.Random("clue-zobrist")
+
+
+def _keys(n):
+    return [_rng.getrandbits(64) for _ in range(n)]
+
+
+# weapon name → {room name → key}
+WEAPON_KEYS = {weapon: dict(zip(room_name_list, _keys(len(room_name_list)))) for weapon in WEAPONS}
+TURN_KEYS = _keys(MAX_PLAYERS)           # player to move
+ELIMINATED_KEYS = _keys(MAX_PLAYERS)     # player out of the game
+# MATRIX_KEYS[owner][card * MAX_HOLDERS + holder]: holder still possible for card in owner's matrix
+MATRIX_KEYS = [_keys(N_CARDS * MAX_HOLDERS) for _ in range(MAX_PLAYERS + 1)]
+_CLAUSE_SALTS = _keys(MAX_PLAYERS + 1)
+
+
+class _TokenKeys(dict):
+    """token name → key per cell bit, made on first use from a seed derived from both."""
+    def __init__(self, n_bits):
+        super().__init__()
+        self.n_bits = n_bits
+
+    def __missing__(self, name):
+        rng = random.Random(f"clue-zobrist-token-{self.n_bits}-{name}")
+        keys = self[name] = [rng.getrandbits(64) for _ in range(self.n_bits)]
+        return keys
+
+
+_token_tables = {}   # bitboard size → _TokenKeys
+
+
+def token_keys(n_bits):
+    """
+    Keys for each token on each of <n_bits> board cells (by Bitboard cell bit).
+    Keys depend only on the size and name, so tables built concurrently agree.
+    """
+    table = _token_tables.get(n_bits)
+    if table is None:
+        table = _token_tables.setdefault(n_bits, _TokenKeys(n_bits))
+    return table
+
+
+def mix64(x):
+    """splitmix64 finaliser: a well-spread 64-bit value for any int."""
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+def clause_key(owner, holder, mask):
+    """Key of the clause "holder has one of the cards in <mask>" in owner's matrix."""
+    return mix64(_CLAUSE_SALTS[owner] ^ (holder << N_CARDS | mask))
+
+
+def matrix_owner(my_index):
+    """Key set of a matrix: its player's, or PUBLIC for shared knowledge."""
+    return PUBLIC if my_index is None else my_index
@@ -0,0 +1,105 @@
+"""
+Benchmark the bitset PossibilityMatrix against the original dict-of-dicts engine.
+
+Replays the same randomly generated (but truthful) observation sequences
+on both engines and reports the time per game and the speedup. Then times
+hypothetical "what if <holder> showed <card>?" queries on the final states,
+undoing each with checkpoint()/rollback() versus working on a deepcopy.
+
+Usage: python benchmark_deduction.py [games] [players]
+"""
+import copy
+import random
+import sys
+import time
+from Constants import SUSPECTS, WEAPONS, ROOMS, ALL_CARDS
+from DeductionMatrix import PossibilityMatrix, DictPossibilityMatrix
+
+
+def make_script(n_players, seed, n_observations=60):
+    """A deal plus a list of truthful ("set"/"elim", card, holder) observations."""
+    rng = random.Random(seed)
+    solution = [rng.choice(SUSPECTS), rng.choice(WEAPONS), rng.choice(ROOMS)]
+    deck = [c for c in ALL_CARDS if c not in solution]
+    rng.shuffle(deck)
+    owner = {card: f"P{i % n_players}" for i, card in enumerate(deck)}
+    owner.update({card: "ENVELOPE" for card in solution})
+    holders = [f"P{i}" for i in range(n_players)] + ["ENVELOPE"]
+
+    observations = []
+    for _ in range(n_observations):
+        card = rng.choice(ALL_CARDS)
+        if rng.random() < 0.3:
+            observations.append(("set", card, owner[card]))
+        else:
+            observations.append(("elim", card, rng.choice([h for h in holders if h != owner[card]])))
+    hand = [c for c in deck if owner[c] == "P0"]
+    return hand, observations
+
+
+def replay(engine, n_players, hand, observations):
+    matrix = engine(n_players, 0, hand)
+    for op, card, holder in observations:
+        if op == "set":
+            matrix.set_holder(card, holder)
+        else:
+            matrix.eliminate(card, holder)
+        matrix.envelope_complete()
+    return matrix
+
+
+def time_engine(engine, n_players, scripts):
+    start = time.perf_counter()
+    for hand, observations in scripts:
+        replay(engine, n_players, hand, observations)
+    return time.perf_counter() - start
+
+
+def hypotheses(matrix):
+    """Every (card, holder) pair still open: what a search AI would branch on."""
+    return [(card, holder) for card in ALL_CARDS for holder in matrix.holders
+            if matrix.poss[card][holder] and matrix.card_owner(card) is None]
+
+
+def time_snapshots(matrices, use_trail):
+    """Time trying every open hypothesis on every matrix, returning (seconds, queries)."""
+    queries = 0
+    start = time.perf_counter()
+    for matrix in matrices:
+        for card, holder in hypotheses(matrix):
+            if use_trail:
+                token = matrix.checkpoint()
+                matrix.set_holder(card, holder)
+                matrix.envelope_complete()
+                matrix.rollback(token)
+            else:
+                branch = copy.deepcopy(matrix)
+                branch.set_holder(card, holder)
+                branch.envelope_complete()
+            queries += 1
+    return time.perf_counter() - start, queries
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n_players = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    scripts = [make_script(n_players, seed) for seed in range(games)]
+
+    old = time_engine(DictPossibilityMatrix, n_players, scripts)
+    new = time_engine(PossibilityMatrix, n_players, scripts)
+    print(f"{games} games, {n_players} players, {len(scripts[0][1])} observations each")
+    print(f"dict engine:   {old / games * 1e3:8.3f} ms/game")
+    print(f"bitset engine: {new / games * 1e3:8.3f} ms/game")
+    print(f"speedup:       {old / new:8.1f}x")
+
+    matrices = [replay(PossibilityMatrix, n_players, hand, observations) for hand, observations in scripts]
+    copied, queries = time_snapshots(matrices, use_trail=False)
+    trailed, _ = time_snapshots(matrices, use_trail=True)
+    print(f"\n{queries} hypothetical refutations")
+    print(f"deepcopy:      {copied / queries * 1e6:8.1f} us/query")
+    print(f"rollback:      {trailed / queries * 1e6:8.1f} us/query")
+    print(f"speedup:       {copied / trailed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
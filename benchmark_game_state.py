@@ -0,0 +1,66 @@
+"""
+Benchmark copying a mid-game ClueGame with deepcopy against GameState.
+
+Plays a seeded AI game part of the way (one still in progress), then times per second:
+deepcopy of the game (sharing the board and its caches), GameState.from_game, clone, to_bytes,
+from_bytes and apply for a move, an end of turn and a suggestion.
+
+Usage: python benchmark_game_state.py [n_players] [turns]
+"""
+import copy
+import sys
+import time
+from Constants import SUSPECTS, WEAPONS
+from game import ClueGame
+from GameState import GameState, Move, Suggest, EndTurn
+
+
+def rate(fn, min_time=0.5):
+    """Calls of fn() per second, over at least <min_time> seconds."""
+    calls, start = 0, time.perf_counter()
+    while True:
+        for _ in range(50):
+            fn()
+        calls += 50
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+
+
+def main():
+    n_players = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    for seed in range(100):   # the first seeded game still going after <turns> turns
+        game = ClueGame(num_players=n_players, use_ai_players=True, headless=True, seed=seed)
+        game.run(max_turns=turns)
+        if not game.game_over:
+            break
+    board = game.mansion_board
+    # Plain deepcopy(game) fails on the locks of the shared caches, so share
+    # everything that is process-wide and deep-copy only the game itself
+    shared = {id(obj): obj for obj in (board, game.movement, game.move_cache)}
+
+    state = GameState.from_game(game)
+    data = state.to_bytes()
+    entrance = board.room_dict["Kitchen"].room_entrance_list[0]
+    in_room = state.apply(Move(entrance.row, entrance.column))
+
+    results = [
+        ("deepcopy(game)", rate(lambda: copy.deepcopy(game, dict(shared)))),
+        ("GameState.from_game", rate(lambda: GameState.from_game(game))),
+        ("clone", rate(state.clone)),
+        ("to_bytes", rate(state.to_bytes)),
+        ("from_bytes", rate(lambda: GameState.from_bytes(data, board))),
+        ("apply(Move)", rate(lambda: state.apply(Move(entrance.row, entrance.column)))),
+        ("apply(EndTurn)", rate(lambda: state.apply(EndTurn()))),
+        ("apply(Suggest)", rate(lambda: in_room.apply(Suggest(SUSPECTS[0], WEAPONS[0])))),
+    ]
+    print(f"{n_players} players after {game.turn_counter} turns; "
+          f"GameState encodes to {len(data)} bytes, {len(state.knowledge[0][1])} clauses for player 0")
+    deepcopy_rate = results[0][1]
+    for name, per_second in results:
+        print(f"{name:<22}{per_second:>14,.0f}/s  {per_second / deepcopy_rate:>10.0f}x deepcopy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark AI-only games with the default console/image output against headless games.
+
+Plays the same seeded games in three modes and reports games per second:
+  default   - ClueGame's defaults: console log, ASCII board and a PNG per board display
+  text      - enable_visualization=False: console log only
+  headless  - headless=True: nothing is printed or drawn
+Console output goes to os.devnull and images to a temporary directory, so
+the terminal and the working tree are not part of the timings.
+
+Rendering a PNG per board display is what makes default games slow; once
+images are off, headless runs at about the speed of text (~1.0x), because
+AI decisions dominate and a discarded console log is cheap.
+
+Usage: python benchmark_headless.py [games] [image_games] [max_turns]
+"""
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from BoardCompiler import get_shared_board
+from game import ClueGame
+
+
+def play(board, games, max_turns, **options):
+    """Games per second over <games> seeded AI games with the given ClueGame options."""
+    start = time.perf_counter()
+    for seed in range(games):
+        game = ClueGame.from_board(board, num_players=3, use_ai_players=True, seed=seed, **options)
+        game.run(max_turns=max_turns)
+    return games / (time.perf_counter() - start)
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    image_games = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    max_turns = int(sys.argv[3]) if len(sys.argv) > 3 else 150
+    board = get_shared_board(os.path.abspath("mansion_board_layout.xlsx"))
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as images, open(os.devnull, "w") as sink, \
+            contextlib.redirect_stdout(sink):
+        os.chdir(images)   # board_images/ is written relative to the working directory
+        try:
+            default = play(board, image_games, max_turns) if image_games else None
+        finally:
+            os.chdir(cwd)
+        text = play(board, games, max_turns, enable_visualization=False)
+    headless = play(board, games, max_turns, headless=True)
+
+    print(f"3 AI players, up to {max_turns} turns per game")
+    if default:
+        print(f"default  ({image_games:3d} games): {default:10.3f} games/s")
+    print(f"text     ({games:3d} games): {text:10.3f} games/s")
+    print(f"headless ({games:3d} games): {headless:10.3f} games/s")
+    if default:
+        print(f"text vs default (no PNG rendering): {text / default:8.1f}x")
+    print(f"headless vs text (no console log):  {headless / text:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark AIPlayer's suggestion decisions as games make them.
+
+Plays seeded all-AI games and times every choose_suggestion call. A player's
+knowledge changes between its suggestions, so each call does the full work:
+it updates the sampled estimate, either by keeping the deals still consistent
+with the new knowledge (reused) or by sampling afresh (fresh), and scores
+every suspect x weapon pair for the room. Calls whose knowledge did not change
+(cached) only rescore. Reports calls, median, 90th percentile and the share
+under a millisecond for each path and overall.
+
+Usage: python benchmark_suggestion.py [n_players] [games]
+"""
+import statistics
+import sys
+import time
+from AIPlayer import AIPlayer
+from DealSampler import SampledMarginals
+from EnvelopeInference import knowledge_key
+from game import ClueGame
+
+PATHS = ("cached", "reused", "fresh")
+
+
+class TimedAI(AIPlayer):
+    """AIPlayer that records the time of each suggestion under the path it took."""
+    timings = {path: [] for path in PATHS}
+
+    def choose_suggestion(self, room, game):
+        path = self._path(game.logic_engines[self.player_id])
+        start = time.perf_counter()
+        choice = super().choose_suggestion(room, game)
+        self.timings[path].append(time.perf_counter() - start)
+        return choice
+
+    def _path(self, matrix):
+        """Which path the next estimate takes, worked out on a copy so nothing is cached early."""
+        key, previous = self._estimate_cache
+        if key == knowledge_key(matrix):
+            return "cached"
+        if previous is None:
+            return "fresh"
+        copy = SampledMarginals(previous.holders, previous.deals, previous.weights, previous.n_drawn,
+                                previous.knowledge)
+        kept = copy.restrict(matrix)
+        return "reused" if kept is not None and kept.n_valid >= self.min_kept_deals else "fresh"
+
+
+def summary(name, times):
+    """One report row for the given call times (seconds)."""
+    if not times:
+        return f"{name:<8}{0:>7}"
+    times = sorted(times)
+    under = sum(t < 1e-3 for t in times) / len(times)
+    return (f"{name:<8}{len(times):>7}{statistics.median(times) * 1e3:>13.3f}"
+            f"{times[int(0.9 * len(times))] * 1e3:>10.3f}{under:>10.0%}")
+
+
+def main():
+    n_players = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    start = time.perf_counter()
+    for seed in range(games):
+        ClueGame(num_players=n_players, ai_class=TimedAI, headless=True, seed=seed).run()
+    elapsed = time.perf_counter() - start
+    print(f"{n_players} players, {games} games ({games / elapsed:.1f} games/s)")
+    print(f"{'path':<8}{'calls':>7}{'median (ms)':>13}{'p90 (ms)':>10}{'< 1 ms':>10}")
+    for path in PATHS:
+        print(summary(path, TimedAI.timings[path]))
+    print(summary("all", [t for path in PATHS for t in TimedAI.timings[path]]))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,54 @@
 import random
-import pandas as pd
 import os
 import csv
 from Board import MansionBoard, CharacterBoard
-from Character import character_dict
+from BoardCompiler import (get_shared_board, CELL_ROOM, CELL_ENTRANCE, CELL_BONUS,
+                           CELL_OUT_OF_BOUNDS)
+from Character import new_character_dict
 from Weapon import Weapon
 from Player import Player
 from Room import Room
 from Constants import *
-from DeductionMatrix import PossibilityMatrix
+from DeductionMatrix import PossibilityMatrix, PublicKnowledge
+from CardRegistry import CARD_NAMES
 from BonusCard import BonusCard
 from SuggestionHistory import SuggestionHistory
 from DeductionViewer import DeductionViewer
-import visualization
+from GameLog import GameLogger, INFO, SILENT
+from Zobrist import TURN_KEYS, ELIMINATED_KEYS
 
 class ClueGame:
-    def __init__(self, num_players=3, use_ai_players=False, log_to_csv=False, enable_visualization=True, ai_class=None, num_human=None):
+    def __init__(self, num_players=3, use_ai_players=False, log_to_csv=False, enable_visualization=True, ai_class=None, num_human=None,
+                 mansion_board=None, movement_backend="adjacency",
+                 headless=False, log_level=INFO, seed=None):
+        # Console output goes through a leveled logger; headless games write nothing
+        self.headless = headless
+        self.log = GameLogger(SILENT if headless else log_level)
+        if headless:
+            enable_visualization = False
+
+        # Every random choice in the game (deal, dice, bonus cards, AI decisions) comes
+        # from this generator, so a game replays exactly from its seed
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.rng = random.Random(self.seed)
+
         # ---------- load boards ----------
-        self.mansion_layout = pd.read_excel("mansion_board_layout.xlsx", header=None)
-        self.mansion_board = MansionBoard(self.mansion_layout)
-        self.char_board = CharacterBoard(self.mansion_board.rows, self.mansion_board.cols)
+        # The layout is shared between games; only token positions are per game
+        if mansion_board is None:
+            mansion_board = get_shared_board("mansion_board_layout.xlsx")
+        elif not mansion_board.frozen:
+            raise ValueError("Games share their board; pass a frozen one (MansionBoard.freeze() or get_shared_board())")
+        self.mansion_board = mansion_board
+        self.char_board = CharacterBoard(self.mansion_board.rows, self.mansion_board.cols, self.mansion_board)
+        # Movement generation: "adjacency" (MovementEngine) or "bitboard" (Bitboard)
+        self.movement_backend = movement_backend
+        if movement_backend == "adjacency":
+            self.movement = self.mansion_board.movement
+        elif movement_backend == "bitboard":
+            self.movement = self.mansion_board.bitboard
+        else:
+            raise ValueError(f"Unknown movement backend: {movement_backend}")
+        self.move_cache = self.mansion_board.move_cache   # shared by every game on this board
         self.turn_counter = 0
         self.max_turns = None
 
@@ -48,13 +77,17 @@ class ClueGame:
                     file_path = os.path.join(image_dir, file)
                     if os.path.isfile(file_path):
                         os.remove(file_path)
-                print(f"Cleared directory '{image_dir}' for board images")
+                self.log.info("Cleared directory '%s' for board images", image_dir)
 
         # Game options
         self.use_ai_players = use_ai_players or ai_class is not None or (num_human is not None and num_human == 0)
+        if headless and not self.use_ai_players:
+            raise ValueError("Headless games print nothing, so every seat must be an AI player")
         self.log_to_csv = log_to_csv
 
         # ---------- characters & players ----------
+        # Tokens belong to this game, so any number of games can share a process
+        self.character_dict = new_character_dict()
         self.players = []
 
         # Handle num_human parameter (overrides num_players)
@@ -65,18 +98,21 @@ class ClueGame:
         num_players = max(3, num_players)
 
         if self.use_ai_players:
-            # Use specified AI class if provided, otherwise use default AIPlayer
+            # Use specified AI class if provided (one class, or one per seat), otherwise use default AIPlayer
             if ai_class is not None:
+                seat_classes = ai_class if isinstance(ai_class, (list, tuple)) else [ai_class] * num_players
+                if len(seat_classes) != num_players:
+                    raise ValueError(f"Expected {num_players} AI classes, got {len(seat_classes)}")
                 for i, name in enumerate(SUSPECTS[:num_players]):
-                    self.players.append(ai_class(i, character_dict[name]))
+                    self.players.append(seat_classes[i](i, self.character_dict[name]))
             else:
                 # Import AIPlayer here to avoid circular imports
                 from AIPlayer import AIPlayer
                 for i, name in enumerate(SUSPECTS[:num_players]):
-                    self.players.append(AIPlayer(i, character_dict[name]))
+                    self.players.append(AIPlayer(i, self.character_dict[name]))
         else:
             for i, name in enumerate(SUSPECTS[:num_players]):
-                self.players.append(Player(i, character_dict[name]))
+                self.players.append(Player(i, self.character_dict[name]))
 
         # place *all* 6 tokens around the centre (row 10,11 picked arbitrarily)
         self.centre_row, self.centre_col = 10, 11
@@ -89,7 +125,7 @@ class ClueGame:
             (self.centre_row + 1, self.centre_col),     # South
             (self.centre_row + 1, self.centre_col - 1)  # Southwest
         ]
-        for char, pos in zip(character_dict.values(), positions):
+        for char, pos in zip(self.character_dict.values(), positions):
             char.position = pos
             self.char_board.place(char.name, pos[0], pos[1])
 
@@ -97,18 +133,18 @@ class ClueGame:
         self.weapon_dict = {w: Weapon(w) for w in weapon_name_list}
         # Place all weapons in the center (Clue room) initially
         for w in self.weapon_dict.values():
-            w.location = "Clue"
+            w.move_to("Clue")
 
         # ---------- secret envelope ----------
         self.solution = {
-            "suspect": random.choice(SUSPECTS),
-            "weapon": random.choice(WEAPONS),
-            "room": random.choice(ROOMS)
+            "suspect": self.rng.choice(SUSPECTS),
+            "weapon": self.rng.choice(WEAPONS),
+            "room": self.rng.choice(ROOMS)
         }
 
         # remove those cards and deal the rest
         deck = [c for c in ALL_CARDS if c not in self.solution.values()]
-        random.shuffle(deck)
+        self.rng.shuffle(deck)
 
         for idx, card in enumerate(deck):
             player = self.players[idx % len(self.players)]
@@ -118,15 +154,13 @@ class ClueGame:
                 player.observe_card(card)
 
         # ---------- build deduction matrices (one per player) ----------
-        self.logic_engines = {
-            p.player_id: PossibilityMatrix(len(self.players), p.player_id, p.hand)
-            for p in self.players
-        }
+        self._build_logic_engines()
 
         # Game state
         self.current_player_idx = 0
         self.game_over = False
         self.winner = None
+        self.accusations = []   # (player_id, turn, correct) for every accusation made
 
         # Suggestion history
         self.suggestion_history = SuggestionHistory()
@@ -157,22 +191,93 @@ class ClueGame:
 
                 writer.writerow(header)
 
-        print("Setup complete ✅")
-        print("Secret envelope (hidden to players):", self.solution)
+        self.log.info("Setup complete ✅")
+        self.log.info("Secret envelope (hidden to players): %s", self.solution)
 
         # Display each player's starting hand
-        for player in self.players:
-            print(f"\n{player.character.name}'s starting hand:")
-            self.display_player_hand(player)
+        if self.log.enabled(INFO):
+            for player in self.players:
+                self.log.info("\n%s's starting hand:", player.character.name)
+                self.display_player_hand(player)
+
+    @classmethod
+    def from_board(cls, mansion_board, **kwargs):
+        """Create a game on an existing, frozen MansionBoard instead of loading one."""
+        return cls(mansion_board=mansion_board, **kwargs)
+
+    def _build_logic_engines(self):
+        """One shared public-knowledge matrix plus a private overlay per player."""
+        self.public_knowledge = PublicKnowledge(len(self.players))
+        self.logic_engines = {
+            p.player_id: PossibilityMatrix(len(self.players), p.player_id, p.hand, public=self.public_knowledge)
+            for p in self.players
+        }
+
+    def _publish(self, method, *args):
+        """Apply a public observation once, plus to any matrix not layered on the shared one."""
+        getattr(self.public_knowledge, method)(*args)
+        for matrix in self.logic_engines.values():
+            if getattr(matrix, "public", None) is not self.public_knowledge:
+                getattr(matrix, method)(*args)
 
     def roll_dice(self):
         """Simulate rolling a six-sided die"""
-        return random.randint(1, 6)
+        return self.rng.randint(1, 6)
 
     def get_valid_moves(self, player, steps):
         """Get valid moves for a player given the number of steps"""
-        valid_moves = []
-        valid_moves_set = set()  # Use a set to track unique positions
+        mode, sources = self._movement_mode(player)
+        if mode[0] == "room":
+            self.log.info("Exiting %s: You can exit from any entrance of this room!", mode[1])
+        elif mode[0] == "first":
+            self.log.info("First move: You can start from any entrance and move from there!")
+
+        key = self._move_cache_key(mode, sources, steps)
+        cached = self.move_cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        valid_moves = self._search_moves(mode, sources, steps)
+        self.move_cache.put(key, valid_moves)
+        return valid_moves
+
+    def get_valid_moves_by_roll(self, player, max_steps=6):
+        """
+        Valid moves for every roll 1..max_steps from a single traversal.
+        Returns {steps: moves}, each list equal to get_valid_moves(player, steps).
+        """
+        mode, sources = self._movement_mode(player)
+        engine = self.movement
+        occupied = engine.occupied_cells(self.char_board)
+        if mode[0] == "walk":
+            layers = engine.walk_layers(sources[0], max_steps, occupied)
+        else:
+            layers = engine.flood_layers(sources, max_steps, occupied)
+
+        moves_by_roll = {}
+        for steps in range(1, max_steps + 1):
+            valid_moves = self._merge_moves(self._shortcut_moves(mode, steps), layers[steps])
+            # Later single-roll queries for this position are answered from the cache
+            self.move_cache.put(self._move_cache_key(mode, sources, steps), valid_moves)
+            moves_by_roll[steps] = valid_moves
+        return moves_by_roll
+
+    def room_reach_probabilities(self, player, max_steps=6):
+        """Chance, over one roll of the die, that this turn's move can end at an entrance of each room"""
+        reach = dict.fromkeys(self.mansion_board.room_dict, 0.0)
+        for steps, valid_moves in self.get_valid_moves_by_roll(player, max_steps).items():
+            rooms = {self.mansion_board.room_name_at(r, c) for r, c in valid_moves
+                     if self.mansion_board.cell_code(r, c) == CELL_ENTRANCE}
+            for room_name in rooms:
+                reach[room_name] += 1 / max_steps
+        return reach
+
+    def _movement_mode(self, player):
+        """
+        Work out how the player moves this turn: ("room", name) when leaving a
+        room, ("first",) on the first move, else ("walk", position). Also
+        returns the cells the search starts from.
+        """
         current_pos = player.character.position
 
         # Check if this is the first move (character is in the center)
@@ -195,143 +300,72 @@ class ClueGame:
             is_in_room = True
 
         # For the first move or when exiting a room, allow starting from any entrance and then moving steps from there
-        if is_first_move or is_in_room:
-            if is_in_room:
-                print(f"Exiting {current_room.name}: You can exit from any entrance of this room!")
-                # When exiting a room, only allow starting from entrances of the current room
-                rooms_to_check = [(current_room.name, current_room)]
-
-                # If the player is in the Clue room and has enough steps, allow moving directly to adjacent rooms
-                if current_room.name == "Clue" and steps >= 2:
-                    # Add entrances of other rooms as valid moves only if they're actually reachable within the number of steps
-                    for other_room_name, other_room in self.mansion_board.room_dict.items():
-                        if other_room_name != "Clue":
-                            for entrance in other_room.room_entrance_list:
-                                entrance_pos = (entrance.row, entrance.column)
-                                # Check if the entrance is not occupied by another character
-                                if self.char_board.get_cell_content(entrance_pos[0], entrance_pos[1]) is None:
-                                    # Check if this entrance is actually reachable within the number of steps
-                                    # Calculate the minimum Manhattan distance from any Clue room entrance
-                                    min_distance = float('inf')
-                                    for clue_entrance in current_room.room_entrance_list:
-                                        clue_entrance_pos = (clue_entrance.row, clue_entrance.column)
-                                        distance = abs(entrance_pos[0] - clue_entrance_pos[0]) + abs(entrance_pos[1] - clue_entrance_pos[1])
-                                        min_distance = min(min_distance, distance)
-
-                                    # Only add this entrance if it's reachable within the number of steps
-                                    if min_distance <= steps and entrance_pos not in valid_moves_set:
-                                        valid_moves.append(entrance_pos)
-                                        valid_moves_set.add(entrance_pos)
-            else:
-                print("First move: You can start from any entrance and move from there!")
-                # For the first move, allow starting from any entrance
-                rooms_to_check = self.mansion_board.room_dict.items()
-
-            # For each entrance, calculate valid moves after exiting
-            for room_name, room in rooms_to_check:
-                for entrance in room.room_entrance_list:
+        if is_in_room:
+            # When exiting a room, only allow starting from entrances of the current room
+            return ("room", current_room.name), [(e.row, e.column) for e in current_room.room_entrance_list]
+        if is_first_move:
+            # For the first move, allow starting from any entrance
+            return ("first",), [(e.row, e.column)
+                                for room in self.mansion_board.room_dict.values() for e in room.room_entrance_list]
+        # Normal movement for subsequent turns
+        return ("walk", current_pos), [current_pos]
+
+    def _move_cache_key(self, mode, sources, steps):
+        """Cache key: only tokens inside the region the search can touch affect the answer"""
+        def build_region():
+            region = self.mansion_board.bitboard.within(sources, steps)
+            if mode == ("room", "Clue") and steps >= 2:
+                region |= self.mansion_board.bitboard.entrances
+            return region
+
+        region = self.move_cache.region(mode, steps, build_region)
+        return (self.movement_backend, mode, steps, self.char_board.occupied_bits & region)
+
+    def _search_moves(self, mode, sources, steps):
+        """Run the movement engine for a mode worked out by _movement_mode"""
+        engine = self.movement
+        occupied = engine.occupied_cells(self.char_board)
+        if mode[0] == "walk":
+            # Exact-step walk plus any entrance passed on the way
+            return engine.walk(sources[0], steps, occupied)
+        # Cells exactly 'steps' away from any free entrance, searched in a single pass
+        return self._merge_moves(self._shortcut_moves(mode, steps), engine.flood(sources, steps, occupied))
+
+    def _shortcut_moves(self, mode, steps):
+        """Entrances of other rooms a player in the Clue room can reach directly"""
+        valid_moves = []
+        if mode != ("room", "Clue") or steps < 2:
+            return valid_moves
+        clue_room = self.mansion_board.room_dict["Clue"]
+        # Add entrances of other rooms as valid moves only if they're actually reachable within the number of steps
+        for other_room_name, other_room in self.mansion_board.room_dict.items():
+            if other_room_name != "Clue":
+                for entrance in other_room.room_entrance_list:
                     entrance_pos = (entrance.row, entrance.column)
                     # Check if the entrance is not occupied by another character
                     if self.char_board.get_cell_content(entrance_pos[0], entrance_pos[1]) is None:
-                        # Calculate moves from this entrance
-                        # For the first move, we should only be able to move 'steps' away from the entrance
-                        visited = {entrance_pos}
-                        queue = [(entrance_pos, steps)]
-
-                        # Use BFS to find all reachable cells within the given number of steps
-                        # This ensures that we can only move 'steps' away from the entrance
-
-                        while queue:
-                            (row, col), remaining_steps = queue.pop(0)
-
-                            # If we've used all steps, this is a valid destination
-                            if remaining_steps == 0:
-                                # Check if the destination is not occupied by another character
-                                if self.char_board.get_cell_content(row, col) is None:
-                                    # Ensure we're not adding diagonal moves
-                                    # Calculate Manhattan distance from entrance
-                                    manhattan_dist = abs(row - entrance_pos[0]) + abs(col - entrance_pos[1])
-                                    # Check if the destination is not within the same room as the player's current position
-                                    dest_cell_type = self.mansion_board.get_cell_type(row, col)
-                                    is_dest_in_room = isinstance(dest_cell_type, Room)
-                                    if manhattan_dist <= steps and not is_dest_in_room and (row, col) not in valid_moves_set:
-                                        valid_moves.append((row, col))
-                                        valid_moves_set.add((row, col))
-                                continue
-
-                            # Try all four directions (no diagonal movement)
-                            for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                                new_row, new_col = row + dr, col + dc
-
-                                # Check if the new position is valid
-                                if 0 <= new_row < self.mansion_board.rows and 0 <= new_col < self.mansion_board.cols:
-                                    cell_type = self.mansion_board.get_cell_type(new_row, new_col)
-
-                                    # Can move to empty cells or room entrances, but not walls
-                                    if cell_type is None or hasattr(cell_type, 'room_name'):
-                                        # Check if the cell is not occupied by another character
-                                        if (new_row, new_col) not in visited and (
-                                            self.char_board.get_cell_content(new_row, new_col) is None or 
-                                            (new_row, new_col) == entrance_pos
-                                        ):
-                                            visited.add((new_row, new_col))
-                                            queue.append(((new_row, new_col), remaining_steps - 1))
-
-            return valid_moves
-
-        # Normal movement for subsequent turns
-        # Simple BFS to find valid moves
-        queue = [(current_pos, steps)]
-        visited = {current_pos}
-        room_entrances_found = []  # Track room entrances found during BFS
-
-        while queue:
-            (row, col), remaining_steps = queue.pop(0)
-
-            # If we've used all steps, this is a valid destination
-            if remaining_steps == 0:
-                # Check if the destination is already occupied by another character
-                if self.char_board.get_cell_content(row, col) is None or (row, col) == current_pos:
-                    # Ensure we're not adding diagonal moves
-                    # Calculate Manhattan distance from current position
-                    manhattan_dist = abs(row - current_pos[0]) + abs(col - current_pos[1])
-                    if manhattan_dist <= steps and (row, col) not in valid_moves_set:
-                        valid_moves.append((row, col))
-                        valid_moves_set.add((row, col))
-                continue
-
-            # Try all four directions (no diagonal movement)
-            for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                new_row, new_col = row + dr, col + dc
-
-                # Check if the new position is valid
-                if 0 <= new_row < self.mansion_board.rows and 0 <= new_col < self.mansion_board.cols:
-                    cell_type = self.mansion_board.get_cell_type(new_row, new_col)
-
-                    # Check if this is a room entrance
-                    is_room_entrance = cell_type and hasattr(cell_type, 'room_name')
-
-                    # If it's a room entrance, check if it's actually reachable within the number of steps
-                    if is_room_entrance and (new_row, new_col) not in room_entrances_found:
-                        if self.char_board.get_cell_content(new_row, new_col) is None:
-                            # Calculate Manhattan distance from current position
-                            manhattan_dist = abs(new_row - current_pos[0]) + abs(new_col - current_pos[1])
-                            # Only add this entrance if it's reachable within the number of steps
-                            if manhattan_dist <= steps and (new_row, new_col) not in valid_moves_set:
-                                valid_moves.append((new_row, new_col))
-                                valid_moves_set.add((new_row, new_col))
-                                room_entrances_found.append((new_row, new_col))
-
-                    # Can move to empty cells or room entrances, but not walls
-                    if cell_type is None or hasattr(cell_type, 'room_name'):
-                        # Check if the cell is not occupied by another character
-                        if (new_row, new_col) not in visited and (
-                            self.char_board.get_cell_content(new_row, new_col) is None or 
-                            (new_row, new_col) == current_pos
-                        ):
-                            visited.add((new_row, new_col))
-                            queue.append(((new_row, new_col), remaining_steps - 1))
+                        # Check if this entrance is actually reachable within the number of steps
+                        # Calculate the minimum Manhattan distance from any Clue room entrance
+                        min_distance = float('inf')
+                        for clue_entrance in clue_room.room_entrance_list:
+                            clue_entrance_pos = (clue_entrance.row, clue_entrance.column)
+                            distance = abs(entrance_pos[0] - clue_entrance_pos[0]) + abs(entrance_pos[1] - clue_entrance_pos[1])
+                            min_distance = min(min_distance, distance)
+
+                        # Only add this entrance if it's reachable within the number of steps
+                        if min_distance <= steps:
+                            valid_moves.append(entrance_pos)
+        return valid_moves
 
+    @staticmethod
+    def _merge_moves(first, second):
+        """Concatenate two move lists, dropping duplicates"""
+        valid_moves = list(first)
+        valid_moves_set = set(valid_moves)  # Use a set to track unique positions
+        for move in second:
+            if move not in valid_moves_set:
+                valid_moves.append(move)
+                valid_moves_set.add(move)
         return valid_moves
 
     def move_player(self, player, new_position):
@@ -346,23 +380,13 @@ class ClueGame:
             current_room = self.mansion_board.room_dict[room_name]
 
             # Find an available cell in the room to place the character
-            found_cell = False
-            for r in range(self.mansion_board.rows):
-                for c in range(self.mansion_board.cols):
-                    # Check if this cell is in the same room and is not occupied
-                    cell_type = self.mansion_board.get_cell_type(r, c)
-                    if (isinstance(cell_type, Room) and cell_type.name == current_room.name and 
-                        self.char_board.get_cell_content(r, c) is None):
-                        # Found an empty cell in the room
-                        player.character.move_to((r, c))
-                        self.char_board.move(player.character.name, r, c)
-                        found_cell = True
-                        break
-                if found_cell:
-                    break
+            free_cell = self.char_board.free_room_cell(current_room.name)
+            if free_cell:
+                player.character.move_to(free_cell)
+                self.char_board.move(player.character.name, free_cell[0], free_cell[1])
 
             # If no empty cell was found, just place at the entrance
-            if not found_cell:
+            else:
                 player.character.move_to(new_position)
                 self.char_board.move(player.character.name, new_position[0], new_position[1])
         else:
@@ -373,7 +397,7 @@ class ClueGame:
     def make_suggestion(self, player, suspect, weapon, room):
         """Make a suggestion and get responses"""
         # Move the suggested character and weapon to the room
-        suggested_char = character_dict[suspect]
+        suggested_char = self.character_dict[suspect]
 
         # Get the current room
         current_pos = player.character.position
@@ -385,49 +409,46 @@ class ClueGame:
 
             # Additional safeguard: Prevent suggestions in the Clue room
             if current_room.name == "Clue":
-                print("Error: Suggestions cannot be made in the Clue room.")
+                self.log.error("Error: Suggestions cannot be made in the Clue room.")
                 return None, None
 
             # Find an available cell in the room to place the suggested character
-            found_cell = False
-            for r in range(self.mansion_board.rows):
-                for c in range(self.mansion_board.cols):
-                    # Check if this cell is in the same room and is not occupied
-                    cell_type = self.mansion_board.get_cell_type(r, c)
-                    if (isinstance(cell_type, Room) and cell_type.name == current_room.name and 
-                        self.char_board.get_cell_content(r, c) is None):
-                        # Found an empty cell in the room
-                        suggested_char.move_to((r, c))
-                        self.char_board.move(suggested_char.name, r, c)
-                        found_cell = True
-                        break
-                if found_cell:
-                    break
+            free_cell = self.char_board.free_room_cell(current_room.name)
+            if free_cell:
+                suggested_char.move_to(free_cell)
+                self.char_board.move(suggested_char.name, free_cell[0], free_cell[1])
 
             # If no empty cell was found, just update the character's position without moving on the board
-            if not found_cell:
+            else:
                 suggested_char.move_to(player.character.position)
-                print(f"Could not move {suspect} to an empty cell in the {current_room.name}. Character position updated but not moved on board.")
+                self.log.warning("Could not move %s to an empty cell in the %s. Character position updated but not moved on board.",
+                                 suspect, current_room.name)
         else:
             # This shouldn't happen as suggestions should only be made in rooms
-            print(f"Error: Suggestion made outside a room at position {current_pos}")
+            self.log.error("Error: Suggestion made outside a room at position %s", current_pos)
 
         self.weapon_dict[weapon].move_to(room)
 
         # Add the suggestion to the history
-        suggestion = self.suggestion_history.add_suggestion(player.player_id, suspect, weapon, room)
+        suggestion = self.suggestion_history.add_suggestion(player.player_id, suspect, weapon, room,
+                                                            turn=self.turn_counter)
 
         # Check if any player can disprove the suggestion
+        cards = suggestion.cards_mask
         for i in range(len(self.players)):
             # Start with the player to the left
             idx = (self.current_player_idx + i + 1) % len(self.players)
             other_player = self.players[idx]
 
             if other_player.player_id != player.player_id and not other_player.eliminated:
-                revealed_card = other_player.reveal_if_matches([suspect, weapon, room])
-                if revealed_card:
+                revealed = other_player.reveal_mask(cards)
+                if revealed is not None:
+                    revealed_card = CARD_NAMES[revealed]
                     # Update the player's deduction matrix
-                    self.logic_engines[player.player_id].set_holder(revealed_card, f"P{other_player.player_id}")
+                    self.logic_engines[player.player_id].set_holder_id(revealed, other_player.player_id)
+
+                    # Everyone learns that the refuter has one of the three cards
+                    self._publish("add_clause_mask", other_player.player_id, cards)
 
                     # Record the refutation in the suggestion history
                     suggestion.refute(other_player.player_id, revealed_card)
@@ -439,29 +460,19 @@ class ClueGame:
                     return other_player, revealed_card
                 else:
                     # Record that this player couldn't refute the suggestion
-                    # This is valuable information for deduction
-                    cards_in_suggestion = [suspect, weapon, room]
-                    for card in cards_in_suggestion:
-                        self.logic_engines[player.player_id].eliminate(card, f"P{other_player.player_id}")
-
-        # If no one could refute, this is valuable information
-        # All cards in the suggestion might be in the envelope
-        cards_in_suggestion = [suspect, weapon, room]
-        for card in cards_in_suggestion:
-            # Check if this card is already known to be with a player
-            if not any(self.logic_engines[player.player_id].poss[card][f"P{p.player_id}"] 
-                      for p in self.players if p.player_id != player.player_id and not p.eliminated):
-                # If not, it might be in the envelope
-                # We don't set it definitively because one of the cards might be in the suggester's hand
-                pass
+                    # This is valuable information for deduction (and public, so every player learns it)
+                    suggestion.record_pass(other_player.player_id)
+                    self._publish("eliminate_ids", cards, other_player.player_id)
 
         return None, None
 
     def make_accusation(self, player, suspect, weapon, room):
         """Make an accusation and check if it's correct"""
-        if (suspect == self.solution["suspect"] and 
-            weapon == self.solution["weapon"] and 
-            room == self.solution["room"]):
+        correct = (suspect == self.solution["suspect"] and
+                   weapon == self.solution["weapon"] and
+                   room == self.solution["room"])
+        self.accusations.append((player.player_id, self.turn_counter, correct))
+        if correct:
             self.game_over = True
             self.winner = player
             return True
@@ -472,9 +483,24 @@ class ClueGame:
                 self.game_over = True
             return False
 
+    def state_hash(self):
+        """
+        64-bit Zobrist hash of the position: token cells, weapon rooms, the player
+        to move, who is eliminated and what each player's matrix knows. The parts
+        are kept up to date as the game changes, so this only combines them.
+        """
+        h = self.char_board.zobrist ^ TURN_KEYS[self.current_player_idx]
+        for weapon in self.weapon_dict.values():
+            h ^= weapon.zobrist
+        for player in self.players:
+            if player.eliminated:
+                h ^= ELIMINATED_KEYS[player.player_id]
+            h ^= self.logic_engines[player.player_id].zobrist
+        return h
+
     def display_board(self):
         """Display the current state of the board using ASCII characters"""
-        if not hasattr(self, 'enable_visualization') or not self.enable_visualization:
+        if not getattr(self, 'enable_visualization', False) or not self.log.enabled(INFO):
             return  # Skip visualization if disabled
 
         # Create a 2D grid to represent the board
@@ -483,17 +509,17 @@ class ClueGame:
         # Fill in the basic board layout
         for r in range(self.mansion_board.rows):
             for c in range(self.mansion_board.cols):
-                cell_type = self.mansion_board.get_cell_type(r, c)
+                cell_code = self.mansion_board.cell_code(r, c)
 
-                if cell_type == "out_of_bounds":
+                if cell_code == CELL_OUT_OF_BOUNDS:
                     board_display[r][c] = self.symbols['wall']
-                elif isinstance(cell_type, Room):
+                elif cell_code == CELL_ROOM:
                     # Room cells are represented by the first letter of the room name
-                    board_display[r][c] = cell_type.name[0]
-                elif cell_type and hasattr(cell_type, 'room_name'):
+                    board_display[r][c] = self.mansion_board.room_name_at(r, c)[0]
+                elif cell_code == CELL_ENTRANCE:
                     # Room entrance
                     board_display[r][c] = self.symbols['entrance']
-                elif cell_type == "bonus_card":
+                elif cell_code == CELL_BONUS:
                     board_display[r][c] = self.symbols['bonus']
                 else:
                     # Empty corridor
@@ -521,29 +547,28 @@ class ClueGame:
                     # Try to find a nearby empty room cell
                     for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
                         nr, nc = r + dr, c + dc
-                        if (0 <= nr < self.mansion_board.rows and 
-                            0 <= nc < self.mansion_board.cols and
-                            isinstance(self.mansion_board.get_cell_type(nr, nc), Room)):
+                        if self.mansion_board.cell_code(nr, nc) == CELL_ROOM:
                             board_display[nr][nc] = self.symbols['weapon'](weapon_name)
                             break
 
         # Print the board
-        print("\n=== MANSION BOARD ===")
+        self.log.info("\n=== MANSION BOARD ===")
         # Add column numbers at the top
-        print("   " + "".join(f"{c%10}" for c in range(self.mansion_board.cols)))
+        self.log.info("   %s", "".join(str(c % 10) for c in range(self.mansion_board.cols)))
         for r in range(self.mansion_board.rows):
             # Add row numbers at the left
-            print(f"{r:2d} " + "".join(board_display[r]))
-        print("===================")
+            self.log.info("%2d %s", r, "".join(board_display[r]))
+        self.log.info("===================")
 
         # Print legend
-        print("\nLegend:")
-        print(f"{self.symbols['wall']} = Wall, {self.symbols['empty']} = Corridor, {self.symbols['entrance']} = Room Entrance, {self.symbols['bonus']} = Bonus Card")
-        print("UPPERCASE = Character, lowercase = Weapon, Letters = Rooms")
+        self.log.info("\nLegend:")
+        self.log.info("%s = Wall, %s = Corridor, %s = Room Entrance, %s = Bonus Card",
+                      self.symbols['wall'], self.symbols['empty'], self.symbols['entrance'], self.symbols['bonus'])
+        self.log.info("UPPERCASE = Character, lowercase = Weapon, Letters = Rooms")
 
         # Print character and weapon positions
-        print("\nCharacters:")
-        for name, char in character_dict.items():
+        self.log.info("\nCharacters:")
+        for name, char in self.character_dict.items():
             if char.position:
                 # Only show characters that have left the center area
                 is_in_center = (char.position[0] == self.centre_row or char.position[0] == self.centre_row - 1 or 
@@ -551,17 +576,17 @@ class ClueGame:
                                char.position[1] == self.centre_col or char.position[1] == self.centre_col - 1 or 
                                char.position[1] == self.centre_col + 1)
                 if not is_in_center:
-                    print(f"{name} ({self.symbols['character'](name)}) at {char.position}")
+                    self.log.info("%s (%s) at %s", name, self.symbols['character'](name), char.position)
                 else:
-                    print(f"{name} is waiting to start")
+                    self.log.info("%s is waiting to start", name)
 
-        print("\nWeapons:")
+        self.log.info("\nWeapons:")
         for name, weapon in self.weapon_dict.items():
             # Only show weapons that have been moved to a room other than "Clue" (the center)
             if weapon.location != "Clue":
-                print(f"{name} ({self.symbols['weapon'](name)}) in {weapon.location}")
+                self.log.info("%s (%s) in %s", name, self.symbols['weapon'](name), weapon.location)
             else:
-                print(f"{name} is waiting to be used")
+                self.log.info("%s is waiting to be used", name)
 
         # Also generate an image representation
         self.generate_board_image_sequence()
@@ -570,17 +595,18 @@ class ClueGame:
         """Generate a sequence of board images to show the game progression"""
         # Only generate images if visualization is enabled
         if self.enable_visualization:
-            # Call the visualization module's function
+            # Imported here so headless runs never load matplotlib
+            import visualization
             self.board_image_counter = visualization.generate_board_image_sequence(self, self.board_image_counter)
 
     def display_suggestion_history(self):
         """Display the history of suggestions made during the game."""
-        print(self.suggestion_history)
+        self.log.info("%s", self.suggestion_history)
 
     def display_player_hand(self, player):
         """Display the cards in a player's hand."""
         if not player.hand:
-            print("No cards in hand.")
+            self.log.info("No cards in hand.")
             return
 
         # Group cards by type
@@ -590,16 +616,16 @@ class ClueGame:
 
         # Display cards by type
         if suspects:
-            print("Suspects:", ", ".join(suspects))
+            self.log.info("Suspects: %s", ", ".join(suspects))
         if weapons:
-            print("Weapons:", ", ".join(weapons))
+            self.log.info("Weapons: %s", ", ".join(weapons))
         if rooms:
-            print("Rooms:", ", ".join(rooms))
+            self.log.info("Rooms: %s", ", ".join(rooms))
 
     def display_deduction_matrix(self, player):
         """Display a player's deduction matrix."""
         matrix = self.logic_engines[player.player_id]
-        DeductionViewer.display_matrix(matrix, player.player_id)
+        DeductionViewer.display_matrix(matrix, player.player_id, write=self.log.info)
 
     def next_turn(self):
         """Advance to the next player's turn"""
@@ -610,7 +636,7 @@ class ClueGame:
 
     def play_turn(self, player):
         """Play a turn for a player"""
-        print(f"\n{player.character.name}'s turn")
+        self.log.info("\n%s's turn", player.character.name)
 
         # Display the current board state
         self.display_board()
@@ -623,7 +649,7 @@ class ClueGame:
         if isinstance(cell_type, Room):
             current_room = cell_type
             room_name = current_room.name
-            print(f"You are in the {room_name}")
+            self.log.info("You are in the %s", room_name)
 
             # If the room has a secret passage, offer to use it
             if current_room.secret_passage_to:
@@ -634,27 +660,27 @@ class ClueGame:
                     if dest_room.room_entrance_list:
                         new_pos = (dest_room.room_entrance_list[0].row, dest_room.room_entrance_list[0].column)
                         self.move_player(player, new_pos)
-                        print(f"Moved to {current_room.secret_passage_to} via secret passage")
+                        self.log.info("Moved to %s via secret passage", current_room.secret_passage_to)
                         current_room = dest_room
                         room_name = current_room.name
                     else:
-                        print(f"Could not use secret passage (no entrances found in {current_room.secret_passage_to})")
+                        self.log.info("Could not use secret passage (no entrances found in %s)", current_room.secret_passage_to)
 
             # Ask if the player wants to stay in the room or roll and move
             stay_in_room = input("Stay in this room? (y/n): ").lower() == 'y'
             if stay_in_room:
                 # Skip the movement phase
-                print(f"Staying in the {room_name}")
+                self.log.info("Staying in the %s", room_name)
 
                 # Offer to view deduction information
                 view_deductions = input("View deduction information? (y/n): ").lower() == 'y'
                 if view_deductions:
                     # Show options for what to view
-                    print("\nDeduction Options:")
-                    print("1. View suggestion history")
-                    print("2. View your deduction matrix")
-                    print("3. View your cards in hand")
-                    print("4. Back to game")
+                    self.log.info("\nDeduction Options:")
+                    self.log.info("1. View suggestion history")
+                    self.log.info("2. View your deduction matrix")
+                    self.log.info("3. View your cards in hand")
+                    self.log.info("4. Back to game")
 
                     choice = input("Choose an option (1-4): ")
                     if choice == "1":
@@ -667,15 +693,15 @@ class ClueGame:
                 # Ask if the player wants to make a suggestion
                 # Only allow suggestions in main rooms, not the Clue room
                 if room_name == "Clue":
-                    print("You cannot make a suggestion in the Clue room.")
+                    self.log.info("You cannot make a suggestion in the Clue room.")
                     make_suggestion = False
                 else:
                     make_suggestion = input("Make a suggestion? (y/n): ").lower() == 'y'
                 if make_suggestion:
                     # Get the suggestion details
-                    print("Suspects:", SUSPECTS)
+                    self.log.info("Suspects: %s", SUSPECTS)
                     suspect = input("Choose a suspect: ")
-                    print("Weapons:", WEAPONS)
+                    self.log.info("Weapons: %s", WEAPONS)
                     weapon = input("Choose a weapon: ")
 
                     # Make the suggestion
@@ -685,9 +711,9 @@ class ClueGame:
                     self.display_board()
 
                     if responder:
-                        print(f"{responder.character.name} showed you {card}")
+                        self.log.info("%s showed you %s", responder.character.name, card)
                     else:
-                        print("No one could disprove your suggestion!")
+                        self.log.info("No one could disprove your suggestion!")
 
                     # Set flag to force player to exit room next turn
                     player.must_exit_next_turn = True
@@ -696,13 +722,13 @@ class ClueGame:
                 if player.bonus_cards:
                     use_bonus = input("Use a bonus card? (y/n): ").lower() == 'y'
                     if use_bonus:
-                        print("Your bonus cards:")
+                        self.log.info("Your bonus cards:")
                         for i, card in enumerate(player.bonus_cards):
-                            print(f"{i+1}. {card}")
+                            self.log.info("%s. %s", i + 1, card)
 
                         card_idx = int(input("Choose a card to use (number): ")) - 1
                         result = player.use_bonus_card(card_idx, self)
-                        print(result)
+                        self.log.info("%s", result)
 
                 # Skip to accusation phase
                 self.handle_accusation(player)
@@ -710,14 +736,14 @@ class ClueGame:
                 # End the turn
                 if player.extra_turn:
                     player.extra_turn = False
-                    print(f"{player.character.name} gets an extra turn!")
+                    self.log.info("%s gets an extra turn!", player.character.name)
                 else:
                     self.next_turn()
                 return
 
         # Normal turn with dice roll
         steps = self.roll_dice()
-        print(f"Rolled a {steps}")
+        self.log.info("Rolled a %s", steps)
 
         # Get valid moves
         valid_moves = self.get_valid_moves(player, steps)
@@ -725,7 +751,7 @@ class ClueGame:
         # Ask player if they want to see the list of valid moves
         show_moves = input("Show list of valid moves? (y/n): ").lower() == 'y'
         if show_moves:
-            print("Valid moves:")
+            self.log.info("Valid moves:")
             for i, move in enumerate(valid_moves):
                 # Check if this move leads into a room
                 cell_type = self.mansion_board.get_cell_type(move[0], move[1])
@@ -734,9 +760,9 @@ class ClueGame:
                 # Highlight room entrances
                 if is_room_entrance:
                     room_name = cell_type.room_name
-                    print(f"{i+1}. {move} [ROOM ENTRANCE: {room_name}]")
+                    self.log.info("%s. %s [ROOM ENTRANCE: %s]", i + 1, move, room_name)
                 else:
-                    print(f"{i+1}. {move}")
+                    self.log.info("%s. %s", i + 1, move)
 
         # Ask player if they want to enter coordinates or choose from the list
         choice_method = input("Enter coordinates directly (c) or choose from list (l)? ").lower()
@@ -765,9 +791,9 @@ class ClueGame:
                                 new_position = (row, col)
                                 break
 
-                        print(f"Invalid move. Coordinates ({row}, {col}) are not in the list of valid moves.")
+                        self.log.info("Invalid move. Coordinates (%s, %s) are not in the list of valid moves.", row, col)
                 except ValueError:
-                    print("Invalid input. Please enter coordinates as 'row,col'.")
+                    self.log.info("Invalid input. Please enter coordinates as 'row,col'.")
         else:
             # Get player's choice from the list
             while True:
@@ -777,29 +803,29 @@ class ClueGame:
                         new_position = valid_moves[choice]
                         break
                     else:
-                        print(f"Invalid choice. Please enter a number between 1 and {len(valid_moves)}.")
+                        self.log.info("Invalid choice. Please enter a number between 1 and %s.", len(valid_moves))
                 except ValueError:
-                    print("Invalid input. Please enter a number.")
+                    self.log.info("Invalid input. Please enter a number.")
 
         # Move the player
         self.move_player(player, new_position)
-        print(f"Moved to {new_position}")
+        self.log.info("Moved to %s", new_position)
 
         # Update the board display after movement
         self.display_board()
 
         # Check if the player landed on a bonus card space
         if self.mansion_board.is_bonus_card_space(new_position[0], new_position[1]):
-            print("You landed on a bonus card space!")
+            self.log.info("You landed on a bonus card space!")
             draw_card = input("Draw a bonus card? (y/n): ").lower() == 'y'
             if draw_card:
-                bonus_card = BonusCard()
-                print(f"You drew: {bonus_card}")
+                bonus_card = BonusCard(rng=self.rng)
+                self.log.info("You drew: %s", bonus_card)
 
                 if bonus_card.immediate:
                     # Play the card immediately
                     result = bonus_card.play(self, player)
-                    print(result)
+                    self.log.info("%s", result)
 
                     if bonus_card.card_type == "Extra Turn":
                         player.extra_turn = True
@@ -823,17 +849,17 @@ class ClueGame:
 
         # If the player is in a room or on a room entrance
         if current_room:
-            print(f"You are in the {room_name}")
+            self.log.info("You are in the %s", room_name)
 
             # Offer to view deduction information
             view_deductions = input("View deduction information? (y/n): ").lower() == 'y'
             if view_deductions:
                 # Show options for what to view
-                print("\nDeduction Options:")
-                print("1. View suggestion history")
-                print("2. View your deduction matrix")
-                print("3. View your cards in hand")
-                print("4. Back to game")
+                self.log.info("\nDeduction Options:")
+                self.log.info("1. View suggestion history")
+                self.log.info("2. View your deduction matrix")
+                self.log.info("3. View your cards in hand")
+                self.log.info("4. Back to game")
 
                 choice = input("Choose an option (1-4): ")
                 if choice == "1":
@@ -849,12 +875,12 @@ class ClueGame:
                 # Get the suggestion details
                 show_suspects = input("Show suspects list? (y/n): ").lower() == 'y'
                 if show_suspects:
-                    print("Suspects:", SUSPECTS)
+                    self.log.info("Suspects: %s", SUSPECTS)
                 suspect = input("Choose a suspect: ")
 
                 show_weapons = input("Show weapons list? (y/n): ").lower() == 'y'
                 if show_weapons:
-                    print("Weapons:", WEAPONS)
+                    self.log.info("Weapons: %s", WEAPONS)
                 weapon = input("Choose a weapon: ")
 
                 # Make the suggestion
@@ -864,9 +890,9 @@ class ClueGame:
                 self.display_board()
 
                 if responder:
-                    print(f"{responder.character.name} showed you {card}")
+                    self.log.info("%s showed you %s", responder.character.name, card)
                 else:
-                    print("No one could disprove your suggestion!")
+                    self.log.info("No one could disprove your suggestion!")
 
                 # Set flag to force player to exit room next turn
                 player.must_exit_next_turn = True
@@ -877,7 +903,7 @@ class ClueGame:
         # End the turn
         if player.extra_turn:
             player.extra_turn = False
-            print(f"{player.character.name} gets an extra turn!")
+            self.log.info("%s gets an extra turn!", player.character.name)
         else:
             self.next_turn()
 
@@ -887,11 +913,11 @@ class ClueGame:
         view_deductions = input("View deduction information before deciding on accusation? (y/n): ").lower() == 'y'
         if view_deductions:
             # Show options for what to view
-            print("\nDeduction Options:")
-            print("1. View suggestion history")
-            print("2. View your deduction matrix")
-            print("3. View your cards in hand")
-            print("4. Back to game")
+            self.log.info("\nDeduction Options:")
+            self.log.info("1. View suggestion history")
+            self.log.info("2. View your deduction matrix")
+            self.log.info("3. View your cards in hand")
+            self.log.info("4. Back to game")
 
             choice = input("Choose an option (1-4): ")
             if choice == "1":
@@ -914,41 +940,41 @@ class ClueGame:
                 if move_to_center:
                     # Move to center
                     self.move_player(player, (self.centre_row, self.centre_col))
-                    print(f"Moved to center at {self.centre_row}, {self.centre_col}")
+                    self.log.info("Moved to center at %s, %s", self.centre_row, self.centre_col)
 
                     # Update the board display after moving to center
                     self.display_board()
                 else:
-                    print("Accusation cancelled.")
+                    self.log.info("Accusation cancelled.")
                     return
 
             # Get the accusation details
             show_suspects = input("Show suspects list? (y/n): ").lower() == 'y'
             if show_suspects:
-                print("Suspects:", SUSPECTS)
+                self.log.info("Suspects: %s", SUSPECTS)
             suspect = input("Choose a suspect: ")
 
             show_weapons = input("Show weapons list? (y/n): ").lower() == 'y'
             if show_weapons:
-                print("Weapons:", WEAPONS)
+                self.log.info("Weapons: %s", WEAPONS)
             weapon = input("Choose a weapon: ")
 
             show_rooms = input("Show rooms list? (y/n): ").lower() == 'y'
             if show_rooms:
-                print("Rooms:", ROOMS)
+                self.log.info("Rooms: %s", ROOMS)
             room = input("Choose a room: ")
 
             # Make the accusation
             correct = self.make_accusation(player, suspect, weapon, room)
             if correct:
-                print("Correct! You win!")
+                self.log.info("Correct! You win!")
             else:
-                print("Wrong! You are eliminated from making accusations.")
+                self.log.info("Wrong! You are eliminated from making accusations.")
 
     def play_ai_turn(self, player):
         """Play a turn for an AI player"""
         if self.enable_visualization:
-            print(f"\n{player.character.name}'s turn (AI)")
+            self.log.info("\n%s's turn (AI)", player.character.name)
             self.display_board()  # Only display if visualization is enabled
 
         # Log the game state if enabled
@@ -964,7 +990,11 @@ class ClueGame:
             current_room = cell_type
             room_name = current_room.name
             if self.enable_visualization:
-                print(f"AI is in the {room_name}")
+                self.log.info("AI is in the %s", room_name)
+
+            # An AI that has just made a suggestion picks its next room from here
+            if player.target_room is None and hasattr(player, "choose_target_room"):
+                player.target_room = player.choose_target_room(self)
 
             # If the room has a secret passage, decide whether to use it
             if current_room.secret_passage_to:
@@ -977,30 +1007,30 @@ class ClueGame:
                         new_pos = (dest_room.room_entrance_list[0].row, dest_room.room_entrance_list[0].column)
                         self.move_player(player, new_pos)
                         if self.enable_visualization:
-                            print(f"AI moved to {current_room.secret_passage_to} via secret passage")
+                            self.log.info("AI moved to %s via secret passage", current_room.secret_passage_to)
                         current_room = dest_room
                         room_name = current_room.name
                     elif self.enable_visualization:
-                        print(f"Could not use secret passage (no entrances found in {current_room.secret_passage_to})")
+                        self.log.info("Could not use secret passage (no entrances found in %s)", current_room.secret_passage_to)
 
             # AI logic: Decide whether to stay in the room or roll and move
             # Stay if we want to make a suggestion in this room and it's not the Clue room
-            stay_in_room = room_name != "Clue" and (player.target_room is None or room_name == player.target_room)
+            stay_in_room = room_name != "Clue" and room_name == player.target_room
             if stay_in_room:
                 # Skip the movement phase
                 if self.enable_visualization:
-                    print(f"AI staying in the {room_name}")
+                    self.log.info("AI staying in the %s", room_name)
 
                 # AI logic: Make a suggestion in this room
                 # Double-check that we're not in the Clue room
                 if room_name == "Clue":
                     if self.enable_visualization:
-                        print("AI cannot make a suggestion in the Clue room.")
+                        self.log.info("AI cannot make a suggestion in the Clue room.")
                     responder, card = None, None
                 else:
                     suspect, weapon, room = player.choose_suggestion(room_name, self)
                     if self.enable_visualization:
-                        print(f"AI suggests: {suspect} with {weapon} in {room_name}")
+                        self.log.info("AI suggests: %s with %s in %s", suspect, weapon, room_name)
 
                     # Make the suggestion
                     responder, card = self.make_suggestion(player, suspect, weapon, room_name)
@@ -1019,9 +1049,9 @@ class ClueGame:
 
                     if self.enable_visualization:
                         if responder:
-                            print(f"{responder.character.name} showed {card}")
+                            self.log.info("%s showed %s", responder.character.name, card)
                         else:
-                            print("No one could disprove the suggestion!")
+                            self.log.info("No one could disprove the suggestion!")
 
                 # Set flag to force player to exit room next turn
                 player.must_exit_next_turn = True
@@ -1033,7 +1063,7 @@ class ClueGame:
                 if player.extra_turn:
                     player.extra_turn = False
                     if self.enable_visualization:
-                        print(f"{player.character.name} gets an extra turn!")
+                        self.log.info("%s gets an extra turn!", player.character.name)
                 else:
                     self.next_turn()
                 return
@@ -1041,7 +1071,7 @@ class ClueGame:
         # Normal turn with dice roll
         steps = self.roll_dice()
         if self.enable_visualization:
-            print(f"AI rolled a {steps}")
+            self.log.info("AI rolled a %s", steps)
 
         # Get valid moves
         valid_moves = self.get_valid_moves(player, steps)
@@ -1052,7 +1082,7 @@ class ClueGame:
             # Move the player
             self.move_player(player, new_position)
             if self.enable_visualization:
-                print(f"AI moved to {new_position}")
+                self.log.info("AI moved to %s", new_position)
 
             # Log the move if enabled
             if self.log_to_csv:
@@ -1063,17 +1093,17 @@ class ClueGame:
 
             # Check if the player landed on a bonus card space
             if self.mansion_board.is_bonus_card_space(new_position[0], new_position[1]) and self.enable_visualization:
-                print("AI landed on a bonus card space!")
+                self.log.info("AI landed on a bonus card space!")
                 # AI logic: Always draw a bonus card
-                bonus_card = BonusCard()
+                bonus_card = BonusCard(rng=self.rng)
                 if self.enable_visualization:
-                    print(f"AI drew: {bonus_card}")
+                    self.log.info("AI drew: %s", bonus_card)
 
                 if bonus_card.immediate:
                     # Play the card immediately
                     result = bonus_card.play(self, player)
                     if self.enable_visualization:
-                        print(result)
+                        self.log.info(result)
 
                     if bonus_card.card_type == "Extra Turn":
                         player.extra_turn = True
@@ -1098,12 +1128,12 @@ class ClueGame:
             # If the player is in a room or on a room entrance (and it's not the Clue room)
             if current_room and room_name != "Clue":
                 if self.enable_visualization:
-                    print(f"AI is in the {room_name}")
+                    self.log.info("AI is in the %s", room_name)
 
                 # AI logic: Make a suggestion in this room
                 suspect, weapon, room = player.choose_suggestion(room_name, self)
                 if self.enable_visualization:
-                    print(f"AI suggests: {suspect} with {weapon} in {room_name}")
+                    self.log.info("AI suggests: %s with %s in %s", suspect, weapon, room_name)
 
                 # Make the suggestion
                 responder, card = self.make_suggestion(player, suspect, weapon, room_name)
@@ -1122,9 +1152,9 @@ class ClueGame:
 
                 if self.enable_visualization:
                     if responder:
-                        print(f"{responder.character.name} showed {card}")
+                        self.log.info("%s showed %s", responder.character.name, card)
                     else:
-                        print("No one could disprove the suggestion!")
+                        self.log.info("No one could disprove the suggestion!")
 
                 # Set flag to force player to exit room next turn
                 player.must_exit_next_turn = True
@@ -1136,7 +1166,7 @@ class ClueGame:
         if player.extra_turn:
             player.extra_turn = False
             if self.enable_visualization:
-                print(f"{player.character.name} gets an extra turn!")
+                self.log.info("%s gets an extra turn!", player.character.name)
         else:
             self.next_turn()
 
@@ -1150,18 +1180,23 @@ class ClueGame:
                            player.character.position[1] == self.centre_col)
 
             if not is_in_center:
-                # Move to center
-                self.move_player(player, (self.centre_row, self.centre_col))
-                if self.enable_visualization:
-                    print(f"AI moved to center at {self.centre_row}, {self.centre_col}")
+                # Move to center, or to a free Clue cell when an earlier
+                # (eliminated) accuser still stands there
+                target = (self.centre_row, self.centre_col)
+                if self.char_board.get_cell_content(*target) is not None:
+                    target = self.char_board.free_room_cell("Clue")
+                if target is not None:
+                    self.move_player(player, target)
+                    if self.enable_visualization:
+                        self.log.info("AI moved to center at %s, %s", *target)
 
-                # Update the board display after moving to center
-                self.display_board()
+                    # Update the board display after moving to center
+                    self.display_board()
 
             # AI logic: Choose an accusation
             suspect, weapon, room = player.choose_accusation(self)
             if self.enable_visualization:
-                print(f"AI accuses: {suspect} with {weapon} in {room}")
+                self.log.info("AI accuses: %s with %s in %s", suspect, weapon, room)
 
             # Make the accusation
             correct = self.make_accusation(player, suspect, weapon, room)
@@ -1176,9 +1211,9 @@ class ClueGame:
 
             if self.enable_visualization:
                 if correct:
-                    print("Correct! AI wins!")
+                    self.log.info("Correct! AI wins!")
                 else:
-                    print("Wrong! AI is eliminated from making accusations.")
+                    self.log.info("Wrong! AI is eliminated from making accusations.")
 
     def _log_game_state(self, player, action, target_room=None, suggestion_suspect=None, 
                        suggestion_weapon=None, suggestion_room=None, refuted_by=None, card_shown=None):
@@ -1227,14 +1262,14 @@ class ClueGame:
     def run(self, max_turns=None):
         """Play the game until it's over or max_turns is reached"""
         if self.enable_visualization:
-            print("\nStarting the game!")
+            self.log.info("\nStarting the game!")
             # Display the initial board state
             self.display_board()
 
         self.turn_counter = 0
         while not self.game_over:
             if max_turns is not None and self.turn_counter >= max_turns:
-                print(f"\nReached maximum turns ({max_turns}). Ending game.")
+                self.log.info("\nReached maximum turns (%s). Ending game.", max_turns)
                 break
 
             current_player = self.players[self.current_player_idx]
@@ -1261,12 +1296,12 @@ class ClueGame:
             self.turn_counter += 1
 
         if self.winner:
-            print(f"\nGame over! {self.winner.character.name} wins!")
+            self.log.info("\nGame over! %s wins!", self.winner.character.name)
         else:
-            print("\nGame over! All players eliminated. The solution was:")
-            print(f"Suspect: {self.solution['suspect']}")
-            print(f"Weapon: {self.solution['weapon']}")
-            print(f"Room: {self.solution['room']}")
+            self.log.info("\nGame over! All players eliminated. The solution was:")
+            self.log.info("Suspect: %s", self.solution['suspect'])
+            self.log.info("Weapon: %s", self.solution['weapon'])
+            self.log.info("Room: %s", self.solution['room'])
 
     def play_game(self):
         """Play the game until it's over (wrapper for run method)"""
@@ -1292,10 +1327,7 @@ class ClueGame:
         self.players = new_players
 
         # Rebuild the logic engines for the new players
-        self.logic_engines = {
-            p.player_id: PossibilityMatrix(len(self.players), p.player_id, p.hand)
-            for p in self.players
-        }
+        self._build_logic_engines()
 
         # Update use_ai_players flag based on the player class
         from AIPlayer import AIPlayer
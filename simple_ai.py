@@ -1,5 +1,7 @@
 from Player     import Player
 from Constants  import SUSPECTS, WEAPONS, ROOMS
+from CardRegistry import (CARD_ID, CARD_NAMES, ALL_MASK, SUSPECT_MASK, WEAPON_MASK, ROOM_MASK,
+                          lowest_card)
 
 # clockwise ring of rooms
 RING = ["Study", "Hall", "Lounge",
@@ -21,9 +23,7 @@ class SimpleAIPlayer(Player):
     def __init__(self, player_id, character):
         super().__init__(player_id, character)
         self.ring_ptr = 0
-        self.unknown_suspects = set(SUSPECTS)
-        self.unknown_weapons  = set(WEAPONS)
-        self.unknown_rooms    = set(ROOMS)
+        self.unknown = ALL_MASK   # ids of cards not yet seen, as a bitmask
         self.visited_rooms = set()
         self.cycle_counter  = 0
         self.must_exit_next_turn = False
@@ -49,13 +49,15 @@ class SimpleAIPlayer(Player):
                 return doors[0]
 
         target_room = RING[self.ring_ptr]
-        entrances = game.mansion_board.room_dict[target_room].room_entrance_list
+        board = game.mansion_board
+        entrances = board.room_dict[target_room].room_entrance_list
         goals = {(e.row, e.column) for e in entrances}
 
-        # forbid immediate backtrack
+        # forbid immediate backtrack; shortest walk first, Manhattan breaks ties
         candidates = [m for m in valid_moves if m not in self._last_positions[-2:]] or valid_moves
         best = min(candidates,
-                   key=lambda m: min(abs(m[0]-r)+abs(m[1]-c) for r, c in goals))
+                   key=lambda m: (board.distance_to_room(m[0], m[1], target_room),
+                                  min(abs(m[0]-r)+abs(m[1]-c) for r, c in goals)))
 
         self._last_positions.append(best)
         if len(self._last_positions) > 3:
@@ -76,8 +78,9 @@ class SimpleAIPlayer(Player):
                 self.cycle_counter += 1
         self._advance_ring()
 
-        suspect = next(iter(self.unknown_suspects))
-        weapon  = next(iter(self.unknown_weapons))
+        # Every card of a category seen (e.g. by a bonus card): name any of them
+        suspect = self._first_unknown(SUSPECT_MASK) or SUSPECTS[0]
+        weapon  = self._first_unknown(WEAPON_MASK) or WEAPONS[0]
         self.must_exit_next_turn = True
         return suspect, weapon, room
 
@@ -86,8 +89,7 @@ class SimpleAIPlayer(Player):
         matrix = game.logic_engines[self.player_id]
         if matrix.envelope_complete():
             return True
-        if (len(self.unknown_suspects) == len(self.unknown_weapons) ==
-                len(self.unknown_rooms) == 1):
+        if all((self.unknown & mask).bit_count() == 1 for mask in (SUSPECT_MASK, WEAPON_MASK, ROOM_MASK)):
             return True
         return self.cycle_counter >= self.B
 
@@ -96,12 +98,15 @@ class SimpleAIPlayer(Player):
         forced = matrix.envelope_complete()
         if forced:
             return forced
-        return (next(iter(self.unknown_suspects)),
-                next(iter(self.unknown_weapons)),
-                next(iter(self.unknown_rooms)))
+        return (self._first_unknown(SUSPECT_MASK) or SUSPECTS[0],
+                self._first_unknown(WEAPON_MASK) or WEAPONS[0],
+                self._first_unknown(ROOM_MASK) or ROOMS[0])
+
+    def _first_unknown(self, category_mask):
+        """Name of the lowest-id unseen card in a category, or None if all have been seen."""
+        unseen = self.unknown & category_mask
+        return CARD_NAMES[lowest_card(unseen)] if unseen else None
 
     # ---------- callback for a card you see ----------
     def observe_card(self, card):
-        self.unknown_suspects.discard(card)
-        self.unknown_weapons .discard(card)
-        self.unknown_rooms   .discard(card)
+        self.unknown &= ~(1 << CARD_ID[card])
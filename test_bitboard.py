@@ -0,0 +1,84 @@
+import contextlib
+import io
+import unittest
+from Bitboard import cell_bit
+from game import ClueGame
+from test_movement_engine import reference_walk, reference_flood
+
+
+class TestBitboard(unittest.TestCase):
+    def setUp(self):
+        self.game = ClueGame(num_players=3, enable_visualization=False)
+        self.fast = ClueGame(num_players=3, enable_visualization=False, movement_backend="bitboard")
+        self.board = self.game.mansion_board
+        self.bitboard = self.board.bitboard
+
+    def occupied_from_grid(self, char_board):
+        bits = 0
+        for r in range(self.board.rows):
+            for c in range(self.board.cols):
+                if char_board.get_cell_content(r, c) is not None:
+                    bits |= 1 << cell_bit(r, c, self.board.cols)
+        return bits
+
+    def test_masks_match_cell_codes(self):
+        """Walkable / entrance bits agree with the cell queries"""
+        for r in range(self.board.rows):
+            for c in range(self.board.cols):
+                bit = self.bitboard.bit((r, c))
+                self.assertEqual(bool(self.bitboard.walkable & bit), self.board.is_passable(r, c))
+                self.assertEqual(bool(self.bitboard.entrances & bit),
+                                 self.board.entrance_at(r, c) is not None)
+
+    def test_occupied_bits_follow_moves(self):
+        """CharacterBoard keeps its occupancy bitboard in step with the grid"""
+        char_board = self.game.char_board
+        self.assertEqual(char_board.occupied_bits, self.occupied_from_grid(char_board))
+        name = self.game.players[0].character.name
+        for cell in [(0, 0), (5, 7), self.board.room_cells("Study")[0]]:
+            if self.board.is_passable(*cell) or self.board.room_name_at(*cell):
+                char_board.move(name, *cell)
+                self.assertEqual(char_board.occupied_bits, self.occupied_from_grid(char_board))
+
+    def test_parity_with_reference_bfs(self):
+        """Corridor and room-leaving moves reach the same cells as the old list-based BFS"""
+        corridors = [(r, c) for r in range(self.board.rows) for c in range(self.board.cols)
+                     if self.board.is_passable(r, c)]
+        tokens = set(corridors[::37])
+        for start in corridors:
+            blocked = tokens | {start}
+            for steps in range(1, 7):
+                self.assertEqual(self.bitboard.walk(start, steps, self.bitboard.from_cells(blocked)),
+                                 sorted(reference_walk(self.board, blocked, start, steps)),
+                                 f"start={start} steps={steps}")
+        occupied = self.bitboard.from_cells(tokens)
+        for room in self.board.room_dict.values():
+            sources = [(e.row, e.column) for e in room.room_entrance_list]
+            for steps in range(1, 7):
+                self.assertEqual(self.bitboard.flood(sources, steps, occupied),
+                                 sorted(reference_flood(self.board, tokens, sources, steps)),
+                                 f"room={room.name} steps={steps}")
+
+    def test_parity_with_adjacency_backend(self):
+        """Every start cell and every roll 1-6 gives the same game moves as the adjacency backend"""
+        player, fast_player = self.game.players[0], self.fast.players[0]
+        name = player.character.name
+        for r in range(self.board.rows):
+            for c in range(self.board.cols):
+                if self.game.char_board.get_cell_content(r, c) not in (None, name):
+                    continue
+                if not (self.board.is_passable(r, c) or self.board.room_name_at(r, c)):
+                    continue
+                for game, p in [(self.game, player), (self.fast, fast_player)]:
+                    game.char_board.move(name, r, c)
+                    p.character.move_to((r, c))
+                for steps in range(1, 7):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        expected = self.game.get_valid_moves(player, steps)
+                        actual = self.fast.get_valid_moves(fast_player, steps)
+                    self.assertEqual(sorted(actual), sorted(expected), f"start={(r, c)} steps={steps}")
+                    self.assertEqual(len(actual), len(set(actual)))
+
+
+if __name__ == "__main__":
+    unittest.main()
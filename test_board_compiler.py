@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+import unittest
+import pandas as pd
+from Board import MansionBoard
+from BoardCompiler import CELL_CORRIDOR, CELL_ROOM, CELL_ENTRANCE, CELL_BONUS, CELL_OUT_OF_BOUNDS
+from BoardCompiler import CompiledBoard, compile_layout, load_compiled, load_board, artifact_path
+from Room import Room, RoomEntrance
+
+
+def describe(cell_type):
+    """Reduce a get_cell_type() result to something comparable across boards."""
+    if isinstance(cell_type, Room):
+        return ("room", cell_type.name)
+    if isinstance(cell_type, RoomEntrance):
+        return ("entrance", cell_type.room_name, cell_type.row, cell_type.column)
+    return cell_type
+
+
+class TestBoardCompiler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_layout(self, rows):
+        path = os.path.join(self.tmp_dir, "layout.xlsx")
+        pd.DataFrame(rows).to_excel(path, header=False, index=False)
+        return path
+
+    def test_round_trip_bytes(self):
+        """Encoding and decoding an artifact preserves every table"""
+        compiled = compile_layout("mansion_board_layout.xlsx")
+        decoded = CompiledBoard.from_bytes(compiled.to_bytes())
+
+        self.assertEqual(decoded.source_hash, compiled.source_hash)
+        self.assertEqual((decoded.rows, decoded.cols), (compiled.rows, compiled.cols))
+        self.assertEqual(decoded.cell_codes, compiled.cell_codes)
+        self.assertEqual(decoded.cell_rooms, compiled.cell_rooms)
+        self.assertEqual(decoded.entrances, compiled.entrances)
+        self.assertEqual(decoded.bonus_spaces, compiled.bonus_spaces)
+        self.assertEqual(decoded.secret_passages, compiled.secret_passages)
+
+    def test_compiled_board_matches_excel_board(self):
+        """A board loaded from the artifact answers every cell query like the Excel board"""
+        excel_board = MansionBoard(pd.read_excel("mansion_board_layout.xlsx", header=None))
+        fast_board = load_board("mansion_board_layout.xlsx", cache_dir=self.cache_dir)
+
+        self.assertEqual((fast_board.rows, fast_board.cols), (excel_board.rows, excel_board.cols))
+        self.assertEqual(fast_board.bonus_card_spaces, excel_board.bonus_card_spaces)
+        for r in range(excel_board.rows):
+            for c in range(excel_board.cols):
+                self.assertEqual(describe(fast_board.get_cell_type(r, c)),
+                                 describe(excel_board.get_cell_type(r, c)))
+        for name, room in excel_board.room_dict.items():
+            self.assertEqual(fast_board.room_dict[name].secret_passage_to, room.secret_passage_to)
+
+    def test_artifact_rebuilt_when_source_changes(self):
+        """Editing the spreadsheet produces a new artifact instead of a stale board"""
+        path = self.write_layout([["Study", "Study_e", ""], ["", "", "?"]])
+        first = load_compiled(path, self.cache_dir)
+        self.assertTrue(os.path.exists(artifact_path(path, first.source_hash, self.cache_dir)))
+
+        path = self.write_layout([["Study", "Study_e", "?"], ["", "", ""]])
+        second = load_compiled(path, self.cache_dir)
+
+        self.assertNotEqual(first.source_hash, second.source_hash)
+        self.assertEqual(second.bonus_spaces, ((0, 2),))
+        self.assertEqual(load_board(path, self.cache_dir).bonus_card_spaces, [(0, 2)])
+
+
+class TestCellQueries(unittest.TestCase):
+    def setUp(self):
+        self.board = load_board()
+
+    def test_fast_queries_match_get_cell_type(self):
+        """cell_code / room_name_at / entrance_at agree with get_cell_type on every cell"""
+        board = self.board
+        self.assertEqual(board.cell_codes.dtype.name, "int8")
+        self.assertEqual(board.room_ids.shape, (board.rows, board.cols))
+
+        for r in range(board.rows):
+            for c in range(board.cols):
+                cell_type = board.get_cell_type(r, c)
+                code = board.cell_code(r, c)
+                self.assertEqual(code, board.cell_codes[r, c])
+
+                if isinstance(cell_type, Room):
+                    self.assertEqual(code, CELL_ROOM)
+                    self.assertEqual(board.room_name_at(r, c), cell_type.name)
+                elif isinstance(cell_type, RoomEntrance):
+                    self.assertEqual(code, CELL_ENTRANCE)
+                    self.assertIs(board.entrance_at(r, c), cell_type)
+                    self.assertEqual(board.room_name_at(r, c), cell_type.room_name)
+                elif cell_type == "bonus_card":
+                    self.assertEqual(code, CELL_BONUS)
+                else:
+                    self.assertIsNone(cell_type)
+                    self.assertEqual(code, CELL_CORRIDOR)
+                    self.assertEqual(board.room_ids[r, c], -1)
+                self.assertEqual(board.is_passable(r, c), code in (CELL_CORRIDOR, CELL_ENTRANCE))
+
+    def test_out_of_bounds(self):
+        """Queries off the board keep returning the sentinel values"""
+        self.assertEqual(self.board.get_cell_type(-1, 0), "out_of_bounds")
+        self.assertEqual(self.board.cell_code(self.board.rows, 0), CELL_OUT_OF_BOUNDS)
+        self.assertIsNone(self.board.entrance_at(0, self.board.cols))
+        self.assertIsNone(self.board.room_name_at(-1, -1))
+        self.assertFalse(self.board.is_passable(-1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
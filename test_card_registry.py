@@ -0,0 +1,64 @@
+import random
+import unittest
+from Constants import SUSPECTS, WEAPONS, ROOMS, ALL_CARDS
+from CardRegistry import (CARD_ID, CARD_NAMES, N_CARDS, CATEGORY_MASKS, ALL_MASK,
+                          card_mask, mask_cards, holder_name)
+from Character import Character
+from DeductionMatrix import PossibilityMatrix
+from Player import Player
+
+
+class TestCardRegistry(unittest.TestCase):
+    def test_ids_and_categories(self):
+        """Ids follow ALL_CARDS and each category is a disjoint bit range covering the deck"""
+        self.assertEqual(list(CARD_NAMES), ALL_CARDS)
+        self.assertEqual([CARD_ID[c] for c in ALL_CARDS], list(range(N_CARDS)))
+        for mask, cards in zip(CATEGORY_MASKS, (SUSPECTS, WEAPONS, ROOMS)):
+            self.assertEqual(mask_cards(mask), cards)
+        self.assertEqual(CATEGORY_MASKS[0] | CATEGORY_MASKS[1] | CATEGORY_MASKS[2], ALL_MASK)
+        self.assertEqual(card_mask([ROOMS[2], SUSPECTS[1]]), 1 << CARD_ID[SUSPECTS[1]] | 1 << CARD_ID[ROOMS[2]])
+        self.assertEqual((holder_name(1, 3), holder_name(3, 3)), ("P1", "ENVELOPE"))
+
+    def test_reveal_matches_scan(self):
+        """The mask intersection shows the same card as scanning the hand in suggestion order"""
+        rng = random.Random(0)
+        for _ in range(500):
+            player = Player(0, Character(SUSPECTS[0]))
+            for card in rng.sample(ALL_CARDS, 6):
+                player.add_card(card)
+            suggestion = [rng.choice(SUSPECTS), rng.choice(WEAPONS), rng.choice(ROOMS)]
+            expected = next((c for c in suggestion if c in player.hand), None)
+            self.assertEqual(player.reveal_if_matches(suggestion), expected)
+
+    def test_hand_mask_follows_hand(self):
+        """Assigning, adding to or editing a hand in place keeps its mask in step"""
+        player = Player(0, Character(SUSPECTS[0]))
+        player.hand = [WEAPONS[1], ROOMS[0]]
+        self.assertEqual(player.hand_mask, card_mask([WEAPONS[1], ROOMS[0]]))
+        player.add_card(SUSPECTS[5])
+        self.assertEqual(player.hand, [WEAPONS[1], ROOMS[0], SUSPECTS[5]])
+        self.assertEqual(player.reveal_if_matches([SUSPECTS[5], WEAPONS[1], ROOMS[3]]), SUSPECTS[5])
+        self.assertIsNone(player.reveal_if_matches([SUSPECTS[4], WEAPONS[4], ROOMS[4]]))
+
+        player.hand.append(SUSPECTS[4])
+        player.hand.remove(WEAPONS[1])
+        self.assertEqual(player.hand_mask, card_mask([ROOMS[0], SUSPECTS[5], SUSPECTS[4]]))
+        self.assertEqual(player.reveal_if_matches([SUSPECTS[4], WEAPONS[1], ROOMS[3]]), SUSPECTS[4])
+
+    def test_matrix_id_api_matches_names(self):
+        """Id-level updates deduce exactly what the name-based ones do"""
+        by_name = PossibilityMatrix(3, 0, SUSPECTS[:3] + WEAPONS[:3])
+        by_id = PossibilityMatrix(3, 0, SUSPECTS[:3] + WEAPONS[:3])
+        cards = [SUSPECTS[4], WEAPONS[4], ROOMS[4]]
+        for card in cards:
+            by_name.eliminate(card, "P1")
+        by_name.add_clause("P2", cards)
+        by_name.set_holder(ROOMS[0], "ENVELOPE")
+        by_id.eliminate_ids(card_mask(cards), 1)
+        by_id.add_clause_mask(2, card_mask(cards))
+        by_id.set_holder_id(CARD_ID[ROOMS[0]], 3)
+        self.assertEqual(by_id.rows, by_name.rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
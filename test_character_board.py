@@ -0,0 +1,79 @@
+import unittest
+from Board import CharacterBoard
+from BoardCompiler import get_shared_board
+from game import ClueGame
+
+
+class TestCharacterBoardRoomIndex(unittest.TestCase):
+    def setUp(self):
+        self.mansion = get_shared_board()
+        self.board = CharacterBoard(self.mansion.rows, self.mansion.cols, self.mansion)
+        self.study_cells = self.mansion.room_cells("Study")
+
+    def test_room_cells_are_row_major(self):
+        """Room cells come back in the same order a full-board scan would visit them"""
+        self.assertTrue(self.study_cells)
+        self.assertEqual(list(self.study_cells), sorted(self.study_cells))
+        for r, c in self.study_cells:
+            self.assertEqual(self.mansion.room_name_at(r, c), "Study")
+
+    def test_free_slot_tracks_place_and_move(self):
+        """Placing tokens consumes slots in order and moving out frees them again"""
+        first, second = self.study_cells[0], self.study_cells[1]
+        self.assertEqual(self.board.free_room_cell("Study"), first)
+
+        self.board.place("Miss Scarlet", *first)
+        self.assertEqual(self.board.free_room_cell("Study"), second)
+
+        self.board.place("Mrs White", *second)
+        self.board.move("Miss Scarlet", *self.corridor_cell())
+        self.assertEqual(self.board.free_room_cell("Study"), first)
+
+    def test_full_room(self):
+        """A room with every cell taken reports no free slot"""
+        for i, cell in enumerate(self.study_cells):
+            self.board.place(f"token{i}", *cell)
+        self.assertIsNone(self.board.free_room_cell("Study"))
+
+    def test_room_occupants(self):
+        """The occupant index follows tokens in and out of rooms, including entrances"""
+        entrance = self.mansion.room_dict["Study"].room_entrance_list[0]
+        self.board.place("Miss Scarlet", *self.study_cells[0])
+        self.board.place("Mrs White", entrance.row, entrance.column)
+        self.assertEqual(self.board.room_occupants("Study"), {"Miss Scarlet", "Mrs White"})
+
+        self.board.move("Miss Scarlet", *self.corridor_cell())
+        self.assertEqual(self.board.room_occupants("Study"), {"Mrs White"})
+        self.assertEqual(self.board.room_occupants("Hall"), set())
+
+    def test_move_into_occupied_cell_keeps_state(self):
+        """A rejected move leaves the board and indexes untouched"""
+        self.board.place("Miss Scarlet", *self.study_cells[0])
+        self.board.place("Mrs White", *self.study_cells[1])
+        with self.assertRaises(ValueError):
+            self.board.move("Miss Scarlet", *self.study_cells[1])
+        self.assertEqual(self.board.get_cell_content(*self.study_cells[0]), "Miss Scarlet")
+        self.assertEqual(self.board.free_room_cell("Study"), self.study_cells[2])
+
+    def corridor_cell(self):
+        for r in range(self.mansion.rows):
+            for c in range(self.mansion.cols):
+                if self.mansion.get_cell_type(r, c) is None and self.board.get_cell_content(r, c) is None:
+                    return r, c
+
+
+class TestRoomPlacement(unittest.TestCase):
+    def test_move_player_uses_first_free_room_cell(self):
+        """Entering a room puts the token on the first free room cell"""
+        game = ClueGame(num_players=3, enable_visualization=False)
+        player = game.players[0]
+        entrance = game.mansion_board.room_dict["Lounge"].room_entrance_list[0]
+
+        game.move_player(player, (entrance.row, entrance.column))
+
+        self.assertEqual(player.character.position, game.mansion_board.room_cells("Lounge")[0])
+        self.assertIn(player.character.name, game.char_board.room_occupants("Lounge"))
+
+
+if __name__ == "__main__":
+    unittest.main()
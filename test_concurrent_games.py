@@ -0,0 +1,46 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from BoardCompiler import get_shared_board
+from game import ClueGame
+from simple_ai import SimpleAIPlayer
+from Tournament import run_tournament
+
+N_GAMES = 64
+MAX_TURNS = 60
+
+
+def play(seed, barrier=None):
+    """Play one seeded game (all of them starting together when given a barrier) and summarise it."""
+    ai_class = SimpleAIPlayer if seed % 2 else None
+    game = ClueGame(num_players=3, use_ai_players=True, ai_class=ai_class, headless=True, seed=seed,
+                    mansion_board=get_shared_board())
+    if barrier is not None:
+        barrier.wait()
+    game.run(max_turns=MAX_TURNS)
+    positions = {name: char.position for name, char in game.character_dict.items()}
+    return (game.turn_counter, game.accusations, str(game.suggestion_history),
+            positions, dict(game.char_board.positions),
+            {name: weapon.location for name, weapon in game.weapon_dict.items()})
+
+
+class TestConcurrentGames(unittest.TestCase):
+    def test_threads_match_serial(self):
+        """64 games played at once on threads end exactly as when played one after another"""
+        serial = [play(seed) for seed in range(N_GAMES)]
+        barrier = threading.Barrier(N_GAMES)
+        with ThreadPoolExecutor(N_GAMES) as pool:
+            concurrent = list(pool.map(play, range(N_GAMES), [barrier] * N_GAMES))
+        for seed in range(N_GAMES):
+            self.assertEqual(concurrent[seed], serial[seed], f"game {seed} differs")
+
+    def test_thread_tournament(self):
+        """The thread-pool runner gives the same results as the serial one"""
+        seats = ["ai", "simple", "simple"]
+        serial = sorted(run_tournament(8, seats, workers=1, max_turns=MAX_TURNS))
+        threaded = sorted(run_tournament(8, seats, workers=4, max_turns=MAX_TURNS, threads=True))
+        self.assertEqual(threaded, serial)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import io
+import unittest
+import numpy as np
+from Constants import SUSPECTS, WEAPONS, ROOMS, ALL_CARDS
+from DeductionMatrix import PossibilityMatrix
+from EnvelopeInference import marginals, knowledge_key
+from DealSampler import sample_marginals, _sample_batch, BATCH_SIZE, MAX_BUDGET_FACTOR
+from test_deduction_matrix import play_suggestions
+from game import ClueGame
+from GameLog import GameLogger, WARNING
+
+
+class TestDealSampler(unittest.TestCase):
+    def test_close_to_exact_marginals(self):
+        """Sampled probabilities agree with exact counting within their confidence intervals"""
+        for n_players, seed, rounds in ((3, 13, 10), (4, 3, 8), (6, 11, 5)):
+            hands, history = play_suggestions(n_players, seed, rounds)
+            matrix = PossibilityMatrix(n_players, 1, hands[1])
+            matrix.absorb_history(history)
+            exact = marginals(matrix)
+            sampled = sample_marginals(matrix, n_samples=4000, rng=seed)
+            self.assertGreater(sampled.n_valid, 0)
+            misses = 0
+            for card in ALL_CARDS:
+                self.assertAlmostEqual(sampled.envelope[card], exact.envelope[card], delta=0.1)
+                low, high = sampled.interval(card)
+                misses += not low - 1e-9 <= exact.envelope[card] <= high + 1e-9
+            self.assertLessEqual(misses, 3, f"n={n_players} seed={seed}")
+
+    def test_rules_out_impossible_holders(self):
+        """Cards never land with a holder the matrix rules out, and clauses always hold"""
+        hands, history = play_suggestions(6, 0, rounds=20)
+        matrix = PossibilityMatrix(6, 1, hands[1])
+        matrix.absorb_history(history)
+        self.assertTrue(matrix.clauses)
+        sampled = sample_marginals(matrix, n_samples=2000, rng=0)
+        for card in ALL_CARDS:
+            for holder in matrix.holders:
+                if not matrix.poss[card][holder]:
+                    self.assertEqual(sampled.holder[card][holder], 0.0)
+        n_players, rows, clauses = knowledge_key(matrix)
+        deals, weights = _sample_batch(n_players, rows, clauses, 500, np.random.default_rng(0))
+        self.assertTrue((weights > 0).any())
+        for deal in deals[weights > 0]:
+            for h, mask in clauses:
+                self.assertTrue(any(deal[c] == h for c in range(len(ALL_CARDS)) if mask >> c & 1))
+
+    def test_contradictory_clause_is_reported(self):
+        """A clause none of whose cards is still possible is an error, not an empty sample"""
+        rows = [0b1111] * len(ALL_CARDS)
+        with self.assertRaises(ValueError):
+            _sample_batch(3, rows, [(1, 0)], 50, np.random.default_rng(0))
+
+    def test_ai_ignores_inconsistent_knowledge(self):
+        """An AI whose matrix contradicts itself logs it and falls back to no estimate"""
+        game = ClueGame(num_players=3, use_ai_players=True, headless=True, seed=0)
+        out = io.StringIO()
+        game.log = GameLogger(WARNING, stream=out)
+        player, matrix = game.players[0], game.logic_engines[0]
+        cards = [c for c in SUSPECTS + WEAPONS if c not in player.hand][:2] + [ROOMS[-1]]
+        matrix.add_clause(matrix.holders[1], cards)
+        for card in cards:
+            matrix.eliminate(card, matrix.holders[1])
+        self.assertIsNone(player._estimate(matrix, game))
+        self.assertIn("Inconsistent knowledge", out.getvalue())
+
+    def test_time_limit_stops_after_one_batch(self):
+        """An expired time limit still returns the first batch"""
+        sampled = sample_marginals(PossibilityMatrix(3, 0, SUSPECTS[:3] + ROOMS[:3]),
+                                   n_samples=10 * BATCH_SIZE, time_limit=0.0, rng=1)
+        self.assertEqual(sampled.n_drawn, BATCH_SIZE)
+
+    def test_solved_envelope_is_certain(self):
+        """A forced solution is the best solution with probability one"""
+        matrix = PossibilityMatrix(3, 0, SUSPECTS[2:5] + WEAPONS[3:6])
+        for card in (SUSPECTS[1], WEAPONS[2], ROOMS[3]):
+            matrix.set_holder(card, "ENVELOPE")
+        triple, p, low = sample_marginals(matrix, n_samples=500, rng=2).best_solution()
+        self.assertEqual(triple, (SUSPECTS[1], WEAPONS[2], ROOMS[3]))
+        self.assertAlmostEqual(p, 1.0)
+        self.assertAlmostEqual(low, 1.0)
+
+    def test_restrict_keeps_consistent_deals(self):
+        """Narrower knowledge keeps exactly the deals still consistent with it, weights renormalised"""
+        hands, history = play_suggestions(4, 5, rounds=12)
+        _, early = play_suggestions(4, 5, rounds=4)
+        before, after = PossibilityMatrix(4, 1, hands[1]), PossibilityMatrix(4, 1, hands[1])
+        before.absorb_history(early)
+        after.absorb_history(history)
+        sampled = sample_marginals(before, n_samples=2000, rng=5)
+        kept = sampled.restrict(after)
+        self.assertIsNotNone(kept)
+        self.assertIsNone(kept.restrict(before))
+        n_players, rows, clauses = knowledge_key(after)
+        consistent = [all(rows[c] >> h & 1 for c, h in enumerate(deal)) and
+                      all(any(deal[c] == h for c in range(len(ALL_CARDS)) if mask >> c & 1) for h, mask in clauses)
+                      for deal in sampled.deals.tolist()]
+        self.assertEqual(kept.n_valid, sum(consistent))
+        np.testing.assert_array_equal(kept.deals, sampled.deals[consistent])
+        self.assertAlmostEqual(kept.weights.sum(), 1.0)
+        masks = kept._hand_masks   # carried over from sampled: must match a recount
+        del kept._hand_masks
+        np.testing.assert_array_equal(kept._hand_masks, masks)
+
+    def test_starved_sample_draws_more(self):
+        """Too few consistent deals extend sampling, up to MAX_BUDGET_FACTOR times the budget"""
+        matrix = PossibilityMatrix(3, 0, SUSPECTS[:3] + ROOMS[:3])
+        self.assertEqual(sample_marginals(matrix, n_samples=100, rng=3).n_drawn, 100)
+        self.assertEqual(sample_marginals(matrix, n_samples=100, rng=3, min_valid=10 ** 6).n_drawn,
+                         MAX_BUDGET_FACTOR * 100)
+
+    def test_subsample_is_equally_weighted(self):
+        """Subsampling gives the requested number of equally weighted deals"""
+        hands, history = play_suggestions(3, 13, rounds=10)
+        matrix = PossibilityMatrix(3, 1, hands[1])
+        matrix.absorb_history(history)
+        sampled = sample_marginals(matrix, n_samples=2000, rng=13)
+        small = sampled.subsample(64)
+        self.assertEqual(small.deals.shape, (64, len(ALL_CARDS)))
+        np.testing.assert_allclose(small.weights, 1 / 64)
+        for card in ALL_CARDS:
+            self.assertAlmostEqual(small.envelope[card], sampled.envelope[card], delta=0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,360 @@
+import random
+import unittest
+from Constants import SUSPECTS, WEAPONS, ROOMS, ALL_CARDS
+from DeductionMatrix import PossibilityMatrix, DictPossibilityMatrix, PublicKnowledge
+from SuggestionHistory import SuggestionHistory
+from benchmark_deduction import make_script
+from CardRegistry import CARD_ID
+from game import ClueGame
+
+
+def snapshot(matrix):
+    return {card: {h: matrix.poss[card][h] for h in matrix.holders} for card in ALL_CARDS}
+
+
+class BaselineMatrix:
+    """The engine as it was before the bitset rewrite (only set_holder / eliminate, even hand split)."""
+    def __init__(self, n_players, my_id, my_hand):
+        self.holders = [f"P{i}" for i in range(n_players)] + ["ENVELOPE"]
+        self.me = f"P{my_id}"
+        self.poss = {card: {h: True for h in self.holders} for card in ALL_CARDS}
+        for card in ALL_CARDS:
+            if card in my_hand:
+                self.set_holder(card, self.me)
+            else:
+                self.eliminate(card, self.me)
+        self.propagate()
+
+    def set_holder(self, card, holder):
+        for h in self.holders:
+            self.poss[card][h] = (h == holder)
+        self.propagate()
+
+    def eliminate(self, card, holder):
+        if self.poss[card][holder]:
+            self.poss[card][holder] = False
+            self.propagate()
+
+    def card_owner(self, card):
+        owners = [h for h, ok in self.poss[card].items() if ok]
+        return owners[0] if len(owners) == 1 else None
+
+    def propagate(self):
+        changed = True
+        while changed:
+            changed = False
+            for card, row in self.poss.items():
+                owners = [h for h, ok in row.items() if ok]
+                if len(owners) == 1:
+                    for h in self.holders:
+                        if h != owners[0] and self.poss[card][h]:
+                            self.poss[card][h] = False
+                            changed = True
+            definite_cards = {h: [] for h in self.holders}
+            for card in ALL_CARDS:
+                holder = self.card_owner(card)
+                if holder:
+                    definite_cards[holder].append(card)
+            possible_cards = {h: [c for c in ALL_CARDS if self.poss[c][h]] for h in self.holders}
+            player_holders = [h for h in self.holders if h != "ENVELOPE"]
+            cards_per_player = (len(ALL_CARDS) - 3) // len(player_holders)
+            for holder in player_holders:
+                if holder != self.me:
+                    if len(possible_cards[holder]) == cards_per_player and len(definite_cards[holder]) > 0:
+                        for card in possible_cards[holder]:
+                            if card not in definite_cards[holder]:
+                                self.set_holder(card, holder)
+                                changed = True
+            for holder in player_holders:
+                if len(definite_cards[holder]) == cards_per_player:
+                    for card in ALL_CARDS:
+                        if card not in definite_cards[holder] and self.poss[card][holder]:
+                            self.poss[card][holder] = False
+                            changed = True
+
+    def envelope_complete(self):
+        suspect = next((c for c in SUSPECTS if self.card_owner(c) == "ENVELOPE"), None)
+        weapon = next((c for c in WEAPONS if self.card_owner(c) == "ENVELOPE"), None)
+        room = next((c for c in ROOMS if self.card_owner(c) == "ENVELOPE"), None)
+        if suspect and weapon and room:
+            return suspect, weapon, room
+        return None
+
+
+class TestBitsetPossibilityMatrix(unittest.TestCase):
+    def test_parity_with_baseline_engine(self):
+        """
+        Passes and shown cards lead to the same deductions as the engine before
+        the rewrite (whose even hand split is only right for 3 and 6 players)
+        """
+        for n_players in (3, 6):
+            for seed in range(25):
+                hand, observations = make_script(n_players, seed)
+                engines = [PossibilityMatrix(n_players, 0, hand), DictPossibilityMatrix(n_players, 0, hand),
+                           BaselineMatrix(n_players, 0, hand)]
+                for op, card, holder in observations:
+                    for matrix in engines:
+                        if op == "set":
+                            matrix.set_holder(card, holder)
+                        else:
+                            matrix.eliminate(card, holder)
+                    expected = snapshot(engines[-1])
+                    for matrix in engines[:-1]:
+                        self.assertEqual(snapshot(matrix), expected, f"n={n_players} seed={seed}")
+                        self.assertEqual(matrix.envelope_complete(), engines[-1].envelope_complete())
+
+    def test_parity_with_dict_engine(self):
+        """Every observation leads to the same deductions as the dict reference engine"""
+        for n_players in (3, 4, 5, 6):
+            for seed in range(25):
+                hand, observations = make_script(n_players, seed)
+                new = PossibilityMatrix(n_players, 0, hand)
+                old = DictPossibilityMatrix(n_players, 0, hand)
+                self.assertEqual(snapshot(new), snapshot(old))
+                for op, card, holder in observations:
+                    for matrix in (new, old):
+                        if op == "set":
+                            matrix.set_holder(card, holder)
+                        else:
+                            matrix.eliminate(card, holder)
+                    self.assertEqual(snapshot(new), snapshot(old), f"n={n_players} seed={seed}")
+                    self.assertEqual(new.envelope_complete(), old.envelope_complete())
+                    for card in ALL_CARDS:
+                        self.assertEqual(new.card_owner(card), old.card_owner(card))
+
+    def test_poss_view(self):
+        """poss behaves like the old read-only dict of dicts"""
+        matrix = PossibilityMatrix(3, 0, [SUSPECTS[0]])
+        self.assertEqual(list(matrix.poss), ALL_CARDS)
+        self.assertEqual(list(matrix.poss[SUSPECTS[0]]), ["P0", "P1", "P2", "ENVELOPE"])
+        self.assertEqual(dict(matrix.poss[SUSPECTS[0]]),
+                         {"P0": True, "P1": False, "P2": False, "ENVELOPE": False})
+        self.assertFalse(matrix.poss[WEAPONS[0]]["P0"])
+        self.assertTrue(matrix.poss[WEAPONS[0]]["ENVELOPE"])
+
+    def test_envelope_complete(self):
+        """The solution is reported once one card per category is forced"""
+        matrix = PossibilityMatrix(3, 0, [])
+        matrix.set_holder(SUSPECTS[2], "ENVELOPE")
+        matrix.set_holder(WEAPONS[1], "ENVELOPE")
+        self.assertIsNone(matrix.envelope_complete())
+        matrix.set_holder(ROOMS[4], "ENVELOPE")
+        self.assertEqual(matrix.envelope_complete(), (SUSPECTS[2], WEAPONS[1], ROOMS[4]))
+
+
+def play_suggestions(n_players, seed, rounds=40):
+    """Deal cards and make random suggestions, recording them in a SuggestionHistory."""
+    rng = random.Random(seed)
+    solution = [rng.choice(SUSPECTS), rng.choice(WEAPONS), rng.choice(ROOMS)]
+    deck = [c for c in ALL_CARDS if c not in solution]
+    rng.shuffle(deck)
+    hands = {i: deck[i::n_players] for i in range(n_players)}
+    history = SuggestionHistory()
+    for turn in range(rounds):
+        suggester = turn % n_players
+        cards = [rng.choice(SUSPECTS), rng.choice(WEAPONS), rng.choice(ROOMS)]
+        suggestion = history.add_suggestion(suggester, *cards)
+        for k in range(1, n_players):
+            other = (suggester + k) % n_players
+            matches = [c for c in cards if c in hands[other]]
+            if matches:
+                suggestion.refute(other, rng.choice(matches))
+                break
+            suggestion.record_pass(other)
+    return hands, history
+
+
+def naive_closure(matrix, clauses):
+    """Rescan every clause until none forces a card (the watched-literal reference)."""
+    changed = True
+    while changed:
+        changed = False
+        for holder, cards in clauses:
+            if any(matrix.card_owner(c) == holder for c in cards):
+                continue
+            live = [c for c in cards if matrix.poss[c][holder]]
+            if len(live) == 1:
+                matrix.set_holder(live[0], holder)
+                changed = True
+
+
+class TestClauses(unittest.TestCase):
+    def test_last_possible_card_is_forced(self):
+        """Once two of the three cards are ruled out, the refuter must hold the third"""
+        matrix = PossibilityMatrix(3, 0, [])
+        matrix.add_clause("P1", [SUSPECTS[0], WEAPONS[0], ROOMS[0]])
+        matrix.eliminate(SUSPECTS[0], "P1")
+        self.assertIsNone(matrix.card_owner(ROOMS[0]))
+        matrix.set_holder(WEAPONS[0], "P2")
+        self.assertEqual(matrix.card_owner(ROOMS[0]), "P1")
+
+    def test_satisfied_clause_teaches_nothing(self):
+        """A clause whose holder is already known to have one of the cards forces nothing"""
+        matrix = PossibilityMatrix(3, 0, [])
+        matrix.set_holder(SUSPECTS[0], "P1")
+        matrix.add_clause("P1", [SUSPECTS[0], WEAPONS[0], ROOMS[0]])
+        matrix.eliminate(WEAPONS[0], "P1")
+        self.assertIsNone(matrix.card_owner(ROOMS[0]))
+
+    def test_watched_literals_match_naive_rescan(self):
+        """Watched-literal propagation reaches the same state as rescanning all clauses"""
+        for n_players in (3, 6):
+            for seed in range(10):
+                hands, history = play_suggestions(n_players, seed)
+                watched = PossibilityMatrix(n_players, 0, hands[0])
+                naive = PossibilityMatrix(n_players, 0, hands[0])
+                clauses = []
+                for suggestion in history.get_all_suggestions():
+                    cards = [suggestion.suspect, suggestion.weapon, suggestion.room]
+                    for player_id in suggestion.passed_by:
+                        for card in cards:
+                            naive.eliminate(card, f"P{player_id}")
+                    if suggestion.refuted_by not in (None, 0):
+                        if suggestion.player_id == 0:
+                            naive.set_holder(suggestion.card_shown, f"P{suggestion.refuted_by}")
+                        else:
+                            clauses.append((f"P{suggestion.refuted_by}", cards))
+                    naive_closure(naive, clauses)
+                watched.absorb_history(history)
+                self.assertEqual(watched.rows, naive.rows, f"n={n_players} seed={seed}")
+
+    def test_dict_engine_parity(self):
+        """The dict reference engine deduces the same from a whole history"""
+        for n_players in (3, 6):
+            for seed in range(10):
+                hands, history = play_suggestions(n_players, seed)
+                new = PossibilityMatrix(n_players, 0, hands[0])
+                old = DictPossibilityMatrix(n_players, 0, hands[0])
+                new.absorb_history(history)
+                old.absorb_history(history)
+                self.assertEqual(snapshot(new), snapshot(old), f"n={n_players} seed={seed}")
+
+    def test_clauses_are_sound(self):
+        """Absorbing a whole history never rules out a card's real holder, for uneven hands too"""
+        for n_players in (3, 4, 5, 6):
+            for seed in range(10):
+                hands, history = play_suggestions(n_players, seed)
+                owner = {c: f"P{i}" for i, hand in hands.items() for c in hand}
+                for me in range(n_players):
+                    for engine in (PossibilityMatrix, DictPossibilityMatrix):
+                        matrix = engine(n_players, me, hands[me])
+                        matrix.absorb_history(history)
+                        for card in ALL_CARDS:
+                            self.assertTrue(matrix.poss[card][owner.get(card, "ENVELOPE")],
+                                            f"{engine.__name__} n={n_players} seed={seed} P{me} {card}")
+
+    def test_four_player_games_are_sound(self):
+        """In seeded 4-player games (hands of 5, 5, 4, 4) no matrix rules out a real holder"""
+        for seed in range(12):
+            game = ClueGame(num_players=4, use_ai_players=True, headless=True, seed=seed)
+            game.run(max_turns=60)
+            owner = {card: p.player_id for p in game.players for card in p.hand}
+            owner.update({card: 4 for card in game.solution.values()})
+            for matrix in [game.public_knowledge] + list(game.logic_engines.values()):
+                for card, holder in owner.items():
+                    self.assertTrue(matrix.rows[CARD_ID[card]] >> holder & 1,
+                                    f"seed={seed} P{matrix.my_index} {card}")
+
+
+class TestPublicKnowledge(unittest.TestCase):
+    def test_overlays_match_independent_matrices(self):
+        """Overlays on a shared public layer deduce exactly what separate full matrices do"""
+        # The even-split hand size is only exact for 3 and 6 players
+        for n_players in (3, 6):
+            for seed in range(10):
+                hands, history = play_suggestions(n_players, seed)
+                public = PublicKnowledge(n_players)
+                overlays = [PossibilityMatrix(n_players, i, hands[i], public=public) for i in range(n_players)]
+                for suggestion in history.get_all_suggestions():
+                    cards = [suggestion.suspect, suggestion.weapon, suggestion.room]
+                    for player_id in suggestion.passed_by:
+                        for card in cards:
+                            public.eliminate(card, f"P{player_id}")
+                    if suggestion.refuted_by is not None:
+                        refuter = f"P{suggestion.refuted_by}"
+                        overlays[suggestion.player_id].set_holder(suggestion.card_shown, refuter)
+                        public.add_clause(refuter, cards)
+                for i in range(n_players):
+                    alone = PossibilityMatrix(n_players, i, hands[i])
+                    alone.absorb_history(history)
+                    self.assertEqual(overlays[i].rows, alone.rows, f"n={n_players} seed={seed} player={i}")
+
+    def test_late_overlay_catches_up(self):
+        """An overlay attached after some events starts from everything already public"""
+        public = PublicKnowledge(3)
+        public.eliminate(SUSPECTS[0], "P1")
+        public.add_clause("P2", [SUSPECTS[0], WEAPONS[0], ROOMS[0]])
+        matrix = PossibilityMatrix(3, 0, [WEAPONS[0], ROOMS[0]], public=public)
+        self.assertFalse(matrix.poss[SUSPECTS[0]]["P1"])
+        self.assertEqual(matrix.card_owner(SUSPECTS[0]), "P2")
+        public.eliminate(SUSPECTS[1], "P2")
+        self.assertFalse(matrix.poss[SUSPECTS[1]]["P2"])
+
+    def test_public_layer_has_no_private_knowledge(self):
+        """Cards shown privately never reach the shared layer or other players"""
+        public = PublicKnowledge(3)
+        shown = PossibilityMatrix(3, 0, [], public=public)
+        other = PossibilityMatrix(3, 2, [], public=public)
+        shown.set_holder(SUSPECTS[3], "P1")
+        self.assertIsNone(public.card_owner(SUSPECTS[3]))
+        self.assertIsNone(other.card_owner(SUSPECTS[3]))
+
+
+def state(matrix):
+    return (list(matrix.rows), list(matrix.cols), list(matrix.definite),
+            [list(clause) for clause in matrix.clauses])
+
+
+class TestCheckpoint(unittest.TestCase):
+    def test_rollback_restores_state(self):
+        """Any hypothetical refutation rolls back to exactly the checkpointed state"""
+        for n_players in (3, 6):
+            for seed in range(10):
+                hands, history = play_suggestions(n_players, seed, rounds=15)
+                matrix = PossibilityMatrix(n_players, 0, hands[0])
+                matrix.absorb_history(history)
+                before = state(matrix)
+                token = matrix.checkpoint()
+                for card in ALL_CARDS:
+                    for holder in matrix.holders[1:]:
+                        if matrix.poss[card][holder]:
+                            inner = matrix.checkpoint()
+                            matrix.set_holder(card, holder)
+                            matrix.add_clause(holder, [SUSPECTS[0], WEAPONS[0], ROOMS[0]])
+                            matrix.rollback(inner)
+                            self.assertEqual(state(matrix)[:3], before[:3])
+                matrix.set_holder(ALL_CARDS[seed], "ENVELOPE")
+                matrix.rollback(token)
+                self.assertEqual(state(matrix)[:3], before[:3])
+                self.assertEqual(len(matrix.clauses), len(before[3]))
+
+    def test_propagation_after_rollback(self):
+        """A rolled-back matrix keeps deducing exactly like one that never branched"""
+        for n_players in (3, 6):
+            for seed in range(10):
+                hands, history = play_suggestions(n_players, seed)
+                suggestions = history.get_all_suggestions()
+                branched = PossibilityMatrix(n_players, 0, hands[0])
+                straight = PossibilityMatrix(n_players, 0, hands[0])
+                for i, suggestion in enumerate(suggestions):
+                    if i % 5 == 0:
+                        token = branched.checkpoint()
+                        for card in (suggestion.suspect, suggestion.weapon, suggestion.room):
+                            branched.eliminate(card, "ENVELOPE")
+                        branched.add_clause("P1", [suggestion.suspect, suggestion.weapon, suggestion.room])
+                        branched.rollback(token)
+                    for matrix in (branched, straight):
+                        cards = [suggestion.suspect, suggestion.weapon, suggestion.room]
+                        for player_id in suggestion.passed_by:
+                            for card in cards:
+                                matrix.eliminate(card, f"P{player_id}")
+                        if suggestion.refuted_by not in (None, 0):
+                            if suggestion.player_id == 0:
+                                matrix.set_holder(suggestion.card_shown, f"P{suggestion.refuted_by}")
+                            else:
+                                matrix.add_clause(f"P{suggestion.refuted_by}", cards)
+                    self.assertEqual(branched.rows, straight.rows, f"n={n_players} seed={seed}")
+
+
+if __name__ == "__main__":
+    unittest.main()
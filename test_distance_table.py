@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from BoardCompiler import load_board
+from DistanceTable import DistanceTable, DIST_VERSION
+
+
+class TestDistanceTable(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.board = load_board(cache_dir=self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_entrances_are_zero_from_their_room(self):
+        """Standing on an entrance or inside the room is distance 0 to that room"""
+        for name, room in self.board.room_dict.items():
+            for entrance in room.room_entrance_list:
+                self.assertEqual(self.board.distance_to_room(entrance.row, entrance.column, name), 0)
+                self.assertEqual(self.board.distance_to_entrance(entrance.row, entrance.column, entrance), 0)
+            for r, c in self.board.room_cells(name):
+                self.assertEqual(self.board.distance_to_room(r, c, name), 0)
+
+    def test_adjacent_corridor_is_one_step(self):
+        """A corridor cell next to an entrance is one step from it"""
+        entrance = self.board.room_dict["Hall"].room_entrance_list[0]
+        for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            r, c = entrance.row + dr, entrance.column + dc
+            if self.board.get_cell_type(r, c) is None:
+                self.assertEqual(self.board.distance_to_entrance(r, c, entrance), 1)
+
+    def test_never_longer_than_corridor_walk(self):
+        """The table is at most the plain corridor BFS distance (rooms can only shortcut)"""
+        board = self.board
+        table = board.distances
+        entrance = board.room_dict["Lounge"].room_entrance_list[0]
+        start = (entrance.row, entrance.column)
+
+        # Independent BFS over corridors and entrances only
+        corridor_dist = {start: 0}
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for r, c in frontier:
+                for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                    cell = (r + dr, c + dc)
+                    if cell not in corridor_dist and board.is_passable(*cell):
+                        corridor_dist[cell] = corridor_dist[(r, c)] + 1
+                        next_frontier.append(cell)
+            frontier = next_frontier
+
+        for (r, c), d in corridor_dist.items():
+            self.assertLessEqual(table.to_entrance(r, c, start), d)
+            self.assertGreaterEqual(d, abs(r - start[0]) + abs(c - start[1]))
+
+    def test_secret_passage(self):
+        """Secret passages connect their rooms in one step"""
+        study_cell = self.board.room_cells("Study")[0]
+        self.assertEqual(self.board.distance_to_room(study_cell[0], study_cell[1], "Kitchen"), 1)
+
+    def test_table_is_persisted_and_memory_mapped(self):
+        """The table is written next to the board artifact and mapped on reload"""
+        self.board.distances
+        path = f"{self.board.cache_prefix}.dist-v{DIST_VERSION}.npy"
+        self.assertTrue(os.path.exists(path))
+
+        reloaded = DistanceTable.for_board(load_board(cache_dir=self.cache_dir))
+        self.assertIsInstance(reloaded.dist, np.memmap)
+        self.assertTrue(np.array_equal(reloaded.dist, self.board.distances.dist))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import itertools
+import unittest
+from Constants import SUSPECTS, WEAPONS, ROOMS, ALL_CARDS
+from DeductionMatrix import PossibilityMatrix
+from EnvelopeInference import marginals, knowledge_key, hand_sizes
+from test_deduction_matrix import play_suggestions
+
+
+def brute_force(matrix):
+    """Enumerate every assignment the matrix allows and keep the consistent deals."""
+    n_players = len(matrix.holders) - 1
+    sizes = hand_sizes(n_players)
+    clauses = knowledge_key(matrix)[2]
+    options = [[h for h in range(n_players + 1) if matrix.rows[c] >> h & 1] for c in range(len(ALL_CARDS))]
+    total, counts = 0, [[0] * (n_players + 1) for _ in ALL_CARDS]
+    for deal in itertools.product(*options):
+        if any(deal.count(i) != sizes[i] for i in range(n_players)):
+            continue
+        envelope = [ALL_CARDS[c] for c, h in enumerate(deal) if h == n_players]
+        if [sum(card in cards for card in envelope) for cards in (SUSPECTS, WEAPONS, ROOMS)] != [1, 1, 1]:
+            continue
+        if not all(any(deal[c] == h for c in range(len(ALL_CARDS)) if mask >> c & 1) for h, mask in clauses):
+            continue
+        total += 1
+        for c, h in enumerate(deal):
+            counts[c][h] += 1
+    return total, counts
+
+
+class TestEnvelopeInference(unittest.TestCase):
+    def test_matches_brute_force(self):
+        """Counts and marginals equal an exhaustive enumeration of small knowledge states"""
+        checked = 0
+        for seed in range(40):
+            hands, history = play_suggestions(3, seed, rounds=25)
+            matrix = PossibilityMatrix(3, 0, hands[0])
+            matrix.absorb_history(history)
+            space = 1
+            for row in matrix.rows:
+                space *= bin(row).count("1")
+            if space > 20000:
+                continue
+            total, counts = brute_force(matrix)
+            result = marginals(matrix)
+            self.assertEqual(result.total, total)
+            for c, card in enumerate(ALL_CARDS):
+                for i, holder in enumerate(matrix.holders):
+                    self.assertAlmostEqual(result.holder[card][holder], counts[c][i] / total)
+            checked += 1
+        self.assertGreater(checked, 10)
+
+    def test_probabilities_are_distributions(self):
+        """Each category's envelope probabilities sum to one, as does each card's row"""
+        hands, history = play_suggestions(3, 7, rounds=6)
+        matrix = PossibilityMatrix(3, 1, hands[1])
+        matrix.absorb_history(history)
+        result = marginals(matrix)
+        self.assertGreater(result.total, 0)
+        for cards in (SUSPECTS, WEAPONS, ROOMS):
+            self.assertAlmostEqual(sum(result.envelope[c] for c in cards), 1.0)
+        for card in ALL_CARDS:
+            self.assertAlmostEqual(sum(result.holder[card].values()), 1.0)
+            for holder in matrix.holders:
+                if not matrix.poss[card][holder]:
+                    self.assertEqual(result.holder[card][holder], 0.0)
+
+    def test_solved_envelope_is_certain(self):
+        """A forced solution has probability one"""
+        matrix = PossibilityMatrix(3, 0, SUSPECTS[2:5] + WEAPONS[3:6])
+        for card in (SUSPECTS[1], WEAPONS[2], ROOMS[3]):
+            matrix.set_holder(card, "ENVELOPE")
+        result = marginals(matrix)
+        self.assertEqual(result.most_likely_solution(), (SUSPECTS[1], WEAPONS[2], ROOMS[3]))
+        self.assertEqual(result.envelope[ROOMS[3]], 1.0)
+
+    def test_repeated_queries_are_cached(self):
+        """The same knowledge state returns the cached result"""
+        hand = SUSPECTS[:3] + ROOMS[:3]
+        matrix = PossibilityMatrix(3, 0, hand)
+        self.assertIs(marginals(matrix), marginals(PossibilityMatrix(3, 0, hand)))
+        self.assertGreater(marginals(matrix).envelope[SUSPECTS[4]], 0.0)
+        matrix.eliminate(SUSPECTS[4], "ENVELOPE")
+        self.assertEqual(marginals(matrix).envelope[SUSPECTS[4]], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
+import random
 import unittest
 from game import ClueGame
+from simple_ai import SimpleAIPlayer
 from Constants import SUSPECTS, WEAPONS, ROOMS
 from Room import Room
 
@@ -295,5 +297,57 @@ class TestClueGame(unittest.TestCase):
                 self.assertLessEqual(manhattan_dist, steps, 
                                    f"Room entrance {move} is not reachable within {steps} steps from {corridor_pos}")
 
+
+class TestSeededGames(unittest.TestCase):
+    def play(self, seed, ai_class=None):
+        game = ClueGame(num_players=3, use_ai_players=True, ai_class=ai_class, headless=True, seed=seed)
+        game.run(max_turns=150)
+        return (game.seed, game.solution, [p.hand for p in game.players], game.turn_counter,
+                game.accusations, str(game.suggestion_history))
+
+    def test_seed_replays_game(self):
+        """A seed fixes the deal, dice and every AI choice, whatever the global random state"""
+        for ai_class in (None, SimpleAIPlayer):
+            random.seed(1)
+            first = self.play(7, ai_class)
+            random.seed(2)
+            self.assertEqual(self.play(7, ai_class), first)
+        self.assertNotEqual(self.play(8)[1:3], self.play(7)[1:3])
+
+    def test_seed_recorded(self):
+        """Unseeded games draw a seed that replays them"""
+        game = ClueGame(num_players=3, use_ai_players=True, headless=True)
+        game.run(max_turns=150)
+        replay = self.play(game.seed)
+        self.assertEqual(replay[1:], (game.solution, [p.hand for p in game.players], game.turn_counter,
+                                      game.accusations, str(game.suggestion_history)))
+
+class TestAIAccusations(unittest.TestCase):
+    def setUp(self):
+        self.game = ClueGame(num_players=3, use_ai_players=True, headless=True, seed=3)
+
+    def test_second_accuser_avoids_occupied_center(self):
+        """An accuser does not walk onto the center cell an eliminated accuser still stands on"""
+        game = self.game
+        first, second = game.players[0], game.players[1]
+        centre = (game.centre_row, game.centre_col)
+        game.move_player(first, centre)
+        first.eliminated = True
+
+        second.should_make_accusation = lambda game: True
+        game.handle_ai_accusation(second)
+        self.assertEqual(game.char_board.positions[first.character.name], centre)
+        self.assertNotEqual(game.char_board.positions[second.character.name], centre)
+        self.assertEqual(game.accusations[-1][0], second.player_id)
+
+    def test_no_accusation_on_odds_by_default(self):
+        """Without opting in, an AI only accuses once it has deduced the solution"""
+        player = self.game.players[0]
+        player.accusation_threshold = 0.0
+        self.assertFalse(player.should_make_accusation(self.game))
+        player.accuse_on_odds = True
+        self.assertTrue(player.should_make_accusation(self.game))
+
+
 if __name__ == "__main__":
     unittest.main()
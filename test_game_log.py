@@ -0,0 +1,86 @@
+import contextlib
+import io
+import unittest
+from GameLog import GameLogger, DEBUG, INFO, WARNING, SILENT
+from game import ClueGame
+
+
+class Loud:
+    """Argument that records whether a message was ever formatted."""
+    formatted = 0
+
+    def __str__(self):
+        Loud.formatted += 1
+        return "loud"
+
+
+class TestGameLogger(unittest.TestCase):
+    def test_levels(self):
+        """Messages below the level are dropped, the rest formatted printf-style"""
+        out = io.StringIO()
+        log = GameLogger(WARNING, stream=out)
+        log.debug("d %s", 1)
+        log.info("i %s", 2)
+        log.warning("w %s %d", "x", 3)
+        log.error("e")
+        self.assertEqual(out.getvalue(), "w x 3\ne\n")
+        self.assertFalse(log.enabled(INFO))
+        self.assertTrue(GameLogger(DEBUG).enabled(DEBUG))
+
+    def test_skipped_messages_are_not_formatted(self):
+        """An argument below the level is never turned into a string"""
+        Loud.formatted = 0
+        out = io.StringIO()
+        GameLogger(SILENT, stream=out).error("%s", Loud())
+        self.assertEqual((Loud.formatted, out.getvalue()), (0, ""))
+        GameLogger(INFO, stream=out).info("%s", Loud())
+        self.assertEqual((Loud.formatted, out.getvalue()), (1, "loud\n"))
+
+
+class TestHeadlessGame(unittest.TestCase):
+    def play(self, **options):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            game = ClueGame(num_players=3, use_ai_players=True, enable_visualization=False, seed=3, **options)
+            game.run(max_turns=40)
+        return game, out.getvalue()
+
+    def test_headless_is_silent(self):
+        """A headless AI game writes nothing, and plays the same game as a logged one"""
+        quiet, output = self.play(headless=True)
+        self.assertEqual(output, "")
+        self.assertFalse(quiet.enable_visualization)
+        logged, output = self.play()
+        self.assertIn("Setup complete", output)
+        self.assertEqual((quiet.turn_counter, quiet.game_over), (logged.turn_counter, logged.game_over))
+
+    def test_headless_displays_are_silent(self):
+        """Board, hand and deduction displays go through the logger, so headless prints none of them"""
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            game = ClueGame(num_players=3, use_ai_players=True, headless=True, seed=3)
+            game.enable_visualization = True
+            game.display_board()
+            game.display_player_hand(game.players[0])
+            game.display_deduction_matrix(game.players[0])
+            game.display_suggestion_history()
+        self.assertEqual(out.getvalue(), "")
+
+        game.log = GameLogger(INFO, stream=out)
+        game.display_player_hand(game.players[0])
+        game.display_deduction_matrix(game.players[0])
+        self.assertIn("Deduction Matrix for Player 0", out.getvalue())
+
+    def test_headless_needs_ai_seats(self):
+        """Human seats would prompt on the console, so headless games reject them"""
+        with self.assertRaises(ValueError):
+            ClueGame(num_players=3, headless=True)
+
+    def test_log_level_filters_info(self):
+        """log_level=WARNING drops the turn-by-turn INFO messages"""
+        _, output = self.play(log_level=WARNING)
+        self.assertNotIn("Setup complete", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from Constants import SUSPECTS, WEAPONS, ROOMS
+from DeductionMatrix import PossibilityMatrix
+from EnvelopeInference import knowledge_key
+from game import ClueGame
+from GameState import GameState, Move, Suggest, Accuse, EndTurn, NO_PLAYER
+
+
+def game_in_progress(n_players, turns, first_seed=0):
+    """The first seeded AI game still going after <turns> turns."""
+    for seed in range(first_seed, first_seed + 100):
+        game = ClueGame(num_players=n_players, use_ai_players=True, headless=True, seed=seed)
+        game.run(max_turns=turns)
+        if not game.game_over:
+            return game
+    raise AssertionError("every game finished")
+
+
+class TestGameState(unittest.TestCase):
+    def test_snapshot_round_trip(self):
+        """to_bytes / from_bytes and clone give equal states; the state cannot be changed"""
+        game = game_in_progress(4, 25)
+        state = GameState.from_game(game)
+        self.assertEqual(state.hands, tuple(p.hand_mask for p in game.players))
+        self.assertEqual(state.position(SUSPECTS[1]), game.character_dict[SUSPECTS[1]].position)
+        self.assertEqual(state.weapon_room(WEAPONS[2]), game.weapon_dict[WEAPONS[2]].location)
+
+        decoded = GameState.from_bytes(state.to_bytes(), game.mansion_board)
+        self.assertEqual(decoded, state)
+        clone = state.clone()
+        self.assertEqual(clone, state)
+        self.assertIsNot(clone, state)
+        with self.assertRaises(AttributeError):
+            state.turn = 0
+
+    def test_restored_matrix_matches(self):
+        """A player's matrix rebuilt from the snapshot has the same rows, columns and knowledge"""
+        game = game_in_progress(3, 40)
+        state = GameState.from_game(game)
+        for player in game.players:
+            original, restored = game.logic_engines[player.player_id], state.matrix(player.player_id)
+            self.assertEqual((restored.rows, restored.cols, restored.definite),
+                             (original.rows, original.cols, original.definite))
+            self.assertEqual(knowledge_key(restored), knowledge_key(original))
+
+    def test_apply_follows_game(self):
+        """Moves, suggestions and turns applied to a snapshot match the same actions in the game"""
+        for n_players in (3, 6):
+            game = game_in_progress(n_players, 20, first_seed=n_players)
+            state = GameState.from_game(game)
+            for i, room in enumerate(ROOMS[:5]):
+                player = game.players[game.current_player_idx]
+                entrance = game.mansion_board.room_dict[room].room_entrance_list[0]
+                game.move_player(player, (entrance.row, entrance.column))
+                state = state.apply(Move(entrance.row, entrance.column))
+                self.assertEqual(state, GameState.from_game(game))
+
+                suspect, weapon = SUSPECTS[i], WEAPONS[-i]
+                game.make_suggestion(player, suspect, weapon, room)
+                state = state.apply(Suggest(suspect, weapon))
+                self.assertEqual(state, GameState.from_game(game))
+
+                game.next_turn()
+                game.turn_counter += 1
+                state = state.apply(EndTurn())
+                self.assertEqual(state, GameState.from_game(game))
+
+    def test_accusations(self):
+        """A wrong accusation eliminates, a right one wins, and a finished game takes no actions"""
+        game = game_in_progress(3, 10)
+        state = GameState.from_game(game)
+        solution = (game.solution["suspect"], game.solution["weapon"], game.solution["room"])
+        wrong = (SUSPECTS[0] if solution[0] != SUSPECTS[0] else SUSPECTS[1],) + solution[1:]
+
+        after = state.apply(Accuse(*wrong))
+        self.assertEqual((after.eliminated, after.winner), (1 << state.current, NO_PLAYER))
+        after = after.apply(EndTurn())
+        self.assertNotEqual(after.current, state.current)
+
+        won = state.apply(Accuse(*solution))
+        self.assertEqual(won.winner, state.current)
+        self.assertTrue(won.game_over)
+        with self.assertRaises(ValueError):
+            won.apply(EndTurn())
+
+    def test_suggestion_outside_room(self):
+        """Suggestions need the player to be inside a room"""
+        game = ClueGame(num_players=3, use_ai_players=True, headless=True, seed=0)
+        with self.assertRaises(ValueError):
+            GameState.from_game(game).apply(Suggest(SUSPECTS[0], WEAPONS[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
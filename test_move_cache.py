@@ -0,0 +1,103 @@
+import contextlib
+import io
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from game import ClueGame
+from MoveCache import MoveCache
+
+
+class TestMoveCache(unittest.TestCase):
+    def setUp(self):
+        self.game = ClueGame(num_players=3, enable_visualization=False)
+        self.game.move_cache.clear()
+        self.player = self.game.players[0]
+        self.board = self.game.mansion_board
+
+    def place(self, player, cell):
+        self.game.char_board.move(player.character.name, *cell)
+        player.character.move_to(cell)
+
+    def moves(self, steps):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.game.get_valid_moves(self.player, steps)
+
+    def corridor_cell(self):
+        for r in range(self.board.rows):
+            for c in range(self.board.cols):
+                if (self.board.get_cell_type(r, c) is None
+                        and self.game.char_board.get_cell_content(r, c) is None
+                        and abs(r - self.game.centre_row) > 1):
+                    return (r, c)
+
+    def test_repeat_query_hits(self):
+        """Asking the same question twice is answered from the cache"""
+        self.place(self.player, self.corridor_cell())
+        first = self.moves(4)
+        self.assertEqual(self.game.move_cache.misses, 1)
+        self.assertEqual(self.moves(4), first)
+        self.assertEqual(self.game.move_cache.hits, 1)
+
+    def test_move_into_region_changes_answer(self):
+        """Moving a token onto a destination invalidates the cached answer"""
+        self.place(self.player, self.corridor_cell())
+        before = self.moves(3)
+        blocker = self.game.players[1]
+        target = next(m for m in before if self.board.get_cell_type(*m) is None)
+        self.place(blocker, target)
+
+        after = self.moves(3)
+        self.assertNotIn(target, after)
+        self.assertEqual(self.game.move_cache.hits, 0)
+
+        # Moving it away gives the original answer again
+        self.place(blocker, self.board.room_cells("Study")[0])
+        self.assertEqual(sorted(self.moves(3)), sorted(before))
+
+    def test_far_tokens_do_not_miss(self):
+        """Tokens outside the reachable region leave the key unchanged"""
+        start = self.corridor_cell()
+        self.place(self.player, start)
+        self.moves(1)
+        far = max((cell for name in self.board.room_names for cell in self.board.room_cells(name)),
+                  key=lambda cell: abs(cell[0] - start[0]) + abs(cell[1] - start[1]))
+        self.place(self.game.players[1], far)
+        self.moves(1)
+        self.assertEqual(self.game.move_cache.hits, 1)
+
+    def test_lru_eviction(self):
+        """The cache is bounded and evicts the least recently used entry"""
+        cache = MoveCache(maxsize=2)
+        cache.put("a", [(0, 0)])
+        cache.put("b", [(0, 1)])
+        cache.get("a")
+        cache.put("c", [(0, 2)])
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), ((0, 0),))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(len(cache), 2)
+
+    def test_region_built_once_across_threads(self):
+        """Threads asking for the same region at once share a single build"""
+        cache, builds = MoveCache(), []
+        barrier = threading.Barrier(16)
+
+        def build():
+            builds.append(1)
+            time.sleep(0.01)
+            return 0b1011
+
+        def ask():
+            barrier.wait()
+            return cache.region("walk", 3, build)
+
+        with ThreadPoolExecutor(16) as pool:
+            masks = list(pool.map(lambda _: ask(), range(16)))
+        self.assertEqual(masks, [0b1011] * 16)
+        self.assertEqual(len(builds), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
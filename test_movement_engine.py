@@ -0,0 +1,168 @@
+import contextlib
+import io
+import unittest
+from BoardCompiler import load_board, CELL_ENTRANCE
+from game import ClueGame
+
+
+def reference_walk(board, occupied, start, steps):
+    """The list-based BFS get_valid_moves used for corridor movement."""
+    valid, found = [], set()
+    queue = [(start, steps)]
+    visited = {start}
+    while queue:
+        (row, col), remaining = queue.pop(0)
+        if remaining == 0:
+            if ((row, col) not in occupied or (row, col) == start) and (row, col) not in found:
+                valid.append((row, col))
+                found.add((row, col))
+            continue
+        for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            cell = (row + dr, col + dc)
+            if board.cell_code(*cell) == CELL_ENTRANCE and cell not in found and cell not in occupied:
+                valid.append(cell)
+                found.add(cell)
+            if board.is_passable(*cell) and cell not in visited and (cell not in occupied or cell == start):
+                visited.add(cell)
+                queue.append((cell, remaining - 1))
+    return valid
+
+
+def reference_flood(board, occupied, sources, steps):
+    """The per-entrance BFS get_valid_moves used when leaving a room."""
+    valid = set()
+    for source in sources:
+        if source in occupied:
+            continue
+        visited = {source}
+        queue = [(source, steps)]
+        while queue:
+            (row, col), remaining = queue.pop(0)
+            if remaining == 0:
+                valid.add((row, col))
+                continue
+            for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+                cell = (row + dr, col + dc)
+                if board.is_passable(*cell) and cell not in visited and cell not in occupied:
+                    visited.add(cell)
+                    queue.append((cell, remaining - 1))
+    return valid
+
+
+class TestMovementEngine(unittest.TestCase):
+    def setUp(self):
+        self.board = load_board()
+        self.engine = self.board.movement
+        self.corridors = [(r, c) for r in range(self.board.rows) for c in range(self.board.cols)
+                          if self.board.is_passable(r, c)]
+        # A handful of tokens spread over the board to exercise blocking
+        self.tokens = set(self.corridors[::37])
+
+    def occupied(self, cells):
+        return {r * self.board.cols + c for r, c in cells}
+
+    def test_walk_matches_reference_bfs(self):
+        """Corridor moves are identical (same cells, same order) to the old BFS"""
+        for start in self.corridors:
+            tokens = self.tokens | {start}
+            for steps in range(1, 7):
+                self.assertEqual(self.engine.walk(start, steps, self.occupied(tokens)),
+                                 reference_walk(self.board, tokens, start, steps),
+                                 f"start={start} steps={steps}")
+
+    def test_flood_matches_per_entrance_bfs(self):
+        """
+        Leaving a room reaches exactly the cells of one BFS per entrance,
+        grouped by the first entrance reaching them and row-major within a group
+        """
+        for room in self.board.room_dict.values():
+            sources = [(e.row, e.column) for e in room.room_entrance_list]
+            for steps in range(1, 7):
+                reached = [reference_flood(self.board, self.tokens, [s], steps) for s in sources]
+                first = lambda cell: next(i for i, cells in enumerate(reached) if cell in cells)
+                expected = sorted(reference_flood(self.board, self.tokens, sources, steps),
+                                  key=lambda cell: (first(cell), cell))
+                self.assertEqual(self.engine.flood(sources, steps, self.occupied(self.tokens)), expected,
+                                 f"room={room.name} steps={steps}")
+
+    def test_board_caches_engine(self):
+        """The engine is built once per board"""
+        self.assertIs(self.board.movement, self.engine)
+
+
+class TestBatchedMoves(unittest.TestCase):
+    def setUp(self):
+        self.game = ClueGame(num_players=3, enable_visualization=False)
+        self.board = self.game.mansion_board
+        self.player = self.game.players[0]
+
+    def place(self, cell):
+        self.game.char_board.move(self.player.character.name, *cell)
+        self.player.character.move_to(cell)
+
+    def test_layers_match_single_queries(self):
+        """walk_layers / flood_layers give the same lists as one call per step count"""
+        occupied_bits = self.game.char_board.occupied_bits
+        for engine, occupied in [(self.board.movement, self.board.movement.occupied_cells(self.game.char_board)),
+                                 (self.board.bitboard, occupied_bits)]:
+            for r, c in [(0, 5), (7, 7), (16, 3)]:
+                if not self.board.is_passable(r, c):
+                    continue
+                layers = engine.walk_layers((r, c), 6, occupied)
+                for steps in range(7):
+                    self.assertEqual(layers[steps], engine.walk((r, c), steps, occupied))
+            for room in self.board.room_dict.values():
+                sources = [(e.row, e.column) for e in room.room_entrance_list]
+                layers = engine.flood_layers(sources, 6, occupied)
+                for steps in range(7):
+                    self.assertEqual(layers[steps], engine.flood(sources, steps, occupied))
+
+    def test_by_roll_matches_get_valid_moves(self):
+        """Every roll from the batched call equals the single-roll answer"""
+        starts = [self.player.character.position, self.board.room_cells("Clue")[0],
+                  self.board.room_cells("Study")[0]]
+        for start in starts:
+            if self.game.char_board.get_cell_content(*start) not in (None, self.player.character.name):
+                continue
+            self.place(start)
+            by_roll = self.game.get_valid_moves_by_roll(self.player)
+            self.game.move_cache.clear()
+            for steps in range(1, 7):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    self.assertEqual(by_roll[steps], self.game.get_valid_moves(self.player, steps))
+
+    def test_room_reach_probabilities(self):
+        """Probabilities are multiples of 1/6 and match the rooms reachable per roll"""
+        self.place(self.board.room_cells("Study")[0])
+        reach = self.game.room_reach_probabilities(self.player)
+        by_roll = self.game.get_valid_moves_by_roll(self.player)
+        for room_name, p in reach.items():
+            rolls = sum(1 for moves in by_roll.values()
+                        if any(self.board.room_name_at(r, c) == room_name
+                               and self.board.cell_code(r, c) == CELL_ENTRANCE for r, c in moves))
+            self.assertAlmostEqual(p, rolls / 6)
+
+
+class TestTargetRooms(unittest.TestCase):
+    def test_target_rechosen_after_suggestion(self):
+        """An AI drops its target once it suggests, then picks an unseen room"""
+        game = ClueGame(num_players=3, use_ai_players=True, headless=True, seed=4)
+        player = game.players[0]
+        room = player.choose_target_room(game)
+        player.target_room = room
+        player.choose_suggestion(room, game)
+        self.assertIsNone(player.target_room)
+        for _ in range(20):
+            self.assertNotEqual(player.choose_target_room(game), room)
+
+    def test_targets_spread_from_the_start(self):
+        """Players starting side by side do not all head for the same room"""
+        targets = set()
+        for seed in range(10):
+            game = ClueGame(num_players=3, use_ai_players=True, headless=True, seed=seed)
+            targets.update(player.choose_target_room(game) for player in game.players)
+        self.assertGreater(len(targets), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from unittest import mock
+from game import ClueGame
+from BoardCompiler import get_shared_board, load_board
+
+
+class TestSharedBoard(unittest.TestCase):
+    def test_games_share_one_board(self):
+        """Games built the normal way reuse the process-wide board"""
+        game1 = ClueGame(num_players=3, enable_visualization=False)
+        game2 = ClueGame(num_players=3, enable_visualization=False)
+
+        self.assertIs(game1.mansion_board, game2.mansion_board)
+        self.assertIs(game1.mansion_board, get_shared_board())
+        self.assertIs(game1.mansion_board.room_dict["Study"], game2.mansion_board.room_dict["Study"])
+
+    def test_per_game_state_is_separate(self):
+        """Tokens, their positions and weapon locations are allocated per game"""
+        game1 = ClueGame(num_players=3, enable_visualization=False)
+        game2 = ClueGame(num_players=3, enable_visualization=False)
+
+        self.assertIsNot(game1.char_board, game2.char_board)
+        self.assertIsNot(game1.weapon_dict, game2.weapon_dict)
+
+        game1.weapon_dict["Rope"].move_to("Study")
+        self.assertEqual(game2.weapon_dict["Rope"].location, "Clue")
+
+        self.assertIsNot(game1.character_dict, game2.character_dict)
+        self.assertIs(game1.players[0].character, game1.character_dict["Miss Scarlet"])
+        start = game2.character_dict["Miss Scarlet"].position
+        game1.move_player(game1.players[0], (5, 5))
+        self.assertEqual(game2.character_dict["Miss Scarlet"].position, start)
+
+    def test_from_board(self):
+        """from_board injects an existing board into a new game"""
+        board = load_board().freeze()
+        game = ClueGame.from_board(board, num_players=3, enable_visualization=False)
+        self.assertIs(game.mansion_board, board)
+
+    def test_unfrozen_board_rejected(self):
+        """A game does not freeze (and so change) a board it is handed"""
+        board = load_board()
+        with self.assertRaises(ValueError):
+            ClueGame.from_board(board, num_players=3, enable_visualization=False)
+        self.assertFalse(board.frozen)
+
+    def test_shared_board_skips_rehash(self):
+        """Looking up the shared board again does not re-read the layout file"""
+        board = get_shared_board()
+        with mock.patch("BoardCompiler.hash_file", side_effect=AssertionError("rehashed")):
+            self.assertIs(get_shared_board(), board)
+
+    def test_shared_board_is_read_only(self):
+        """The shared layout rejects modification"""
+        board = get_shared_board()
+
+        with self.assertRaises(AttributeError):
+            board.rows = 1
+        with self.assertRaises(AttributeError):
+            board.room_dict["Study"].secret_passage_to = "Hall"
+        with self.assertRaises(TypeError):
+            board.room_dict["Attic"] = None
+        with self.assertRaises(AttributeError):
+            board.room_dict["Study"].room_entrance_list.append(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
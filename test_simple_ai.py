@@ -1,6 +1,8 @@
 import unittest
 from game import ClueGame
 from simple_ai import SimpleAIPlayer
+from CardRegistry import SUSPECT_MASK
+from Constants import SUSPECTS, WEAPONS, ROOMS
 
 class TestSimpleAIGame(unittest.TestCase):
     def test_simple_ai_game(self):
@@ -62,6 +64,19 @@ class TestSimpleAIGame(unittest.TestCase):
 
         self.assertTrue(True, "This test is a placeholder - the actual verification is done by code inspection")
 
+    def test_all_seen_category(self):
+        """With every card of a category seen, the AI still names a card of that category"""
+        game = ClueGame(num_players=3, use_ai_players=True, ai_class=SimpleAIPlayer, headless=True, seed=1)
+        player = game.players[0]
+        for card in SUSPECTS + WEAPONS:
+            player.observe_card(card)
+        self.assertIsNone(player._first_unknown(SUSPECT_MASK))
+        suspect, weapon, room = player.choose_suggestion(ROOMS[2], game)
+        self.assertIn(suspect, SUSPECTS)
+        self.assertIn(weapon, WEAPONS)
+        suspect, weapon, room = player.choose_accusation(game)
+        self.assertEqual((suspect in SUSPECTS, weapon in WEAPONS, room in ROOMS), (True, True, True))
+
 if __name__ == "__main__":
     # Run the tests
     unittest.main()
@@ -0,0 +1,66 @@
+import random
+import unittest
+from Constants import SUSPECTS, WEAPONS, ROOMS, ALL_CARDS
+from SuggestionHistory import SuggestionHistory
+
+
+def random_history(seed, n_players=4, n_suggestions=200):
+    rng = random.Random(seed)
+    history = SuggestionHistory()
+    for turn in range(n_suggestions):
+        suggester = rng.randrange(n_players)
+        suggestion = history.add_suggestion(suggester, rng.choice(SUSPECTS), rng.choice(WEAPONS),
+                                            rng.choice(ROOMS), turn=turn // 2)
+        others = [(suggester + k) % n_players for k in range(1, n_players)]
+        stop = rng.randrange(n_players)
+        for other in others[:stop]:
+            suggestion.record_pass(other)
+        if stop < len(others):
+            suggestion.refute(others[stop], rng.choice([suggestion.suspect, suggestion.weapon, suggestion.room]))
+    return history
+
+
+class TestSuggestionHistory(unittest.TestCase):
+    def test_indexes_match_scans(self):
+        """Indexed lookups return what a linear scan would, in order"""
+        history = random_history(0)
+        everything = list(history.get_all_suggestions())
+        for player_id in range(4):
+            self.assertEqual(history.get_player_suggestions(player_id),
+                             [s for s in everything if s.player_id == player_id])
+            self.assertEqual(history.get_refuted_by(player_id),
+                             [s for s in everything if s.refuted_by == player_id])
+        for card in ALL_CARDS:
+            self.assertEqual(history.get_suggestions_involving(card),
+                             [s for s in everything if card in (s.suspect, s.weapon, s.room)])
+
+    def test_suggestion_fields(self):
+        """A suggestion reads back what was recorded, passes in the order players were asked"""
+        history = SuggestionHistory()
+        suggestion = history.add_suggestion(2, SUSPECTS[1], WEAPONS[2], ROOMS[3])
+        self.assertIsNone(suggestion.refuted_by)
+        self.assertIsNone(suggestion.card_shown)
+        suggestion.record_pass(3)
+        suggestion.record_pass(0)
+        suggestion.refute(1, WEAPONS[2])
+        self.assertEqual(suggestion.passed_by, [3, 0])
+        self.assertEqual((suggestion.player_id, suggestion.suspect, suggestion.weapon, suggestion.room),
+                         (2, SUSPECTS[1], WEAPONS[2], ROOMS[3]))
+        self.assertEqual((suggestion.refuted_by, suggestion.card_shown), (1, WEAPONS[2]))
+        self.assertEqual(history.suggestions[0], suggestion)
+        self.assertEqual(str(suggestion), f"Player 2 suggested {SUSPECTS[1]} with {WEAPONS[2]} "
+                                          f"in {ROOMS[3]} - Refuted by Player 1 showing {WEAPONS[2]}")
+
+    def test_since_is_a_live_window(self):
+        """since(turn) starts at the first suggestion of that turn and sees later additions"""
+        history = random_history(1, n_suggestions=20)
+        window = history.since(5)
+        self.assertEqual([s.turn for s in window], [t // 2 for t in range(10, 20)])
+        self.assertEqual(window[0].index, 10)
+        history.add_suggestion(0, SUSPECTS[0], WEAPONS[0], ROOMS[0])
+        self.assertEqual(len(window), 11)
+        self.assertEqual(len(history.since(100)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
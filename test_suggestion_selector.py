@@ -0,0 +1,105 @@
+import math
+import random
+import unittest
+from collections import defaultdict
+import numpy as np
+from CardRegistry import CARD_ID
+from Constants import SUSPECTS, WEAPONS, ROOMS
+from DeductionMatrix import PossibilityMatrix
+from DealSampler import sample_marginals
+from SuggestionSelector import information_gain, most_informative, MAX_DEALS
+from game import ClueGame
+from test_deduction_matrix import play_suggestions
+
+
+def entropy(dist):
+    return -sum(p * math.log2(p) for p in dist.values() if p > 0)
+
+
+def brute_force_gain(estimate, me, room, eliminated=0):
+    """Mutual information of envelope and outcome, deal by deal."""
+    n_players = len(estimate.holders) - 1
+    gains = np.zeros((len(SUSPECTS), len(WEAPONS)))
+    for i, suspect in enumerate(SUSPECTS):
+        for j, weapon in enumerate(WEAPONS):
+            joint, outcomes, envelopes = defaultdict(float), defaultdict(float), defaultdict(float)
+            for deal, weight, solution in zip(estimate.deals, estimate.weights, estimate.solution_index):
+                outcome = None
+                for step in range(1, n_players):
+                    other = (me + step) % n_players
+                    shown = [c for c in (CARD_ID[suspect], CARD_ID[weapon], CARD_ID[room])
+                             if deal[c] == other]
+                    if shown and not eliminated >> other & 1:
+                        outcome = (other, min(shown))
+                        break
+                joint[outcome, solution] += weight
+                outcomes[outcome] += weight
+                envelopes[solution] += weight
+            gains[i, j] = entropy(envelopes) + entropy(outcomes) - entropy(joint)
+    return gains
+
+
+def estimate_for(n_players, seed, me, n_samples=300):
+    hands, history = play_suggestions(n_players, seed, rounds=2 * n_players)
+    matrix = PossibilityMatrix(n_players, me, hands[me])
+    matrix.absorb_history(history)
+    return hands, sample_marginals(matrix, n_samples=n_samples, rng=seed)
+
+
+class TestInformationGain(unittest.TestCase):
+    def test_matches_brute_force(self):
+        """The vectorised gains equal a deal-by-deal computation, with and without eliminations"""
+        for n_players, seed in ((3, 1), (4, 2), (6, 3)):
+            _, estimate = estimate_for(n_players, seed, me=1)
+            self.assertLessEqual(len(estimate.weights), MAX_DEALS)
+            for eliminated in (0, 1 << 2):
+                expected = brute_force_gain(estimate, 1, ROOMS[seed], eliminated)
+                np.testing.assert_allclose(information_gain(estimate, 1, ROOMS[seed], eliminated),
+                                           expected, atol=1e-9)
+
+    def test_bounds(self):
+        """Gains lie between zero and the envelope's entropy"""
+        _, estimate = estimate_for(4, 5, me=0, n_samples=2000)
+        gains = information_gain(estimate, 0, ROOMS[0])
+        envelope = np.bincount(estimate.solution_index, estimate.weights)
+        bound = -(envelope[envelope > 0] * np.log2(envelope[envelope > 0])).sum()
+        self.assertTrue((gains >= 0).all())
+        self.assertTrue((gains <= bound + 1e-9).all())
+        self.assertGreater(gains.max(), 0)
+
+    def test_nothing_to_learn(self):
+        """Nobody can answer when every other player is out, or when I hold all three cards"""
+        hands, estimate = estimate_for(3, 7, me=0)
+        self.assertFalse(information_gain(estimate, 0, ROOMS[0], eliminated=0b110).any())
+
+        suspect, weapon, room = (next(c for c in hands[0] if c in cards) for cards in (SUSPECTS, WEAPONS, ROOMS))
+        gains = information_gain(estimate, 0, room)
+        self.assertEqual(gains[SUSPECTS.index(suspect), WEAPONS.index(weapon)], 0)
+
+
+class TestMostInformative(unittest.TestCase):
+    def test_ties_go_to_likeliest_pair(self):
+        gains = np.zeros((len(SUSPECTS), len(WEAPONS)))
+        gains[1, 2] = gains[3, 4] = 1.5
+        envelope = dict.fromkeys(SUSPECTS + WEAPONS, 0.1)
+        envelope[SUSPECTS[3]] = 0.5
+        self.assertEqual(most_informative(gains, envelope, random.Random(0)), (SUSPECTS[3], WEAPONS[4]))
+
+
+class TestAISuggestions(unittest.TestCase):
+    def test_gains_cached_per_knowledge_state(self):
+        """Repeated suggestions from the same knowledge reuse the scored pairs"""
+        game = ClueGame(num_players=3, use_ai_players=True, headless=True, seed=2)
+        player = game.players[0]
+        first = player.choose_suggestion(ROOMS[0], game)
+        gains = player._gain_cache[ROOMS[0], 0]
+        self.assertEqual(player.choose_suggestion(ROOMS[0], game), first)
+        self.assertIs(player._gain_cache[ROOMS[0], 0], gains)
+
+        game.logic_engines[0].eliminate(first[0], "P1")
+        player.choose_suggestion(ROOMS[0], game)
+        self.assertIsNot(player._gain_cache[ROOMS[0], 0], gains)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from Tournament import GameResult, TournamentStats, lineup, play_game, run_tournament
+
+
+class TestTournament(unittest.TestCase):
+    def test_lineup_rotates_seats(self):
+        """Over len(seats) games every AI sits in every seat once"""
+        seats = ["ai", "simple", "simple"]
+        lineups = [lineup(seats, i) for i in range(3)]
+        self.assertEqual(lineups, [("ai", "simple", "simple"), ("simple", "simple", "ai"),
+                                   ("simple", "ai", "simple")])
+        self.assertEqual(lineup(seats, 1, rotate=False), tuple(seats))
+
+    def test_stats(self):
+        """Win rate is per seat played; turns and accuracy only count wins and accusations"""
+        stats = TournamentStats()
+        stats.add(GameResult(0, ("ai", "simple", "simple"), 0, 30, ((2, 20, False), (0, 30, True))))
+        stats.add(GameResult(1, ("simple", "simple", "ai"), None, 100, ()))
+        stats.add(GameResult(2, ("simple", "ai", "simple"), None, 40, ((0, 1, False), (1, 2, False), (2, 3, False))))
+        self.assertEqual((stats.games, stats.unfinished, stats.all_eliminated), (3, 1, 1))
+        self.assertEqual(stats.win_rate("ai"), 1 / 3)
+        self.assertEqual(stats.win_rate("simple"), 0.0)
+        self.assertEqual(stats.mean_turns_to_solve("ai"), 30)
+        self.assertIsNone(stats.mean_turns_to_solve("simple"))
+        self.assertEqual((stats.accuracy("ai"), stats.accuracy("simple")), (0.5, 0.0))
+        self.assertIn("ai", str(stats))
+
+    def test_game_result(self):
+        """A played game reports its seats, and a winner only with a matching correct accusation"""
+        result = play_game(4, ("simple", "ai", "simple"), max_turns=60)
+        self.assertEqual((result.seed, result.seats), (4, ("simple", "ai", "simple")))
+        self.assertLessEqual(result.turns, 60)
+        if result.winner is not None:
+            self.assertEqual(result.accusations[-1][::2], (result.winner, True))
+
+    def test_pool_matches_serial(self):
+        """Worker processes play the same seeded games as the serial runner"""
+        seats = ["ai", "simple", "ai"]
+        serial = sorted(run_tournament(4, seats, workers=1, max_turns=60))
+        pooled = sorted(run_tournament(4, seats, workers=2, max_turns=60))
+        self.assertEqual([r.seed for r in serial], [0, 1, 2, 3])
+        self.assertEqual(serial, pooled)
+
+    def test_ai_win_rate(self):
+        """AIs spread out over the rooms and solve most games (regression: all heading to one room)"""
+        results = run_tournament(30, ["ai", "ai", "ai"], workers=1, max_turns=300)
+        self.assertGreaterEqual(sum(r.winner is not None for r in results), 24)
+
+    def test_rejects_unknown_ai(self):
+        with self.assertRaises(ValueError):
+            list(run_tournament(1, ["ai", "nobody", "ai"], workers=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+from Board import CharacterBoard
+from BoardCompiler import get_shared_board
+from Bitboard import cell_bit
+from CardRegistry import CARD_ID
+from Constants import SUSPECTS, WEAPONS, ROOMS
+from DeductionMatrix import PossibilityMatrix
+from Weapon import Weapon
+from Zobrist import (MATRIX_KEYS, MAX_HOLDERS, MASK64, TURN_KEYS, ELIMINATED_KEYS, WEAPON_KEYS,
+                     clause_key, matrix_owner, token_keys)
+from game import ClueGame
+
+
+def matrix_hash(matrix):
+    """Zobrist hash of a matrix computed from scratch."""
+    owner = matrix_owner(matrix.my_index)
+    h = 0
+    for c, row in enumerate(matrix.rows):
+        for holder in range(len(matrix.holders)):
+            if row >> holder & 1:
+                h ^= MATRIX_KEYS[owner][c * MAX_HOLDERS + holder]
+    clauses = sum(clause_key(owner, holder, mask) for holder, mask, _, _ in matrix.clauses) & MASK64
+    return h ^ clauses
+
+
+def game_hash(game):
+    """ClueGame.state_hash() computed from scratch."""
+    board = game.char_board
+    keys = token_keys(game.mansion_board.rows * (game.mansion_board.cols + 1))
+    h = TURN_KEYS[game.current_player_idx]
+    for name, (r, c) in board.positions.items():
+        h ^= keys[name][cell_bit(r, c, board.cols)]
+    for weapon in game.weapon_dict.values():
+        h ^= WEAPON_KEYS[weapon.name][weapon.location]
+    for player in game.players:
+        if player.eliminated:
+            h ^= ELIMINATED_KEYS[player.player_id]
+        h ^= matrix_hash(game.logic_engines[player.player_id])
+    return h
+
+
+def position_key(game):
+    """Everything state_hash() covers, as a comparable value."""
+    return (tuple(sorted(game.char_board.positions.items())),
+            tuple(w.location for w in game.weapon_dict.values()),
+            game.current_player_idx,
+            tuple(p.eliminated for p in game.players),
+            tuple((tuple(m.rows), tuple(sorted((h, mask) for h, mask, _, _ in m.clauses)))
+                  for m in (game.logic_engines[p.player_id] for p in game.players)))
+
+
+class TestIncrementalUpdates(unittest.TestCase):
+    def test_token_moves(self):
+        """Token hashes follow place / move and do not depend on the order of moves"""
+        mansion = get_shared_board()
+        cells = mansion.room_cells("Study")[:4]
+        a = CharacterBoard(mansion.rows, mansion.cols, mansion)
+        b = CharacterBoard(mansion.rows, mansion.cols, mansion)
+        for board in (a, b):
+            board.place(SUSPECTS[0], *cells[0])
+            board.place(SUSPECTS[1], *cells[1])
+        self.assertEqual(a.zobrist, b.zobrist)
+        start = a.zobrist
+
+        a.move(SUSPECTS[0], *cells[2])
+        a.move(SUSPECTS[1], *cells[3])
+        b.move(SUSPECTS[1], *cells[3])
+        b.move(SUSPECTS[0], *cells[2])
+        self.assertEqual(a.zobrist, b.zobrist)
+        self.assertNotEqual(a.zobrist, start)
+
+        a.move(SUSPECTS[0], *cells[0])
+        a.move(SUSPECTS[1], *cells[1])
+        self.assertEqual(a.zobrist, start)
+
+    def test_weapon_moves(self):
+        weapon = Weapon(WEAPONS[0])
+        weapon.move_to("Clue")
+        start = weapon.zobrist
+        weapon.move_to(ROOMS[0])
+        self.assertEqual(weapon.zobrist, WEAPON_KEYS[WEAPONS[0]][ROOMS[0]])
+        weapon.move_to("Clue")
+        self.assertEqual(weapon.zobrist, start)
+
+        with self.assertRaises(ValueError):
+            weapon.move_to("Hallway")
+        self.assertEqual((weapon.location, weapon.zobrist), ("Clue", start))
+
+    def test_matrix_changes_and_rollback(self):
+        """Eliminations and clauses update the hash, in any order; rollback restores it"""
+        a = PossibilityMatrix(3, 0, [SUSPECTS[0], WEAPONS[0]])
+        b = PossibilityMatrix(3, 0, [SUSPECTS[0], WEAPONS[0]])
+        self.assertEqual(a.zobrist, matrix_hash(a))
+        token, start = a.checkpoint(), a.zobrist
+
+        a.eliminate(SUSPECTS[1], "P1")
+        a.add_clause("P2", [SUSPECTS[2], WEAPONS[2], ROOMS[2]])
+        a.eliminate(ROOMS[3], "P2")
+        b.eliminate(ROOMS[3], "P2")
+        b.add_clause("P2", [SUSPECTS[2], WEAPONS[2], ROOMS[2]])
+        b.eliminate(SUSPECTS[1], "P1")
+        self.assertEqual(a.zobrist, matrix_hash(a))
+        self.assertEqual(a.zobrist, b.zobrist)
+        self.assertNotEqual(a.zobrist, start)
+
+        a.rollback(token)
+        self.assertEqual(a.zobrist, start)
+
+    def test_repeated_clause_counts(self):
+        """The same clause added twice does not cancel itself out"""
+        matrix = PossibilityMatrix(3, 0, [SUSPECTS[0]])
+        start = matrix.zobrist
+        mask = 1 << CARD_ID[SUSPECTS[2]] | 1 << CARD_ID[WEAPONS[2]] | 1 << CARD_ID[ROOMS[2]]
+        matrix.add_clause_mask(1, mask)
+        once = matrix.zobrist
+        matrix.add_clause_mask(1, mask)
+        self.assertNotIn(matrix.zobrist, (start, once))
+        self.assertEqual(matrix.zobrist, matrix_hash(matrix))
+
+    def test_restore_matches(self):
+        """A restored matrix (which drops clauses already satisfied) hashes what it holds"""
+        game = ClueGame(num_players=4, use_ai_players=True, headless=True, seed=5)
+        game.run(max_turns=30)
+        for player in game.players:
+            original = game.logic_engines[player.player_id]
+            restored = PossibilityMatrix.restore(4, player.player_id, original.rows,
+                                                 [(h, mask) for h, mask, _, _ in original.clauses])
+            self.assertEqual(restored.zobrist, matrix_hash(restored))
+
+
+class TestGameHash(unittest.TestCase):
+    def test_matches_recomputation(self):
+        """The incrementally kept hash equals one computed from scratch after every turn"""
+        for n_players in (3, 6):
+            game = ClueGame(num_players=n_players, use_ai_players=True, headless=True, seed=n_players)
+            for _ in range(60):
+                if game.game_over:
+                    break
+                self.assertEqual(game.state_hash(), game_hash(game))
+                game.play_ai_turn(game.players[game.current_player_idx])
+                game.turn_counter += 1
+            self.assertEqual(game.state_hash(), game_hash(game))
+
+    def test_same_seed_same_hash(self):
+        a = ClueGame(num_players=4, use_ai_players=True, headless=True, seed=11)
+        b = ClueGame(num_players=4, use_ai_players=True, headless=True, seed=11)
+        a.run(max_turns=40)
+        b.run(max_turns=40)
+        self.assertEqual(a.state_hash(), b.state_hash())
+
+    def test_no_collisions(self):
+        """Distinct positions reached across many seeded games never share a hash"""
+        seen = {}
+        for seed in range(40):
+            game = ClueGame(num_players=3 + seed % 4, use_ai_players=True, headless=True, seed=seed)
+            for _ in range(80):
+                if game.game_over:
+                    break
+                key = position_key(game)
+                self.assertEqual(seen.setdefault(game.state_hash(), key), key)
+                game.play_ai_turn(game.players[game.current_player_idx])
+                game.turn_counter += 1
+        self.assertGreater(len(seen), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
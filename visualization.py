@@ -3,7 +3,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 import numpy as np
-from Room import Room
+from BoardCompiler import CELL_ROOM, CELL_ENTRANCE, CELL_BONUS, CELL_OUT_OF_BOUNDS
 from Constants import character_name_list, room_name_list, weapon_name_list
 
 # Define colors for different elements - using brighter, more distinguished colors
@@ -67,17 +67,18 @@ def display_board_image(game, filename='clue_board.png'):
         columns=range(game.mansion_board.cols)
     )
 
-    for r in range(game.mansion_board.rows):
-        for c in range(game.mansion_board.cols):
-            cell_type = game.mansion_board.get_cell_type(r, c)
+    board = game.mansion_board
+    for r in range(board.rows):
+        for c in range(board.cols):
+            cell_code = board.cell_code(r, c)
 
-            if cell_type == "out_of_bounds":
+            if cell_code == CELL_OUT_OF_BOUNDS:
                 board_df.iloc[r, c] = "wall"
-            elif isinstance(cell_type, Room):
-                board_df.iloc[r, c] = f"room_{cell_type.name}"
-            elif cell_type and hasattr(cell_type, 'room_name'):
+            elif cell_code == CELL_ROOM:
+                board_df.iloc[r, c] = f"room_{board.room_name_at(r, c)}"
+            elif cell_code == CELL_ENTRANCE:
                 board_df.iloc[r, c] = "entrance"
-            elif cell_type == "bonus_card":
+            elif cell_code == CELL_BONUS:
                 board_df.iloc[r, c] = "bonus"
             else:
                 board_df.iloc[r, c] = "empty"
@@ -100,9 +101,7 @@ def display_board_image(game, filename='clue_board.png'):
                 r, c = room.room_entrance_list[0].row, room.room_entrance_list[0].column
                 for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
                     nr, nc = r + dr, c + dc
-                    if (0 <= nr < game.mansion_board.rows and
-                        0 <= nc < game.mansion_board.cols and
-                        isinstance(game.mansion_board.get_cell_type(nr, nc), Room)):
+                    if board.cell_code(nr, nc) == CELL_ROOM:
                         board_df.iloc[nr, nc] = f"weapon_{weapon_name}"
                         break
 